@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Batcher adaptativo de detecciones
+Corta un batch por lo que ocurra primero: filas, bytes o tiempo (de video o
+de reloj), y lleva métricas de la distribución de tamaños para ajustar la
+carga a Hive
+"""
+from collections import Counter
+
+import numpy as np
+
+from buffer_detecciones import BufferDetecciones
+
+MOTIVOS_CORTE = ('filas', 'bytes', 'tiempo', 'reanudacion', 'final')
+
+
+class MetricasBatches:
+    """Registro (filas, bytes, segundos, motivo) de cada batch cortado"""
+
+    def __init__(self, batches=None):
+        self.batches = list(batches or [])
+
+    def registrar(self, filas, bytes_batch, segundos, motivo):
+        self.batches.append((filas, bytes_batch, round(segundos, 2), motivo))
+
+    def reiniciar(self):
+        self.batches = []
+
+    def extender(self, batches):
+        self.batches.extend(batches)
+
+    def resumen(self):
+        """Estadísticas de tamaño por batch (filas y MB) y conteo por motivo de corte"""
+        if not self.batches:
+            return {'batches': 0, 'filas': 0}
+        filas = np.array([b[0] for b in self.batches])
+        mb = np.array([b[1] for b in self.batches]) / 1024 ** 2
+        return {
+            'batches': len(filas),
+            'filas': int(filas.sum()),
+            'filas_min': int(filas.min()),
+            'filas_p50': float(np.percentile(filas, 50)),
+            'filas_p90': float(np.percentile(filas, 90)),
+            'filas_max': int(filas.max()),
+            'mb_promedio': round(float(mb.mean()), 3),
+            'mb_max': round(float(mb.max()), 3),
+            'motivos': dict(Counter(b[3] for b in self.batches)),
+        }
+
+    def imprimir(self, titulo='Batches'):
+        r = self.resumen()
+        if not r['batches']:
+            return
+        print(f"📦 {titulo}: {r['batches']} batches, {r['filas']} filas")
+        print(f"   filas/batch min={r['filas_min']} p50={r['filas_p50']:.0f} "
+              f"p90={r['filas_p90']:.0f} max={r['filas_max']}  "
+              f"MB/batch prom={r['mb_promedio']} max={r['mb_max']}")
+        print(f"   motivos de corte: {r['motivos']}")
+
+
+class BatcherAdaptativo:
+    """Acumula lotes columnares y decide cuándo cortar el batch
+
+    El tiempo lo da quien llama (segundos de video o time.monotonic()) y se
+    cuenta desde la primera detección del batch. El corte se consulta antes
+    de agregar el siguiente frame/imagen, así un batch nunca parte un frame.
+    """
+
+    def __init__(self, max_filas=5000, max_bytes=64 * 1024 ** 2, max_segundos=10.0, buffer=None):
+        self.max_filas = max_filas
+        self.max_bytes = max_bytes
+        self.max_segundos = max_segundos
+        self.buffer = buffer if buffer is not None else BufferDetecciones()
+        self.metricas = MetricasBatches()
+        self.inicio = None
+        self._corte_forzado = None
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def forzar_corte(self, filas):
+        """El próximo batch se corta exactamente al llegar a estas filas (reanudación)"""
+        self._corte_forzado = filas
+
+    def motivo_corte(self, ahora):
+        """Motivo para cortar el batch antes de agregar algo en 'ahora', o None"""
+        filas = len(self.buffer)
+        if not filas:
+            return None
+        if self._corte_forzado is not None:
+            return 'reanudacion' if filas >= self._corte_forzado else None
+        if self.max_filas and filas >= self.max_filas:
+            return 'filas'
+        if self.max_bytes and self.buffer.bytes_filas >= self.max_bytes:
+            return 'bytes'
+        if self.max_segundos and ahora - self.inicio >= self.max_segundos:
+            return 'tiempo'
+        return None
+
+    def agregar_lote(self, lote, ahora):
+        """Agrega un lote columnar; la primera detección marca el inicio del batch"""
+        if len(lote['class_id']) == 0:
+            return
+        if not len(self.buffer):
+            self.inicio = ahora
+        self.buffer.agregar_lote(lote)
+
+    def tomar(self, ahora, motivo='final'):
+        """Corta el batch: DataFrame propio (sobrevive a la reutilización del buffer)"""
+        df = self.buffer.a_dataframe().copy()
+        if len(df):
+            self.metricas.registrar(len(df), self.buffer.bytes_filas, ahora - self.inicio, motivo)
+        self.buffer.vaciar()
+        self.inicio = None
+        self._corte_forzado = None
+        return df
+
+    def descartar(self):
+        """Vacía el batch sin registrarlo (p. ej. ya estaba cargado en Hive)"""
+        self.buffer.vaciar()
+        self.inicio = None
+        self._corte_forzado = None
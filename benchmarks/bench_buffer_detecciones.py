@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria: lista de dicts vs BufferDetecciones
+Mide con tracemalloc la memoria retenida al acumular detecciones y el tiempo
+de pasarlas a DataFrame, y la extrapola a 1M de detecciones
+"""
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from buffer_detecciones import BufferDetecciones
+
+CLASES = ['person', 'car', 'dog', 'bicycle', 'truck']
+REGIONES = ['top_left', 'middle_center', 'bottom_right']
+COLORES = ['red', 'blue', 'gray', 'black', 'white']
+
+
+def generar(filas, rng):
+    """Detecciones con los mismos tipos que produce SistemaClasificacion._extraer_atributos"""
+    for i in range(filas):
+        x1, y1 = float(rng.uniform(0, 1000)), float(rng.uniform(0, 600))
+        yield {
+            'source_type': 'video', 'source_id': f"camara_{i % 8:02d}.mp4", 'frame_number': i // 10,
+            'class_id': i % 5, 'class_name': CLASES[i % 5], 'confidence': float(rng.random()),
+            'x_min': int(x1), 'y_min': int(y1), 'x_max': int(x1) + 100, 'y_max': int(y1) + 200,
+            'width': 100, 'height': 200, 'area_pixels': 20000, 'frame_width': 1280, 'frame_height': 720,
+            'bbox_area_ratio': 0.0217, 'center_x': x1 + 50, 'center_y': y1 + 100,
+            'center_x_norm': (x1 + 50) / 1280, 'center_y_norm': (y1 + 100) / 720,
+            'position_region': REGIONES[i % 3], 'dominant_color_name': COLORES[i % 5],
+            'dom_r': int(rng.integers(256)), 'dom_g': int(rng.integers(256)), 'dom_b': int(rng.integers(256)),
+            'timestamp_sec': i / 300, 'ingestion_date': datetime.now().isoformat(),
+            'detection_id': str(uuid.uuid4()),
+        }
+
+
+def medir(filas, crear, agregar, a_dataframe):
+    """(bytes retenidos, pico de bytes, segundos a DataFrame)"""
+    tracemalloc.start()
+    contenedor = crear()
+    for deteccion in generar(filas, np.random.default_rng(0)):
+        agregar(contenedor, deteccion)
+    retenidos = tracemalloc.get_traced_memory()[0]
+    inicio = time.perf_counter()
+    df = a_dataframe(contenedor)
+    segundos = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert len(df) == filas
+    return retenidos, pico, segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--filas', type=int, default=200000)
+    args = parser.parse_args()
+
+    resultados = {
+        'lista de dicts': medir(args.filas, list, list.append, pd.DataFrame),
+        'buffer': medir(args.filas, BufferDetecciones, BufferDetecciones.agregar,
+                        BufferDetecciones.a_dataframe),
+    }
+
+    escala = 1_000_000 / args.filas
+    print("⏱️  BENCHMARK DE BUFFER DE DETECCIONES")
+    print("=" * 50)
+    print(f"📊 {args.filas} detecciones (extrapolado a 1M)")
+    for nombre, (retenidos, pico, segundos) in resultados.items():
+        print(f"   {nombre:<15} retenido={retenidos * escala / 2**20:8.0f} MB/1M  "
+              f"pico={pico * escala / 2**20:8.0f} MB/1M  a DataFrame={segundos * escala:6.2f}s/1M")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark de color dominante: exactitud vs latencia por modo
+Sobre las imágenes de imagenes_entrada/ pega una "prenda" de color conocido
+(ruido incluido) que cubre la mayor parte de cada caja, y mide cuántas veces
+cada modo nombra ese color y cuánto tarda por caja
+"""
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from color_dominante import MODOS_COLOR, color_dominante
+from imagen_integral import ImagenIntegral
+from paleta_colores import PALETA, nombre_color
+
+
+def generar_casos(carpeta, cajas_por_imagen, rng):
+    """Genera (frame, caja, color esperado) con prendas pegadas sobre fondos reales"""
+    for archivo in sorted(os.listdir(carpeta)):
+        img = cv2.imread(os.path.join(carpeta, archivo))
+        if img is None:
+            continue
+        alto, ancho = img.shape[:2]
+        for _ in range(cajas_por_imagen):
+            w = int(rng.integers(40, max(41, ancho // 2)))
+            h = int(rng.integers(40, max(41, alto // 2)))
+            x1, y1 = int(rng.integers(0, ancho - w + 1)), int(rng.integers(0, alto - h + 1))
+            nombre = rng.choice(list(PALETA))
+            r, g, b = PALETA[nombre]
+
+            # La prenda cubre entre el 55% y el 75% del área de la caja
+            lado = np.sqrt(rng.uniform(0.55, 0.75))
+            pw, ph = int(w * lado), int(h * lado)
+            px, py = x1 + (w - pw) // 2, y1 + (h - ph) // 2
+            frame = img.copy()
+            ruido = rng.normal(0, 10, (ph, pw, 3))
+            frame[py:py + ph, px:px + pw] = np.clip(np.array([b, g, r]) + ruido, 0, 255).astype(np.uint8)
+            yield frame, (x1, y1, x1 + w, y1 + h), nombre
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--carpeta', default='imagenes_entrada')
+    parser.add_argument('--cajas', type=int, default=10, help='cajas por imagen')
+    parser.add_argument('--max-pixeles', type=int, default=1024)
+    args = parser.parse_args()
+
+    aciertos = dict.fromkeys(MODOS_COLOR, 0)
+    segundos = dict.fromkeys(MODOS_COLOR, 0.0)
+    total = 0
+    for frame, caja, esperado in generar_casos(args.carpeta, args.cajas, np.random.default_rng(0)):
+        # La integral se construye una vez por frame y se comparte entre sus cajas
+        integral = ImagenIntegral(frame)
+        total += 1
+        for modo in MODOS_COLOR:
+            inicio = time.perf_counter()
+            bgr = color_dominante(frame, *caja, modo, integral, args.max_pixeles)
+            segundos[modo] += time.perf_counter() - inicio
+            b, g, r = bgr.astype(int)
+            aciertos[modo] += nombre_color(r, g, b) == esperado
+
+    if total == 0:
+        print(f"❌ No hay imágenes en {args.carpeta}")
+        return
+
+    print("⏱️  BENCHMARK DE COLOR DOMINANTE")
+    print("=" * 50)
+    print(f"📊 {total} cajas sobre imágenes de {args.carpeta}/ (máx. {args.max_pixeles} píxeles por caja)")
+    for modo in MODOS_COLOR:
+        print(f"   {modo:<10} exactitud={aciertos[modo] / total:6.1%}  "
+              f"{segundos[modo] / total * 1e6:8.1f} µs/caja")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark de decodificación + reducción por frame muestreado
+Compara el camino actual (FFmpeg a resolución completa + cv2.resize al lado
+de YOLO, lo que hace el letterbox) con el pipeline de GStreamer que muestrea
+y reduce dentro del decodificador (video_gstreamer.py), si OpenCV lo trae
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from muestreo_frames import MuestreadorFrames
+from pipeline_imagenes import tamano_reducido
+from video_gstreamer import MuestreadorGStreamer, gstreamer_disponible
+
+
+def crear_video(ruta, segundos, fps=30, ancho=1920, alto=1080):
+    """Video MJPG sintético con ruido (el decodificador trabaja de verdad)"""
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'MJPG'), fps, (ancho, alto))
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (alto, ancho, 3), dtype=np.uint8)
+    for i in range(segundos * fps):
+        writer.write(np.roll(base, i * 8, axis=1))
+    writer.release()
+
+
+def medir_ffmpeg(ruta, muestras_por_segundo, modo, lado):
+    """(muestras, segundos) decodificando con FFmpeg y reduciendo con cv2.resize"""
+    cap = cv2.VideoCapture(ruta)
+    muestras = 0
+    inicio = time.perf_counter()
+    for frame, _, _ in MuestreadorFrames(cap, muestras_por_segundo, modo):
+        if lado:
+            alto, ancho, escala = tamano_reducido(*frame.shape[:2], lado)
+            if escala != 1.0:
+                frame = cv2.resize(frame, (ancho, alto), interpolation=cv2.INTER_LINEAR)
+        muestras += 1
+    segundos = time.perf_counter() - inicio
+    cap.release()
+    return muestras, segundos
+
+
+def medir_gstreamer(ruta, muestras_por_segundo, lado, decodificador):
+    """(muestras, segundos) con decodificación, muestreo y reducción en GStreamer; None si no abre"""
+    inicio = time.perf_counter()
+    muestreador = MuestreadorGStreamer(ruta, muestras_por_segundo, lado, decodificador)
+    if not muestreador.isOpened():
+        muestreador.release()
+        return None
+    muestras = sum(1 for _ in muestreador)
+    segundos = time.perf_counter() - inicio
+    muestreador.release()
+    return muestras, segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--video', default=None, help='video a leer (por defecto uno sintético 1920x1080)')
+    parser.add_argument('--segundos', type=int, default=10, help='duración del video sintético')
+    parser.add_argument('--muestras', type=float, default=2.0, help='muestras por segundo de video')
+    parser.add_argument('--lado', type=int, default=640, help='lado máximo de salida (YOLO_IMAGEN_TAMANO)')
+    parser.add_argument('--decodificador', default='decodebin', help='fragmento decodificador de GStreamer')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = args.video
+        if ruta is None:
+            ruta = os.path.join(tmp, 'sintetico.avi')
+            crear_video(ruta, args.segundos)
+        cap = cv2.VideoCapture(ruta)
+        ancho, alto = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+
+        print("⏱️  BENCHMARK DE DECODIFICACIÓN + REDUCCIÓN POR FRAME MUESTREADO")
+        print("=" * 50)
+        print(f"🎬 {ancho}x{alto}, {args.muestras} muestras/seg, lado máximo {args.lado}")
+
+        medir_ffmpeg(ruta, args.muestras, 'read', 0)  # calentamiento (caché del sistema operativo)
+        casos = (
+            ('FFmpeg read', 'read', 0),
+            ('FFmpeg read + resize', 'read', args.lado),
+            ('FFmpeg grab + resize', 'grab', args.lado),
+        )
+        for nombre, modo, lado in casos:
+            muestras, segundos = medir_ffmpeg(ruta, args.muestras, modo, lado)
+            print(f"   {nombre:<22} {segundos / muestras * 1000:7.2f} ms/muestra  ({muestras} muestras)")
+
+        if not gstreamer_disponible():
+            print(f"   {'GStreamer':<22} no disponible (OpenCV compilado sin GStreamer)")
+            return
+        medicion = medir_gstreamer(ruta, args.muestras, args.lado, args.decodificador)
+        if medicion is None:
+            print(f"   {'GStreamer':<22} el pipeline no abrió ({args.decodificador})")
+            return
+        muestras, segundos = medicion
+        print(f"   {'GStreamer':<22} {segundos / muestras * 1000:7.2f} ms/muestra  ({muestras} muestras)")
+
+
+if __name__ == "__main__":
+    main()
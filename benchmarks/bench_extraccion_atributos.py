@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extracción de atributos: bucle por box vs operaciones vectorizadas
+Genera frames sintéticos con muchas detecciones y compara
+SistemaClasificacionBatches._extraer_atributos contra extraer_atributos_lote
+"""
+import os
+import sys
+import time
+import argparse
+from types import SimpleNamespace
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from extraccion_vectorizada import extraer_atributos_lote
+from sistema_clasificacion_con_batches import SistemaClasificacionBatches
+
+NOMBRES = {i: f"clase_{i}" for i in range(80)}
+
+
+class BoxFalso:
+    """Una detección con la misma interfaz indexable que ultralytics Boxes[i]"""
+
+    def __init__(self, xyxy, conf, cls):
+        self.xyxy = xyxy[None, :]
+        self.conf = np.array([conf])
+        self.cls = np.array([cls])
+
+
+def generar_detecciones(detecciones, ancho, alto, rng):
+    """(xyxy, conf, cls) aleatorios dentro de un frame ancho x alto"""
+    x1 = rng.uniform(0, ancho - 40, detecciones)
+    y1 = rng.uniform(0, alto - 40, detecciones)
+    xyxy = np.stack([
+        x1, y1,
+        np.minimum(x1 + rng.uniform(20, 300, detecciones), ancho),
+        np.minimum(y1 + rng.uniform(20, 300, detecciones), alto),
+    ], axis=1)
+    return xyxy, rng.uniform(0.25, 1.0, detecciones), rng.integers(0, 80, detecciones)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--detecciones', type=int, default=60, help='detecciones por frame')
+    parser.add_argument('--ancho', type=int, default=1280)
+    parser.add_argument('--alto', type=int, default=720)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 256, (args.alto, args.ancho, 3), dtype=np.uint8)
+    casos = [generar_detecciones(args.detecciones, args.ancho, args.alto, rng) for _ in range(args.frames)]
+
+    # Instancia sin cargar el modelo: solo se necesitan los nombres de clase
+    sistema = SistemaClasificacionBatches.__new__(SistemaClasificacionBatches)
+    sistema.model = SimpleNamespace(names=NOMBRES)
+    sistema.modo_color = 'mean'
+    sistema._integral = None
+
+    inicio = time.perf_counter()
+    for xyxy, conf, cls in casos:
+        boxes = [BoxFalso(xyxy[i], conf[i], cls[i]) for i in range(len(conf))]
+        [sistema._extraer_atributos(box, frame, 'bench.mp4', 'video', 0, 0.0) for box in boxes]
+    por_box = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for xyxy, conf, cls in casos:
+        extraer_atributos_lote(xyxy, conf, cls, frame, NOMBRES, 'bench.mp4', 'video', 0, 0.0)
+    vectorizado = time.perf_counter() - inicio
+
+    total = args.frames * args.detecciones
+    print("⏱️  BENCHMARK DE EXTRACCIÓN DE ATRIBUTOS")
+    print("=" * 50)
+    print(f"📊 {args.frames} frames x {args.detecciones} detecciones ({args.ancho}x{args.alto})")
+    for nombre, segundos in (('por box', por_box), ('vectorizado', vectorizado)):
+        print(f"   {nombre:<12} {segundos:7.3f}s  {segundos / total * 1e6:8.1f} µs/detección  "
+              f"{segundos / args.frames * 1000:7.2f} ms/frame  (x{por_box / segundos:.2f})")
+
+
+if __name__ == "__main__":
+    main()
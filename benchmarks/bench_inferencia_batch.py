@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inferencia YOLO por batches en CPU
+Mide frames/seg para distintos tamaños de batch de inferencia
+"""
+import os
+import sys
+import time
+import argparse
+
+import cv2
+import numpy as np
+from ultralytics import YOLO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import configuracion
+
+
+def cargar_frames(carpeta, total, ancho=1280, alto=720):
+    """Carga imágenes de entrada como frames 1280x720 (o sintéticos si no hay)"""
+    frames = []
+    if os.path.exists(carpeta):
+        for archivo in sorted(os.listdir(carpeta)):
+            if archivo.lower().endswith(('.jpg', '.jpeg', '.png')):
+                img = cv2.imread(os.path.join(carpeta, archivo))
+                if img is not None:
+                    frames.append(cv2.resize(img, (ancho, alto)))
+            if len(frames) >= total:
+                break
+
+    rng = np.random.default_rng(0)
+    while len(frames) < total:
+        frames.append(rng.integers(0, 256, (alto, ancho, 3), dtype=np.uint8))
+
+    return frames
+
+
+def medir(model, frames, tamano_batch):
+    """Devuelve frames/seg procesando los frames en batches del tamaño dado"""
+    inicio = time.perf_counter()
+    for i in range(0, len(frames), tamano_batch):
+        model(frames[i:i + tamano_batch], device='cpu', verbose=False)
+    return len(frames) / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--frames', type=int, default=64)
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--carpeta', default=configuracion.CARPETA_IMAGENES)
+    args = parser.parse_args()
+
+    print("⏱️  BENCHMARK INFERENCIA POR BATCHES (CPU)")
+    print("=" * 50)
+
+    model = YOLO(configuracion.YOLO_MODEL)
+    frames = cargar_frames(args.carpeta, args.frames)
+
+    # Calentamiento (carga de pesos, fusión de capas)
+    model(frames[:2], device='cpu', verbose=False)
+
+    base = None
+    for tamano in args.batches:
+        fps = medir(model, frames, tamano)
+        base = base or fps
+        print(f"   batch={tamano:>3}  {fps:7.2f} frames/seg  (x{fps / base:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark de muestreo de frames: read-all vs grab-skip vs seek
+Genera un video sintético (10 minutos por defecto) y mide el costo de
+obtener las muestras con cada modo de MuestreadorFrames
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from muestreo_frames import MuestreadorFrames
+
+
+def generar_video(ruta, duracion_sec, fps, ancho, alto):
+    """Escribe un video MPEG-4 con contenido en movimiento (no trivial de comprimir)"""
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'mp4v'), fps, (ancho, alto))
+    rng = np.random.default_rng(0)
+    fondo = rng.integers(0, 256, (alto, ancho, 3), dtype=np.uint8)
+    total = int(duracion_sec * fps)
+    for i in range(total):
+        frame = np.roll(fondo, i * 3, axis=1)
+        cv2.putText(frame, str(i), (10, alto // 2), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 3)
+        writer.write(frame)
+    writer.release()
+    return total
+
+
+def medir(ruta, modo, muestras_por_segundo):
+    """Devuelve (segundos, muestras) para recorrer el video con el modo dado"""
+    cap = cv2.VideoCapture(ruta)
+    inicio = time.perf_counter()
+    muestras = sum(1 for _ in MuestreadorFrames(cap, muestras_por_segundo, modo))
+    segundos = time.perf_counter() - inicio
+    cap.release()
+    return segundos, muestras
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--duracion', type=float, default=600, help='segundos de video')
+    parser.add_argument('--fps', type=int, default=30)
+    parser.add_argument('--ancho', type=int, default=1280)
+    parser.add_argument('--alto', type=int, default=720)
+    parser.add_argument('--tasas', type=float, nargs='+', default=[1.0, 0.2])
+    parser.add_argument('--video', help='usar un video existente en lugar del sintético')
+    args = parser.parse_args()
+
+    print("⏱️  BENCHMARK DE MUESTREO DE FRAMES")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = args.video
+        if ruta is None:
+            ruta = os.path.join(tmp, 'sintetico.mp4')
+            print(f"🎬 Generando video sintético de {args.duracion:.0f}s "
+                  f"({args.ancho}x{args.alto} @ {args.fps} fps)...")
+            generar_video(ruta, args.duracion, args.fps, args.ancho, args.alto)
+
+        for tasa in args.tasas:
+            print(f"\n📊 {tasa} muestras/seg")
+            base = None
+            for modo in ('read', 'grab', 'seek'):
+                segundos, muestras = medir(ruta, modo, tasa)
+                base = base or segundos
+                print(f"   {modo:<5} {segundos:8.2f}s  {muestras:5d} muestras  "
+                      f"{segundos / max(muestras, 1) * 1000:7.2f} ms/muestra  (x{base / segundos:.2f})")
+
+
+if __name__ == "__main__":
+    main()
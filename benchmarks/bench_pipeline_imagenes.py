@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark de clasificación de imágenes: secuencial vs pool + batches
+Secuencial: cv2.imread y YOLO imagen por imagen (flujo original).
+Pipeline: decodificación/reducción en un pool de hilos e inferencia por batches
+"""
+import os
+import sys
+import time
+import argparse
+
+import cv2
+from ultralytics import YOLO
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import configuracion
+from inferencia_yolo import opciones_inferencia
+from pipeline_imagenes import PipelineImagenes
+
+
+def listar_imagenes(carpeta, repetir):
+    rutas = sorted(
+        os.path.join(carpeta, archivo) for archivo in os.listdir(carpeta)
+        if archivo.lower().endswith(('.jpg', '.jpeg', '.png', '.bmp'))
+    )
+    return rutas * repetir
+
+
+def medir_secuencial(model, rutas, opciones):
+    """Imágenes/seg y detecciones con imread + YOLO por imagen"""
+    detecciones = 0
+    inicio = time.perf_counter()
+    for ruta in rutas:
+        img = cv2.imread(ruta)
+        if img is not None:
+            detecciones += len(model(img, verbose=False, **opciones)[0].boxes)
+    return len(rutas) / (time.perf_counter() - inicio), detecciones
+
+
+def medir_pipeline(model, rutas, opciones, tamano_batch, hilos):
+    """Imágenes/seg y detecciones con PipelineImagenes"""
+    detecciones = 0
+
+    def consumir(ruta, frame, boxes):
+        nonlocal detecciones
+        detecciones += 0 if boxes is None else len(boxes)
+
+    pipeline = PipelineImagenes(
+        lambda frames: model(frames, verbose=False, **opciones),
+        tamano_batch=tamano_batch, hilos=hilos, lado_maximo=opciones['imgsz']
+    )
+    inicio = time.perf_counter()
+    pipeline.ejecutar(rutas, consumir)
+    return len(rutas) / (time.perf_counter() - inicio), detecciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--carpeta', default=configuracion.CARPETA_IMAGENES)
+    parser.add_argument('--repetir', type=int, default=1, help='recorrer la carpeta N veces')
+    parser.add_argument('--batches', type=int, nargs='+', default=[1, 8])
+    parser.add_argument('--hilos', type=int, default=configuracion.IMAGENES_HILOS_DECODIFICACION)
+    args = parser.parse_args()
+
+    model = YOLO(configuracion.YOLO_MODEL)
+    opciones = opciones_inferencia(model.names)
+    rutas = listar_imagenes(args.carpeta, args.repetir)
+
+    print("⏱️  BENCHMARK DE IMÁGENES: SECUENCIAL VS POOL + BATCHES")
+    print("=" * 50)
+    print(f"🖼️  {len(rutas)} imágenes de {args.carpeta}, modelo {configuracion.YOLO_MODEL}, "
+          f"imgsz={opciones['imgsz']}")
+
+    # Calentamiento: pesos del modelo y archivos en la caché del sistema operativo
+    medir_secuencial(model, rutas[:2], opciones)
+    for ruta in set(rutas):
+        with open(ruta, 'rb') as f:
+            f.read()
+
+    base, detecciones = medir_secuencial(model, rutas, opciones)
+    print(f"   secuencial                 {base:7.2f} imágenes/seg  {detecciones:5d} detecciones")
+    for tamano in args.batches:
+        velocidad, detecciones = medir_pipeline(model, rutas, opciones, tamano, args.hilos)
+        print(f"   pool {args.hilos} hilos, batch={tamano:<3}  {velocidad:7.2f} imágenes/seg  "
+              f"{detecciones:5d} detecciones  (x{velocidad / base:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria: cap.read() vs PoolFrames (cap.read(image=buf))
+Lee un video 1280x720 manteniendo N frames en vuelo (como las colas del
+pipeline) y compara frames/seg, buffers nuevos por segundo y pico de memoria
+(tracemalloc ve los arrays que crea OpenCV)
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+from collections import deque
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from pool_frames import PoolFrames
+
+
+def crear_video(ruta, num_frames, ancho=1280, alto=720):
+    """Video MJPG sintético con ruido (el decodificador trabaja de verdad)"""
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'MJPG'), 30, (ancho, alto))
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 256, (alto, ancho, 3), dtype=np.uint8)
+    for i in range(num_frames):
+        writer.write(np.roll(base, i * 8, axis=1))
+    writer.release()
+
+
+def recorrer(ruta, pool, en_vuelo):
+    """(frames, buffers nuevos, segundos) leyendo todo el video"""
+    cap = cv2.VideoCapture(ruta)
+    pendientes = deque()
+    frames = nuevos = 0
+    inicio = time.perf_counter()
+    while True:
+        ok, frame = cap.read() if pool is None else pool.leer(cap)
+        if not ok:
+            break
+        frames += 1
+        pendientes.append(frame)
+        # El frame más viejo ya pasó por inferencia y extracción: se suelta
+        if len(pendientes) > en_vuelo:
+            viejo = pendientes.popleft()
+            if pool is not None:
+                pool.liberar(viejo)
+    segundos = time.perf_counter() - inicio
+    cap.release()
+    nuevos = frames if pool is None else pool.asignados
+    return frames, nuevos, segundos
+
+
+def medir(ruta, usar_pool, en_vuelo):
+    frames, nuevos, segundos = recorrer(ruta, PoolFrames() if usar_pool else None, en_vuelo)
+    # Segunda pasada solo para el pico de memoria (tracemalloc agrega overhead al tiempo)
+    tracemalloc.start()
+    recorrer(ruta, PoolFrames() if usar_pool else None, en_vuelo)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return frames, nuevos, segundos, pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--video', default=None, help='video a leer (por defecto uno sintético 1280x720)')
+    parser.add_argument('--frames', type=int, default=300, help='frames del video sintético')
+    parser.add_argument('--en-vuelo', type=int, default=16, help='frames retenidos a la vez (colas del pipeline)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = args.video
+        if ruta is None:
+            ruta = os.path.join(tmp, 'sintetico.avi')
+            crear_video(ruta, args.frames)
+        alto = int(cv2.VideoCapture(ruta).get(cv2.CAP_PROP_FRAME_HEIGHT))
+        ancho = int(cv2.VideoCapture(ruta).get(cv2.CAP_PROP_FRAME_WIDTH))
+        mb_frame = alto * ancho * 3 / 1024 ** 2
+
+        print("⏱️  BENCHMARK DE MEMORIA: cap.read() VS POOL DE FRAMES")
+        print("=" * 50)
+        print(f"🎬 {ancho}x{alto} ({mb_frame:.2f} MB/frame), {args.en_vuelo} frames en vuelo")
+
+        recorrer(ruta, None, args.en_vuelo)  # calentamiento (caché del sistema operativo)
+        for nombre, usar_pool in (('cap.read()', False), ('PoolFrames', True)):
+            frames, nuevos, segundos, pico = medir(ruta, usar_pool, args.en_vuelo)
+            print(f"   {nombre:<11} {frames / segundos:7.1f} frames/seg  "
+                  f"buffers nuevos={nuevos:5d} ({nuevos * mb_frame / segundos:8.1f} MB/seg asignados)  "
+                  f"pico={pico / 1024 ** 2:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Buffer columnar de detecciones
+Acumula detecciones en columnas NumPy tipadas y preasignadas (en lugar de un
+dict de 28 claves por detección) y las entrega como DataFrame o tabla Arrow
+"""
+import numpy as np
+import pandas as pd
+
+from esquema_detecciones import COLUMNAS_YOLO_OBJECTS
+
+# Textos con pocos valores distintos: se guardan como códigos de diccionario
+COLUMNAS_DICCIONARIO = (
+    'source_type', 'source_id', 'class_name', 'position_region', 'dominant_color_name'
+)
+# Tipos NumPy de las columnas numéricas según el tipo Hive
+_TIPOS_NUMPY = {'INT': np.int32, 'DOUBLE': np.float64}
+
+
+def _decodificar(columna):
+    """Textos de ancho fijo (bytes UTF-8) a una columna de strings"""
+    import pyarrow as pa
+    # Arrow decodifica en bloque; np.char.decode iría valor por valor
+    return pa.array(columna, type=pa.binary()).cast(pa.string()).to_pandas()
+
+
+class _Diccionario:
+    """Codificación valor → código entero para una columna de texto"""
+
+    def __init__(self):
+        self.codigos = {}
+        self.valores = []
+
+    def codificar(self, valor):
+        codigo = self.codigos.get(valor)
+        if codigo is None:
+            codigo = self.codigos[valor] = len(self.valores)
+            self.valores.append(valor)
+        return codigo
+
+    def codificar_array(self, valores):
+        """Códigos para un array de valores (un lookup por valor distinto)"""
+        unicos, inversos = np.unique(np.asarray(valores, dtype=object).astype(str), return_inverse=True)
+        return np.array([self.codificar(valor) for valor in unicos], dtype=np.int32)[inversos]
+
+
+class BufferDetecciones:
+    """Columnas append-only con el esquema de yolo_objects"""
+
+    def __init__(self, capacidad=4096):
+        self.capacidad = max(1, capacidad)
+        self.filas = 0
+        self.tipos = dict(COLUMNAS_YOLO_OBJECTS)
+        self._reservar(self.capacidad)
+
+    def _reservar(self, capacidad):
+        """Columnas vacías: numéricas tipadas, códigos int32 y textos de ancho fijo"""
+        self.columnas = {}
+        self.diccionarios = {}
+        for nombre, tipo in COLUMNAS_YOLO_OBJECTS:
+            if nombre in COLUMNAS_DICCIONARIO:
+                self.columnas[nombre] = np.empty(capacidad, dtype=np.int32)
+                self.diccionarios[nombre] = _Diccionario()
+            elif tipo == 'STRING':
+                # Ancho inicial en bytes; crece si llega un texto más largo
+                self.columnas[nombre] = np.empty(capacidad, dtype='S8')
+            else:
+                self.columnas[nombre] = np.empty(capacidad, dtype=_TIPOS_NUMPY[tipo])
+
+    def __len__(self):
+        return self.filas
+
+    @property
+    def nbytes(self):
+        """Bytes reservados por las columnas (sin contar los diccionarios)"""
+        return sum(columna.nbytes for columna in self.columnas.values())
+
+    @property
+    def bytes_filas(self):
+        """Bytes ocupados por las filas actuales"""
+        return self.filas * sum(columna.itemsize for columna in self.columnas.values())
+
+    def _asegurar_capacidad(self, filas_nuevas):
+        necesaria = self.filas + filas_nuevas
+        if necesaria <= self.capacidad:
+            return
+        capacidad = self.capacidad
+        while capacidad < necesaria:
+            capacidad *= 2
+        for nombre, columna in self.columnas.items():
+            nueva = np.empty(capacidad, dtype=columna.dtype)
+            nueva[:self.filas] = columna[:self.filas]
+            self.columnas[nombre] = nueva
+        self.capacidad = capacidad
+
+    def _asegurar_ancho(self, nombre, valores):
+        """Ensancha una columna de texto fijo si algún valor no cabe"""
+        columna = self.columnas[nombre]
+        ancho = max(len(valor) for valor in valores)
+        if ancho > columna.dtype.itemsize:
+            self.columnas[nombre] = columna.astype(f'S{ancho}')
+
+    def agregar(self, deteccion):
+        """Agrega una detección en formato dict (columna → valor)"""
+        self._asegurar_capacidad(1)
+        i = self.filas
+        for nombre, tipo in COLUMNAS_YOLO_OBJECTS:
+            valor = deteccion.get(nombre)
+            if nombre in self.diccionarios:
+                self.columnas[nombre][i] = self.diccionarios[nombre].codificar(str(valor))
+            elif tipo == 'STRING':
+                texto = str(valor).encode('utf-8')
+                self._asegurar_ancho(nombre, [texto])
+                self.columnas[nombre][i] = texto
+            else:
+                self.columnas[nombre][i] = valor
+        self.filas += 1
+
+    def agregar_lote(self, lote):
+        """Agrega un lote columnar (columna → array) de una sola vez"""
+        n = len(lote['class_id'])
+        if n == 0:
+            return
+        self._asegurar_capacidad(n)
+        desde, hasta = self.filas, self.filas + n
+        for nombre, tipo in COLUMNAS_YOLO_OBJECTS:
+            valores = lote[nombre]
+            if nombre in self.diccionarios:
+                self.columnas[nombre][desde:hasta] = self.diccionarios[nombre].codificar_array(valores)
+            elif tipo == 'STRING':
+                textos = np.char.encode(np.asarray(valores, dtype=object).astype(str), 'utf-8')
+                self._asegurar_ancho(nombre, textos)
+                self.columnas[nombre][desde:hasta] = textos
+            else:
+                self.columnas[nombre][desde:hasta] = valores
+        self.filas = hasta
+
+    def vaciar(self):
+        """Descarta las filas y los diccionarios, conservando la memoria reservada"""
+        self.filas = 0
+        self.diccionarios = {nombre: _Diccionario() for nombre in self.diccionarios}
+
+    def a_dataframe(self):
+        """DataFrame con las filas actuales; numéricas y códigos sin copiar
+
+        Las columnas comparten memoria con el buffer: usar el DataFrame antes
+        de vaciar() o copiarlo si debe sobrevivir al siguiente batch.
+        """
+        n = self.filas
+        datos = {}
+        for nombre, tipo in COLUMNAS_YOLO_OBJECTS:
+            columna = self.columnas[nombre][:n]
+            if nombre in self.diccionarios:
+                datos[nombre] = pd.Categorical.from_codes(columna, self.diccionarios[nombre].valores)
+            elif tipo == 'STRING':
+                datos[nombre] = _decodificar(columna)
+            else:
+                datos[nombre] = columna
+        return pd.DataFrame(datos, copy=False)
+
+    def a_arrow(self):
+        """Tabla pyarrow con diccionarios nativos; numéricas sin copiar"""
+        import pyarrow as pa
+
+        n = self.filas
+        arrays = []
+        for nombre, tipo in COLUMNAS_YOLO_OBJECTS:
+            columna = self.columnas[nombre][:n]
+            if nombre in self.diccionarios:
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    pa.array(columna), pa.array(self.diccionarios[nombre].valores, type=pa.string())
+                ))
+            elif tipo == 'STRING':
+                arrays.append(pa.array(columna, type=pa.binary()).cast(pa.string()))
+            else:
+                arrays.append(pa.array(columna))
+        return pa.Table.from_arrays(arrays, names=[nombre for nombre, _ in COLUMNAS_YOLO_OBJECTS])
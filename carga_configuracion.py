@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Overrides de configuración por nodo
+Los valores por defecto de configuracion.py definen el nombre y el tipo de
+cada ajuste; un archivo JSON y las variables de entorno YOLOHIVE_<AJUSTE>
+los reemplazan sin editar código
+"""
+import os
+import json
+
+PREFIJO_ENTORNO = 'YOLOHIVE_'
+# Archivo de overrides: variable YOLOHIVE_CONFIG o este nombre junto a configuracion.py
+VARIABLE_ARCHIVO = 'YOLOHIVE_CONFIG'
+ARCHIVO_POR_DEFECTO = 'configuracion_local.json'
+
+_VERDADEROS = {'1', 'true', 'si', 'sí', 'yes', 'on'}
+_FALSOS = {'0', 'false', 'no', 'off'}
+_TIPOS_AJUSTE = (bool, int, float, str, type(None))
+
+
+def ajustes(espacio):
+    """Ajustes sobreescribibles: constantes en MAYÚSCULAS de tipo escalar"""
+    return {
+        nombre: valor for nombre, valor in espacio.items()
+        if nombre.isupper() and not nombre.startswith('_') and isinstance(valor, _TIPOS_AJUSTE)
+    }
+
+
+def nombre_entorno(nombre):
+    """Variable de entorno de un ajuste (solo ASCII: BATCH_TAMAÑO_MAXIMO → ..._TAMANO_...)"""
+    return PREFIJO_ENTORNO + nombre.replace('Ñ', 'N')
+
+
+def convertir(nombre, valor, referencia):
+    """Convierte un override al tipo del valor por defecto; ValueError si no es válido"""
+    tipo = type(referencia)
+    if referencia is None:
+        # Ajustes opcionales de texto: vacío → None
+        return None if valor in (None, '') else str(valor)
+    if isinstance(valor, str) and tipo is not str:
+        texto = valor.strip().lower()
+        if tipo is bool:
+            if texto in _VERDADEROS:
+                return True
+            if texto in _FALSOS:
+                return False
+            raise ValueError(f"{nombre}: '{valor}' no es un booleano")
+        try:
+            return tipo(texto)
+        except ValueError:
+            raise ValueError(f"{nombre}: '{valor}' no es {tipo.__name__}") from None
+    if tipo is float and isinstance(valor, int) and not isinstance(valor, bool):
+        return float(valor)
+    if type(valor) is not tipo:
+        raise ValueError(f"{nombre}: se esperaba {tipo.__name__}, llegó {type(valor).__name__}")
+    return valor
+
+
+def leer_archivo(ruta):
+    """Overrides de un archivo JSON {"AJUSTE": valor}"""
+    with open(ruta, encoding='utf-8') as f:
+        datos = json.load(f)
+    if not isinstance(datos, dict):
+        raise ValueError(f"{ruta}: se esperaba un objeto JSON con los ajustes")
+    return datos
+
+
+def aplicar_overrides(espacio, ruta_archivo=None, entorno=None):
+    """Aplica sobre espacio (globals() de configuracion) el archivo y luego el entorno
+
+    Devuelve {ajuste: origen} con los valores reemplazados. Un ajuste
+    desconocido en el archivo es un error (evita typos silenciosos).
+    """
+    entorno = os.environ if entorno is None else entorno
+    por_defecto = ajustes(espacio)
+    aplicados = {}
+
+    if ruta_archivo is None:
+        ruta_archivo = entorno.get(VARIABLE_ARCHIVO)
+        if ruta_archivo is None:
+            ruta_archivo = os.path.join(os.path.dirname(os.path.abspath(__file__)), ARCHIVO_POR_DEFECTO)
+            if not os.path.exists(ruta_archivo):
+                ruta_archivo = None
+
+    if ruta_archivo:
+        for nombre, valor in leer_archivo(ruta_archivo).items():
+            if nombre not in por_defecto:
+                raise ValueError(f"{ruta_archivo}: ajuste desconocido '{nombre}'")
+            espacio[nombre] = convertir(nombre, valor, por_defecto[nombre])
+            aplicados[nombre] = ruta_archivo
+
+    for nombre, referencia in por_defecto.items():
+        variable = nombre_entorno(nombre)
+        if variable in entorno:
+            espacio[nombre] = convertir(nombre, entorno[variable], referencia)
+            aplicados[nombre] = variable
+
+    return aplicados
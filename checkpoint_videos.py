@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Checkpoints de videos procesados por batches
+Guarda por video hasta qué segundo llegaron a Hive sus batches, para que
+una corrida interrumpida se reanude con un seek en lugar de empezar de cero
+"""
+import os
+import json
+import hashlib
+
+
+class CheckpointsVideos:
+    """Un JSON por video con los batches ya enviados y el que estaba en vuelo"""
+
+    def __init__(self, directorio, version_modelo):
+        self.directorio = directorio
+        self.version_modelo = version_modelo
+
+    def _ruta(self, video_path):
+        clave = hashlib.sha1(os.path.abspath(video_path).encode('utf-8')).hexdigest()[:10]
+        return os.path.join(self.directorio, f"{os.path.basename(video_path)}.{clave}.json")
+
+    def cargar(self, video_path):
+        """Checkpoint vigente del video, o None si no hay o el video/modelo cambió"""
+        ruta = self._ruta(video_path)
+        if not os.path.exists(ruta):
+            return None
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        stat = os.stat(video_path)
+        vigente = (
+            checkpoint.get('tamano') == stat.st_size
+            and checkpoint.get('mtime') == stat.st_mtime
+            and checkpoint.get('version_modelo') == self.version_modelo
+        )
+        return checkpoint if vigente else None
+
+    def guardar(self, video_path, batches_enviados, segundos_enviados, lote_en_envio=None,
+                filas_en_envio=None, segundos_intentados=None):
+        """Persiste el avance; lote_en_envio marca un batch cuyo LOAD aún no se confirmó
+
+        segundos_enviados es el timestamp del primer frame que no llegó a Hive;
+        segundos_intentados, hasta dónde se enviaron batches (cargados o no)
+        después de uno fallido: al reanudar se cotejan con Hive.
+        """
+        stat = os.stat(video_path)
+        checkpoint = {
+            'video': video_path,
+            'tamano': stat.st_size,
+            'mtime': stat.st_mtime,
+            'version_modelo': self.version_modelo,
+            'batches_enviados': batches_enviados,
+            'segundos_enviados': segundos_enviados,
+            'lote_en_envio': lote_en_envio,
+            'filas_en_envio': filas_en_envio,
+            'segundos_intentados': segundos_intentados,
+        }
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = self._ruta(video_path)
+        # Escritura atómica: un corte a mitad no deja el checkpoint corrupto
+        with open(f"{ruta}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(f"{ruta}.tmp", ruta)
+
+    def eliminar(self, video_path):
+        """Borra el checkpoint de un video terminado"""
+        ruta = self._ruta(video_path)
+        if os.path.exists(ruta):
+            os.remove(ruta)
@@ -1,5 +1,175 @@
+import time
 import cv2
-from threading import Thread
+from threading import Condition, Thread
+
+
+class FrameRingBuffer:
+    """Summary of class FrameRingBuffer.
+
+    Single-producer ring buffer holding the most recent frames read by the camera thread.
+    The producer never waits: when the consumer falls behind, the oldest slots are
+    overwritten and counted as dropped. Every frame gets a sequence number and the
+    time it was read, so consumers can tell new frames from repeated ones.
+
+    Attributes:
+        capacity : It is a int value indicating how many frames are kept. Default = 8
+        on_discard : It is a function called with every frame that will never be delivered
+                     (overwritten or skipped), e.g. to give a pooled buffer back. With it each
+                     frame is delivered once and read_latest() returns None instead of a
+                     duplicate. Default = None
+        frames_written : frames published by the producer
+        frames_dropped : frames overwritten or skipped before the consumer read them
+        frames_duplicated : times read_latest() returned a frame that was already delivered
+    """
+
+    def __init__(self, capacity=8, on_discard=None):
+        self.capacity = max(1, int(capacity))
+        self.on_discard = on_discard
+        # each slot holds a (sequence, timestamp, frame) tuple, replaced as a whole
+        self._slots = [None] * self.capacity
+        # sequence number of the next frame to write / to deliver to the consumer
+        self._write_seq = 0
+        self._read_seq = 0
+        self._closed = False
+        # wakes up read_next(); without on_discard readers never take it
+        self._new_frame = Condition()
+
+        self.frames_written = 0
+        self.frames_dropped = 0
+        self.frames_duplicated = 0
+
+    # publish a new frame (producer thread only)
+    def put(self, frame, timestamp=None):
+        seq = self._write_seq
+        if timestamp is None:
+            timestamp = time.monotonic()
+        if self.on_discard is not None:
+            return self.__put_owned(seq, timestamp, frame)
+        # the slot is filled before the sequence advances, so a reader that sees
+        # the new sequence always finds the matching tuple
+        self._slots[seq % self.capacity] = (seq, timestamp, frame)
+        self._write_seq = seq + 1
+        self.frames_written += 1
+        with self._new_frame:
+            self._new_frame.notify_all()
+        return seq
+
+    def __put_owned(self, seq, timestamp, frame):
+        # frames with an owner (pool): the hand-off is decided under the lock so a
+        # buffer is either delivered or discarded, never both
+        with self._new_frame:
+            old = self._slots[seq % self.capacity]
+            self._slots[seq % self.capacity] = (seq, timestamp, frame)
+            self._write_seq = seq + 1
+            self.frames_written += 1
+            self._new_frame.notify_all()
+            lost = old is not None and old[0] >= self._read_seq
+        if lost:
+            self.on_discard(old[2])
+        return seq
+
+    # no more frames will arrive: wake up any read_next() waiting
+    def close(self):
+        self._closed = True
+        with self._new_frame:
+            self._new_frame.notify_all()
+
+    def is_closed(self):
+        return self._closed
+
+    def __slot(self, seq):
+        # returns the slot of seq or None if it was already overwritten
+        item = self._slots[seq % self.capacity]
+        if item is not None and item[0] == seq:
+            return item
+        return None
+
+    def peek(self):
+        """Returns the newest (sequence, timestamp, frame) without consuming it, or None."""
+        while True:
+            seq = self._write_seq - 1
+            if seq < 0:
+                return None
+            item = self.__slot(seq)
+            if item is not None:
+                return item
+            # overwritten while reading: take the newer one
+
+    def read_latest(self):
+        """Returns (sequence, timestamp, frame) of the newest frame, or None if there is none yet.
+
+        Frames published since the previous read are skipped and counted as dropped;
+        getting the same frame again is counted as duplicated.
+        """
+        if self.on_discard is not None:
+            return self.__read_latest_owned()
+        item = self.peek()
+        if item is None:
+            return None
+
+        seq = item[0]
+        if seq < self._read_seq:
+            self.frames_duplicated += 1
+        else:
+            self.frames_dropped += seq - self._read_seq
+            self._read_seq = seq + 1
+        return item
+
+    def __read_latest_owned(self):
+        with self._new_frame:
+            item = self.peek()
+            if item is None or item[0] < self._read_seq:
+                return None
+            # skipped frames still in the ring will never be delivered
+            skipped = [self.__slot(seq) for seq in range(self._read_seq, item[0])]
+            self.frames_dropped += item[0] - self._read_seq
+            self._read_seq = item[0] + 1
+        for old in skipped:
+            if old is not None:
+                self.on_discard(old[2])
+        return item
+
+    def read_next(self, timeout=None):
+        """Returns the next unread (sequence, timestamp, frame) in order.
+
+        Waits up to timeout seconds (None = forever) for a new frame and returns
+        None on timeout or when the buffer is closed. Frames overwritten before
+        being read are skipped and counted as dropped.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._new_frame:
+            while self._read_seq >= self._write_seq:
+                if self._closed:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._new_frame.wait(remaining)
+            if self.on_discard is not None:
+                # the producer can't overwrite while the lock is held
+                return self.__take_oldest()
+
+        while True:
+            item = self.__take_oldest()
+            if item is not None:
+                return item
+
+    def __take_oldest(self):
+        # the oldest frame still in the buffer, or None if it was just overwritten
+        oldest = max(self._read_seq, self._write_seq - self.capacity)
+        item = self.__slot(oldest)
+        if item is not None:
+            self.frames_dropped += oldest - self._read_seq
+            self._read_seq = oldest + 1
+        return item
+
+    def stats(self):
+        return {
+            "written": self.frames_written,
+            "dropped": self.frames_dropped,
+            "duplicated": self.frames_duplicated,
+            "pending": self._write_seq - self._read_seq,
+        }
 
 
 class streamingmultiplescamaras:
@@ -9,6 +179,11 @@ class streamingmultiplescamaras:
         fps : It is a int value indicating the frame per second. Default = 0
         camera_type: It is a int value. 0 = CSI Camera, 1 = RSTP Camera, 3 = USB Camera. Default = 0
         device_id : It is a int value. This is used to call CSI and USB devices. 0 = CSI, 1 = USB. to see a list of devices, please run ls /dev/video* in a terminal. Default = 0
+        threaded : It is a bool value. Reads the camera in a background thread into a FrameRingBuffer. Default = enforce_fps
+        buffer_size : It is a int value indicating the frames kept by the threaded reader. Default = 8
+        read_timeout : It is a float value. Seconds read() waits for the first frame of the threaded reader. Default = 5.0
+        frame_pool : It is a pool_frames.PoolFrames. Frames are decoded into reused buffers (cap.read(image=buf));
+                     give each one back with release_frame() when done with it. Default = None
     """
 
     # The __init__ method is called when the object is created
@@ -26,6 +201,10 @@ class streamingmultiplescamaras:
         enforce_fps=False,
         debug=False,
         windows=False,
+        threaded=None,
+        buffer_size=8,
+        read_timeout=5.0,
+        frame_pool=None,
     ):
 
         # Operating System
@@ -63,9 +242,17 @@ class streamingmultiplescamaras:
 
         # created a thread for enforcing FPS camera read and write
         self.cam_thread = None
+        self.threaded = enforce_fps if threaded is None else threaded
+        self.read_timeout = read_timeout
 
-        # holds the frame data
-        self.frame = None
+        # preallocated frames: decoded in place instead of a new array per read
+        self.frame_pool = frame_pool
+
+        # holds the latest frames read by the thread; frames the consumer never
+        # gets go straight back to the pool
+        self.frame_buffer = FrameRingBuffer(
+            buffer_size, on_discard=frame_pool.liberar if frame_pool is not None else None
+        )
 
         # tracks if a CAM opened was succesful or not
         self.cam_opened = False
@@ -76,9 +263,13 @@ class streamingmultiplescamaras:
         # open the camera interface
         self.__open_camera()
 
-        # enable a threaded read if enforce_fps is active
-        if self.enforce_fps:
-            self.__start()
+        # enable a threaded read (by default when enforce_fps is active)
+        if self.threaded:
+            if self.cam_opened:
+                self.__start()
+            else:
+                # nothing will ever be read: read_next() must not wait forever
+                self.frame_buffer.close()
 
     def __gstreamer_pipeline_CSI(self, sensor_id=0):
         return (
@@ -363,32 +554,43 @@ class streamingmultiplescamaras:
 
     # uses thread to read
     def __thread_read(self):
-        # time.sleep(1)
-        while self.cam_opened:
-            try:
-                self.frame = self.__read()
-
-            except Exception:
-                # update the error value parameter
-                self.error_value.append(2)
-                self.cam_opened = False
-                if self.debug_mode:
-                    raise RuntimeError("Thread Error: Could not read image from camera")
-                break
-        # reset the thread object:
-        self.cam_thread = None
-
-    def __read(self):
-        # reading images
-        ret, image = self.cap.read()
+        try:
+            while self.cam_opened:
+                image = self.__read()
+                if image is None:
+                    # end of stream or camera lost (error 3 already recorded);
+                    # stop instead of spinning on a dead capture
+                    self.cam_opened = False
+                    break
+                self.frame_buffer.put(image)
+
+        except Exception:
+            # update the error value parameter
+            self.error_value.append(2)
+            self.cam_opened = False
+            if self.debug_mode:
+                raise RuntimeError("Thread Error: Could not read image from camera")
+        finally:
+            # wake up consumers waiting in read_next()
+            self.frame_buffer.close()
+
+    def __read(self, image=None):
+        # reading images (into the given array or a pooled one when possible)
+        if image is not None:
+            ret, image = self.cap.read(image=image)
+        elif self.frame_pool is not None:
+            ret, image = self.frame_pool.leer(self.cap)
+        else:
+            ret, image = self.cap.read()
         if ret:
             return image
         else:
             # update the error value parameter
             self.error_value.append(3)
 
-    def read(self):
-        # read the camera stream
+    def read(self, image=None):
+        # read the camera stream; like cv2.VideoCapture.read, image is an optional
+        # array to decode into (ignored by the threaded reader)
         try:
             # check if debugging is activated
             if self.debug_mode:
@@ -397,28 +599,68 @@ class streamingmultiplescamaras:
                     raise RuntimeError(
                         "An error as occurred. Error Value:", self.error_value
                     )
-            if self.enforce_fps:
-                # if threaded read is enabled, it is possible the thread hasn't run yet
-                if self.frame is not None:
-                    return self.frame
-                else:
-                    # we need to wait for the thread to be ready.
-                    return self.__read()
+            if self.threaded:
+                # the thread stopped and every frame was delivered: end of stream
+                if self.frame_buffer.is_closed() and not self.frame_buffer.stats()["pending"]:
+                    return None
+                # only the thread touches the capture; if it hasn't produced a
+                # frame yet wait for it instead of reading concurrently
+                item = self.read_latest()
+                if item is None:
+                    item = self.read_next(self.read_timeout)
+                return None if item is None else item[2]
             else:
-                return self.__read()
+                return self.__read(image)
         except Exception as ee:
             if self.debug_mode:
                 raise RuntimeError(ee.args)
 
+    # newest frame as (sequence, timestamp, frame); with a threaded reader it never
+    # blocks and may repeat the previous frame (counted as duplicated, or None with a frame_pool)
+    def read_latest(self):
+        if not self.threaded and not self.__read_into_buffer():
+            return None
+        return self.frame_buffer.read_latest()
+
+    # next unread frame as (sequence, timestamp, frame), in order, or None on timeout
+    def read_next(self, timeout=None):
+        if not self.threaded:
+            return self.frame_buffer.read_next(0) if self.__read_into_buffer() else None
+        return self.frame_buffer.read_next(timeout)
+
+    # without the thread, a synchronous read feeds the same buffer and counters
+    def __read_into_buffer(self):
+        image = self.__read()
+        if image is None:
+            return False
+        self.frame_buffer.put(image)
+        return True
+
+    # gives a frame back to the frame pool once inference is done with it
+    def release_frame(self, frame):
+        if self.frame_pool is not None:
+            self.frame_pool.liberar(frame)
+
+    # frames written, dropped, duplicated and pending in the buffer
+    def getFrameStats(self):
+        return self.frame_buffer.stats()
+
+    # latest frame read (kept for code that used the old attribute)
+    @property
+    def frame(self):
+        item = self.frame_buffer.peek()
+        return None if item is None else item[2]
+
     def release(self):
         # destroy the opencv camera object
         try:
             # update the cam opened variable
             self.cam_opened = False
             # ensure the camera thread stops running
-            if self.enforce_fps:
-                if self.cam_thread is not None:
-                    self.cam_thread.join()
+            if self.cam_thread is not None:
+                self.cam_thread.join()
+                self.cam_thread = None
+            self.frame_buffer.close()
             if self.cap is not None:
                 self.cap.release()
             # update the cam opened variable
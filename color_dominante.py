@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Color dominante de un bounding box
+Modos: 'mean' (promedio, O(1) con la imagen integral), 'histogram' (moda de un
+histograma RGB cuantizado) y 'kmeans' (k-means de iteraciones fijas). Los dos
+últimos trabajan sobre la ROI submuestreada a un máximo de píxeles por caja
+"""
+import numpy as np
+
+from imagen_integral import ImagenIntegral
+
+MODOS_COLOR = ('mean', 'histogram', 'kmeans')
+
+# Histograma: 8 niveles por canal → 512 celdas
+_BITS_HISTOGRAMA = 3
+# k-means: pocos clusters e iteraciones fijas para acotar el costo por caja
+_K_CLUSTERS = 3
+_ITERACIONES_KMEANS = 6
+
+
+def pixeles_submuestreados(frame, x1, y1, x2, y2, max_pixeles):
+    """Píxeles (N, 3) de la ROI tomados con un paso que deja como mucho ~max_pixeles"""
+    roi = frame[max(y1, 0):max(y2, 0), max(x1, 0):max(x2, 0)]
+    if roi.size == 0:
+        return None
+    paso = max(1, int(np.ceil(np.sqrt(roi.shape[0] * roi.shape[1] / max_pixeles))))
+    return roi[::paso, ::paso].reshape(-1, 3)
+
+
+def _moda_histograma(pixeles):
+    """Promedio de los píxeles de la celda más poblada del histograma cuantizado"""
+    q = pixeles.astype(np.int64) >> (8 - _BITS_HISTOGRAMA)
+    celdas = q[:, 0]
+    for canal in range(1, q.shape[1]):
+        celdas = (celdas << _BITS_HISTOGRAMA) | q[:, canal]
+    moda = np.argmax(np.bincount(celdas))
+    return pixeles[celdas == moda].mean(axis=0)
+
+
+def _kmeans(pixeles):
+    """Centro del cluster más grande tras un k-means de iteraciones fijas"""
+    datos = pixeles.astype(np.float32)
+    k = min(_K_CLUSTERS, len(datos))
+    # Inicialización determinista: píxeles repartidos según la luminancia
+    orden = np.argsort(datos.sum(axis=1), kind='stable')
+    centros = datos[orden[np.linspace(0, len(datos) - 1, k).astype(int)]]
+    for _ in range(_ITERACIONES_KMEANS):
+        distancias = ((datos[:, None, :] - centros[None, :, :]) ** 2).sum(axis=2)
+        etiquetas = np.argmin(distancias, axis=1)
+        conteos = np.bincount(etiquetas, minlength=k)
+        for c in np.nonzero(conteos)[0]:
+            centros[c] = datos[etiquetas == c].mean(axis=0)
+    return centros[np.argmax(conteos)].astype(np.float64)
+
+
+def color_dominante(frame, x1, y1, x2, y2, modo='mean', integral=None, max_pixeles=1024):
+    """Color dominante BGR (float) de una caja, o None si la caja no tiene píxeles"""
+    if modo == 'mean':
+        return (integral or ImagenIntegral(frame)).promedio(x1, y1, x2, y2)
+    if modo not in MODOS_COLOR:
+        raise ValueError(f"Modo de color desconocido: {modo} (usar uno de {MODOS_COLOR})")
+
+    pixeles = pixeles_submuestreados(frame, x1, y1, x2, y2, max_pixeles)
+    if pixeles is None:
+        return None
+    if modo == 'histogram':
+        return _moda_histograma(pixeles)
+    return _kmeans(pixeles)
+
+
+def colores_dominantes(frame, x1, y1, x2, y2, modo='mean', integral=None, max_pixeles=1024):
+    """Color dominante BGR (N, 3) de N cajas y máscara de cajas no vacías"""
+    if modo == 'mean':
+        return (integral or ImagenIntegral(frame)).promedios(x1, y1, x2, y2)
+
+    colores = np.zeros((len(x1), 3))
+    validas = np.zeros(len(x1), dtype=bool)
+    for i in range(len(x1)):
+        color = color_dominante(frame, x1[i], y1[i], x2[i], y2[i], modo, max_pixeles=max_pixeles)
+        if color is not None:
+            colores[i] = color
+            validas[i] = True
+    return colores, validas
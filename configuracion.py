@@ -1,26 +1,124 @@
 #!/usr/bin/env python3
 """
 Configuraciones del sistema YOLO + Hive
+Valores por defecto; cada nodo los ajusta sin editar código con un JSON
+(configuracion_local.json o YOLOHIVE_CONFIG) o variables YOLOHIVE_<AJUSTE>.
+`python configuracion.py` muestra la configuración efectiva
 """
+import os
 
-# Configuración de Hive
-HIVE_CONFIG = {
-    'host': 'localhost',
-    'port': 10000,
-    'username': 'jose_dev',
-    'database': 'yolo_project',
-    'auth': 'NONE'
-}
+from carga_configuracion import aplicar_overrides
+
+# Configuración de Hive (en WSL: YOLOHIVE_HIVE_HOST=<IP de WSL>)
+HIVE_HOST = 'localhost'
+HIVE_PORT = 10000
+HIVE_USERNAME = 'jose_dev'
+HIVE_DATABASE = 'yolo_project'
+HIVE_TABLA = 'yolo_objects'
+HIVE_AUTH = 'NONE'  # NONE | NOSASL | ... (según hive.server2.authentication)
+# Sesión persistente: health check (SELECT 1) solo si estuvo inactiva este tiempo
+HIVE_VERIFICAR_CONEXION_SEGUNDOS = 30
+# Carga de batches: 'archivo' (un LOAD DATA por batch) o 'filas' (INSERT por fila)
+HIVE_MODO_CARGA = 'archivo'
+HIVE_STAGING_DIR = '/tmp/yolo_hive_staging'  # Local a HiveServer2 (LOAD DATA LOCAL)
+HIVE_STAGING_HDFS_DIR = None  # Si HiveServer2 es remoto: ruta HDFS para 'hdfs dfs -put'
+# Formato de yolo_objects: 'parquet' (columnar, particionada por ingestion_day y
+# source_type) o 'textfile' (CSV sin particiones, formato original)
+HIVE_FORMATO_TABLA = 'parquet'
+# Envío asíncrono (enviador_hive.py): batches en espera y reintentos con backoff
+HIVE_ENVIO_TAM_COLA = 4  # Si se llena, el video espera a Hive (backpressure)
+HIVE_ENVIO_REINTENTOS = 3
+HIVE_ENVIO_ESPERA_INICIAL = 1.0  # Segundos; se duplica en cada reintento
+# Los batches van de memoria a Hive; True guarda además una copia CSV en CARPETA_DATA
+EXPORTAR_CSV_BATCHES = False
 
-# Configuración de batches
-BATCH_DURACION_SEGUNDOS = 10
-BATCH_TAMAÑO_MAXIMO = 100
+# Configuración de batches (batcher_adaptativo.py): se corta por lo que ocurra primero
+BATCH_DURACION_SEGUNDOS = 10  # Segundos de video desde la primera detección del batch
+BATCH_TAMAÑO_MAXIMO = 5000  # Filas por batch (cada LOAD DATA es un job de Hive: no conviene bajo)
+BATCH_MAXIMO_MB = 64  # Tamaño del batch en memoria
+BATCH_IMAGENES_SEGUNDOS = 30  # Imágenes: segundos de reloj desde la primera detección
 
 # Configuración de YOLO
 YOLO_MODEL = 'yolov8n.pt'
-CONFIDENCE_THRESHOLD = 0.5
+# Filtros aplicados dentro de la llamada a YOLO (inferencia_yolo.py)
+CONFIDENCE_THRESHOLD = 0.5  # Confianza mínima de una detección
+YOLO_IOU_NMS = 0.7  # IoU de supresión de no-máximos
+YOLO_MAX_DETECCIONES = 300  # Máximo de detecciones por frame
+YOLO_CLASES = ''  # Nombres separados por coma ('person,car'); vacío = todas
+YOLO_BATCH_INFERENCIA = 8  # Frames muestreados (o imágenes) por llamada a YOLO
+YOLO_IMAGEN_TAMANO = 640  # Lado de entrada del modelo (imgsz); menor = más rápido, menos recall
+
+# Color dominante de cada detección
+COLOR_DOMINANTE_MODO = 'histogram'  # mean | histogram | kmeans
+COLOR_DOMINANTE_MAX_PIXELES = 1024  # Submuestreo de la ROI en histogram/kmeans (presupuesto por caja)
+
+# Configuración del pipeline de video (decodificación / inferencia en hilos)
+PIPELINE_TAMANO_COLA = 16  # Frames en espera entre etapas (backpressure)
+# Decodificar en buffers reutilizados (pool_frames.py) en vez de un array nuevo por frame
+PIPELINE_REUTILIZAR_FRAMES = True
+# Videos de archivo con GStreamer (video_gstreamer.py): decodebin (hardware si hay
+# plugin) + videorate + videoscale a YOLO_IMAGEN_TAMANO dentro del decodificador.
+# Sin GStreamer en OpenCV (el de pip) se usa FFmpeg como siempre
+VIDEO_GSTREAMER = True
+VIDEO_GSTREAMER_DECODIFICADOR = 'decodebin'  # p. ej. 'qtdemux ! h264parse ! nvv4l2decoder ! nvvidconv'
+
+# Imágenes (pipeline_imagenes.py): hilos que decodifican y reducen en paralelo;
+# más hilos que núcleos compiten con torch por la CPU
+IMAGENES_HILOS_DECODIFICACION = min(4, os.cpu_count() or 1)
+
+# Cámaras en vivo (servicio_camaras.py): 'nombre=fuente[@muestras/seg]; ...'
+# fuente: rtsp://..., /dev/videoN, N, csi:N o cualquier ruta/URL que abra OpenCV
+CAMARAS = ''
+CAMARAS_MUESTRAS_POR_SEGUNDO = 1.0  # Tasa de cada cámara que no indica @muestras
+CAMARAS_HILOS_INFERENCIA = 1  # Pool de inferencia compartido (un modelo YOLO por hilo)
+CAMARAS_TAMANO_COLA = 2  # Muestras en espera por cámara; si se llena se descarta la más vieja
+CAMARAS_RECONECTAR_SEGUNDOS = 5.0  # Espera antes de reabrir una cámara caída (0 = no reabrir)
+CAMARAS_FPS = 30  # Parámetros de captura de streamingmultiplescamaras
+CAMARAS_ANCHO = 1280
+CAMARAS_ALTO = 720
+CAMARAS_GSTREAMER = True  # False: OpenCV directo (opencv de pip no trae GStreamer)
+
+# Procesamiento paralelo de videos (pool de procesos)
+VIDEOS_WORKERS = 1  # 1 = secuencial; N = un proceso (y un modelo YOLO) por worker
+TORCH_HILOS_POR_WORKER = 0  # 0 = núcleos disponibles / workers
+
+# Muestreo de frames de video (ver muestreo_frames.MODOS_MUESTREO)
+MUESTREO_FRAMES_POR_SEGUNDO = 1.0  # Muestras por segundo de video (según FPS real)
+MUESTREO_MODO = 'auto'  # read | grab | seek | auto
+MUESTREO_SEEK_MIN_SEGUNDOS = 300  # En 'auto', usar seek solo en videos de 5+ minutos
+MUESTREO_SEEK_SALTO_MIN_SEGUNDOS = 2.0  # ... y solo si el salto supera un GOP típico
+
+# Archivo de staging (sistema_clasificacion.py): escritura por chunks
+SALIDA_FILAS_POR_CHUNK = 50000  # Detecciones por chunk CSV / row group Parquet
+SALIDA_MEMORIA_MAX_MB = 256  # Se vuelca antes si el buffer supera este tamaño
 
 # Carpetas
 CARPETA_IMAGENES = 'imagenes_entrada'
 CARPETA_VIDEOS = 'videos_entrada'
-CARPETA_DATA = 'data'
\ No newline at end of file
+CARPETA_DATA = 'data'
+
+# Manifiesto de entradas ya procesadas (reejecuciones incrementales; --force lo ignora)
+MANIFIESTO_PROCESADOS = 'data/manifiesto_procesados.json'
+
+# Checkpoints por video: reanudar tras una caída desde la última ventana enviada
+CHECKPOINTS_DIR = 'data/checkpoints'
+
+# Overrides por nodo: archivo JSON y luego variables de entorno (mayor prioridad)
+OVERRIDES = aplicar_overrides(globals())
+
+# Parámetros de pyhive.hive.Connection derivados de los ajustes de Hive
+HIVE_CONFIG = {
+    'host': HIVE_HOST,
+    'port': HIVE_PORT,
+    'username': HIVE_USERNAME,
+    'database': HIVE_DATABASE,
+    'auth': HIVE_AUTH
+}
+
+if __name__ == "__main__":
+    from carga_configuracion import ajustes
+    print("⚙️  CONFIGURACIÓN EFECTIVA")
+    print("=" * 50)
+    for nombre, valor in ajustes(globals()).items():
+        origen = f"  ← {OVERRIDES[nombre]}" if nombre in OVERRIDES else ""
+        print(f"   {nombre} = {valor!r}{origen}")
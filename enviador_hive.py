@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Envío asíncrono de batches a Hive
+Un hilo de fondo vacía una cola acotada de batches con reintentos y backoff,
+para que la decodificación y la inferencia no se detengan durante la carga
+"""
+import queue
+import threading
+import time
+
+# Marca de cierre para el hilo de envío
+_FIN = object()
+
+
+class EnviadorHive:
+    """Hilo de fondo que carga en Hive, en orden, los batches que se le encolan
+
+    La cola es acotada: si Hive va más lento que el video, enviar() bloquea
+    (backpressure) en lugar de acumular batches sin límite en memoria.
+    Todo el uso de la sesión del ETL ocurre en el hilo de envío; quien quiera
+    consultar Hive desde otro hilo debe llamar antes a vaciar().
+    """
+
+    def __init__(self, etl, tam_cola=4, reintentos=3, espera_inicial=1.0, espera_maxima=30.0):
+        self.etl = etl
+        self.reintentos = reintentos
+        self.espera_inicial = espera_inicial
+        self.espera_maxima = espera_maxima
+        self.cola = queue.Queue(maxsize=tam_cola)
+        self.error = None
+        self.batches_enviados = 0
+        self.batches_fallidos = 0
+        self.registros_enviados = 0
+        self._hilo = None
+
+    def iniciar(self):
+        """Arranca el hilo de envío si no está corriendo"""
+        if self._hilo is None or not self._hilo.is_alive():
+            self._hilo = threading.Thread(target=self._enviar_pendientes, name='enviador-hive', daemon=True)
+            self._hilo.start()
+        return self
+
+    def enviar(self, df, descripcion='batch', al_iniciar=None, al_terminar=None):
+        """Encola un batch; al_iniciar() corre justo antes de cargarlo y al_terminar(registros) después
+
+        El DataFrame debe ser propio (no vistas sobre un buffer que se reutiliza).
+        """
+        self._verificar_error()
+        self.iniciar()
+        self.cola.put((df, descripcion, al_iniciar, al_terminar))
+
+    def vaciar(self):
+        """Espera a que se carguen todos los batches encolados"""
+        self.cola.join()
+        self._verificar_error()
+
+    def cerrar(self):
+        """Vacía la cola y detiene el hilo de envío"""
+        if self._hilo is not None and self._hilo.is_alive():
+            self.cola.put(_FIN)
+            self._hilo.join()
+        self._hilo = None
+        self._verificar_error()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _verificar_error(self):
+        """Propaga en el hilo que llama un error inesperado del hilo de envío"""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def _enviar_pendientes(self):
+        """Bucle del hilo: un batch a la vez, en orden de llegada"""
+        while True:
+            item = self.cola.get()
+            try:
+                if item is _FIN:
+                    return
+                df, descripcion, al_iniciar, al_terminar = item
+                if self.error is not None:
+                    continue  # tras un error inesperado solo se drena la cola
+                if al_iniciar is not None:
+                    al_iniciar()
+                registros = self._cargar_con_reintentos(df, descripcion)
+                if al_terminar is not None:
+                    al_terminar(registros)
+            except BaseException as e:
+                # Se guarda para relanzarlo en el hilo del clasificador
+                self.error = e
+            finally:
+                self.cola.task_done()
+
+    def _cargar_con_reintentos(self, df, descripcion):
+        """Carga un batch reintentando con backoff exponencial; devuelve los registros cargados
+
+        Si una carga se corta a mitad (fallback fila por fila interrumpido),
+        los reintentos llevan solo las filas que faltan según
+        etl.posiciones_cargadas: ninguna fila se inserta dos veces.
+        """
+        if len(df) == 0:
+            return 0
+        pendiente = df
+        cargados = 0
+        espera = self.espera_inicial
+        for intento in range(self.reintentos + 1):
+            if self.etl.asegurar_sesion():
+                registros = self.etl.cargar_registros_a_hive(pendiente)
+                cargados += registros
+                if registros == len(pendiente):
+                    pendiente = pendiente.iloc[:0]
+                elif registros:
+                    ya_cargadas = set(self.etl.posiciones_cargadas)
+                    pendiente = pendiente.iloc[[i for i in range(len(pendiente)) if i not in ya_cargadas]]
+                    print(f"   ⚠️ {descripcion}: carga parcial, faltan {len(pendiente)} registros")
+            if len(pendiente) == 0:
+                self.batches_enviados += 1
+                self.registros_enviados += cargados
+                print(f"   ✅ {descripcion}: {cargados} registros enviados a Hive")
+                return cargados
+            if intento < self.reintentos:
+                print(f"   🔁 {descripcion}: reintento {intento + 1}/{self.reintentos} en {espera:.1f}s")
+                time.sleep(espera)
+                espera = min(espera * 2, self.espera_maxima)
+        self.batches_fallidos += 1
+        self.registros_enviados += cargados
+        print(f"   ❌ {descripcion}: no se pudo enviar a Hive tras {self.reintentos + 1} intentos "
+              f"({cargados}/{len(df)} registros cargados)")
+        return cargados
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Esquema de la tabla yolo_objects
+Orden y tipos de columnas compartidos por el clasificador y el ETL
+"""
+
+# (columna, tipo Hive) en el orden físico de la tabla
+COLUMNAS_YOLO_OBJECTS = [
+    ('source_type', 'STRING'),
+    ('source_id', 'STRING'),
+    ('frame_number', 'INT'),
+    ('class_id', 'INT'),
+    ('class_name', 'STRING'),
+    ('confidence', 'DOUBLE'),
+    ('x_min', 'INT'),
+    ('y_min', 'INT'),
+    ('x_max', 'INT'),
+    ('y_max', 'INT'),
+    ('width', 'INT'),
+    ('height', 'INT'),
+    ('area_pixels', 'INT'),
+    ('frame_width', 'INT'),
+    ('frame_height', 'INT'),
+    ('bbox_area_ratio', 'DOUBLE'),
+    ('center_x', 'DOUBLE'),
+    ('center_y', 'DOUBLE'),
+    ('center_x_norm', 'DOUBLE'),
+    ('center_y_norm', 'DOUBLE'),
+    ('position_region', 'STRING'),
+    ('dominant_color_name', 'STRING'),
+    ('dom_r', 'INT'),
+    ('dom_g', 'INT'),
+    ('dom_b', 'INT'),
+    ('timestamp_sec', 'DOUBLE'),
+    ('ingestion_date', 'STRING'),
+    ('detection_id', 'STRING'),
+]
+
+NOMBRES_COLUMNAS = [nombre for nombre, _ in COLUMNAS_YOLO_OBJECTS]
+
+# Particiones de la tabla columnar: poda por día de ingesta y por tipo de origen.
+# ingestion_day se deriva de ingestion_date; source_type deja de ser columna física
+COLUMNAS_PARTICION = [
+    ('ingestion_day', 'STRING'),
+    ('source_type', 'STRING'),
+]
+
+# Tipos Arrow equivalentes a los tipos Hive del esquema
+_TIPOS_ARROW = {'INT': 'int32', 'DOUBLE': 'float64', 'STRING': 'string'}
+
+
+def columnas_datos(particionada):
+    """Columnas físicas de los archivos (sin las de partición si aplica)"""
+    if not particionada:
+        return COLUMNAS_YOLO_OBJECTS
+    nombres_particion = {nombre for nombre, _ in COLUMNAS_PARTICION}
+    return [(nombre, tipo) for nombre, tipo in COLUMNAS_YOLO_OBJECTS
+            if nombre not in nombres_particion]
+
+
+def esquema_arrow(columnas):
+    """Esquema pyarrow con los tipos que Hive espera en Parquet"""
+    import pyarrow as pa
+    return pa.schema([(nombre, pa.type_for_alias(_TIPOS_ARROW[tipo])) for nombre, tipo in columnas])
+
+
+def definicion_columnas_hive(columnas=COLUMNAS_YOLO_OBJECTS):
+    """Lista 'nombre TIPO' separada por comas para un CREATE TABLE"""
+    return ',\n'.join(f"    {nombre} {tipo}" for nombre, tipo in columnas)
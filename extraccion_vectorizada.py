@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Extracción vectorizada de atributos
+Calcula los atributos de todas las detecciones de un frame con operaciones
+de NumPy sobre el tensor de boxes completo, en formato columnar
+"""
+import hashlib
+from datetime import datetime
+
+import numpy as np
+
+from esquema_detecciones import NOMBRES_COLUMNAS
+from color_dominante import colores_dominantes
+from paleta_colores import nombres_colores
+
+# Región 3x3: índice fila * 3 + columna → 'top_left', ..., 'bottom_right'
+REGIONES = np.array([
+    f"{fila}_{columna}"
+    for fila in ('top', 'middle', 'bottom')
+    for columna in ('left', 'center', 'right')
+], dtype=object)
+LIMITES_REGION = [0.33, 0.66]
+
+
+def arrays_desde_boxes(boxes):
+    """(xyxy, conf, cls) como arrays de NumPy a partir de un objeto Boxes de YOLO"""
+    if boxes is None or len(boxes) == 0:
+        return np.empty((0, 4)), np.empty(0), np.empty(0, dtype=np.int64)
+    return (
+        boxes.xyxy.cpu().numpy().astype(np.float64),
+        boxes.conf.cpu().numpy().astype(np.float64),
+        boxes.cls.cpu().numpy().astype(np.int64),
+    )
+
+
+def colores_bgr(frame, x1, y1, x2, y2, modo='mean', max_pixeles=1024):
+    """Color BGR dominante (truncado a int) de cada ROI; gris 128 si la ROI está vacía"""
+    colores, validas = colores_dominantes(frame, x1, y1, x2, y2, modo, max_pixeles=max_pixeles)
+    bgr = np.full((len(x1), 3), 128, dtype=np.int64)
+    bgr[validas] = colores[validas].astype(np.int64)
+    return bgr
+
+
+def ids_deteccion(source_id, frame_number, n):
+    """n identificadores deterministas (16 hex) para las detecciones de un frame
+
+    Dependen solo del origen, el frame y la posición de la box: reprocesar el
+    mismo frame genera los mismos ids, lo que permite detectar re-envíos.
+    """
+    prefijo = f"{source_id}|{frame_number}|"
+    return np.array([
+        hashlib.blake2b(f"{prefijo}{i}".encode('utf-8'), digest_size=8).hexdigest()
+        for i in range(n)
+    ], dtype=object)
+
+
+def lote_vacio():
+    """Lote columnar sin filas"""
+    return {columna: np.empty(0, dtype=object) for columna in NOMBRES_COLUMNAS}
+
+
+def extraer_atributos_lote(xyxy, conf, cls, frame, nombres_clases, source_id, source_type,
+                           frame_number=0, timestamp_sec=0.0, modo_color='mean', max_pixeles_color=1024,
+                           forma_original=None):
+    """Atributos de todas las detecciones de un frame como dict columna → array
+
+    Reproduce SistemaClasificacionBatches._extraer_atributos fila a fila
+    (mismos redondeos y truncamientos), pero con operaciones sobre arrays.
+    forma_original (alto, ancho): el frame llegó reducido (GStreamer) y xyxy
+    está en coordenadas originales; el color se muestrea en el reducido.
+    """
+    n = len(conf)
+    if n == 0:
+        return lote_vacio()
+
+    frame_height, frame_width = (forma_original or frame.shape)[:2]
+    x1, y1, x2, y2 = (xyxy[:, i] for i in range(4))
+
+    # int() de Python trunca hacia cero
+    x_min, y_min = np.trunc(x1).astype(np.int64), np.trunc(y1).astype(np.int64)
+    x_max, y_max = np.trunc(x2).astype(np.int64), np.trunc(y2).astype(np.int64)
+    width = np.trunc(x2 - x1).astype(np.int64)
+    height = np.trunc(y2 - y1).astype(np.int64)
+    area_pixels = width * height
+
+    center_x = (x1 + x2) / 2
+    center_y = (y1 + y2) / 2
+    center_x_norm = center_x / frame_width
+    center_y_norm = center_y / frame_height
+
+    region = (np.digitize(center_y_norm, LIMITES_REGION) * 3
+              + np.digitize(center_x_norm, LIMITES_REGION))
+
+    if frame.shape[:2] == (frame_height, frame_width):
+        bgr = colores_bgr(frame, x_min, y_min, x_max, y_max, modo_color, max_pixeles_color)
+    else:
+        escala_x = frame.shape[1] / frame_width
+        escala_y = frame.shape[0] / frame_height
+        bgr = colores_bgr(frame,
+                          np.trunc(x1 * escala_x).astype(np.int64), np.trunc(y1 * escala_y).astype(np.int64),
+                          np.trunc(x2 * escala_x).astype(np.int64), np.trunc(y2 * escala_y).astype(np.int64),
+                          modo_color, max_pixeles_color)
+    rgb = bgr[:, ::-1]
+
+    return {
+        'source_type': np.full(n, source_type, dtype=object),
+        'source_id': np.full(n, source_id, dtype=object),
+        'frame_number': np.full(n, frame_number, dtype=np.int64),
+        'class_id': cls,
+        'class_name': np.array([nombres_clases[c] for c in cls], dtype=object),
+        'confidence': np.round(conf, 4),
+        'x_min': x_min,
+        'y_min': y_min,
+        'x_max': x_max,
+        'y_max': y_max,
+        'width': width,
+        'height': height,
+        'area_pixels': area_pixels,
+        'frame_width': np.full(n, frame_width, dtype=np.int64),
+        'frame_height': np.full(n, frame_height, dtype=np.int64),
+        'bbox_area_ratio': np.round(area_pixels / (frame_width * frame_height), 6),
+        'center_x': np.round(center_x, 2),
+        'center_y': np.round(center_y, 2),
+        'center_x_norm': np.round(center_x_norm, 4),
+        'center_y_norm': np.round(center_y_norm, 4),
+        'position_region': REGIONES[region],
+        'dominant_color_name': nombres_colores(rgb),
+        'dom_r': rgb[:, 0].copy(),
+        'dom_g': rgb[:, 1].copy(),
+        'dom_b': rgb[:, 2].copy(),
+        'timestamp_sec': np.full(n, round(timestamp_sec, 2)),
+        'ingestion_date': np.full(n, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), dtype=object),
+        'detection_id': ids_deteccion(source_id, frame_number, n),
+    }
+
+
+def filas_lote(lote):
+    """Número de detecciones de un lote columnar"""
+    return len(lote['class_id'])
+
+
+def concatenar_lotes(lotes):
+    """Une varios lotes columnares en uno solo"""
+    lotes = [lote for lote in lotes if filas_lote(lote) > 0]
+    if not lotes:
+        return lote_vacio()
+    return {columna: np.concatenate([lote[columna] for lote in lotes]) for columna in NOMBRES_COLUMNAS}
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Imagen integral (summed-area table) por canal
+Permite obtener el color promedio de cualquier bounding box en O(1),
+sin volver a recorrer los píxeles de cajas grandes o superpuestas
+"""
+import cv2
+import numpy as np
+
+
+class ImagenIntegral:
+    """Tabla de sumas acumuladas de un frame BGR, construida una vez por frame"""
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.alto, self.ancho = frame.shape[:2]
+        # (alto + 1, ancho + 1, canales); float64 suma enteros exactos hasta 2^53
+        self.tabla = cv2.integral(frame, sdepth=cv2.CV_64F)
+        if self.tabla.ndim == 2:
+            self.tabla = self.tabla[:, :, None]
+
+    def _recortar(self, x1, y1, x2, y2):
+        """Límites enteros acotados al frame, con la semántica de frame[y1:y2, x1:x2]"""
+        x1 = np.clip(x1, 0, self.ancho)
+        x2 = np.clip(x2, 0, self.ancho)
+        y1 = np.clip(y1, 0, self.alto)
+        y2 = np.clip(y2, 0, self.alto)
+        return x1, y1, np.maximum(x2, x1), np.maximum(y2, y1)
+
+    def promedios(self, x1, y1, x2, y2):
+        """Color promedio (N, canales) de N cajas y máscara de cajas no vacías"""
+        x1, y1, x2, y2 = self._recortar(*(np.asarray(v, dtype=np.int64) for v in (x1, y1, x2, y2)))
+        t = self.tabla
+        sumas = t[y2, x2] - t[y1, x2] - t[y2, x1] + t[y1, x1]
+        pixeles = ((x2 - x1) * (y2 - y1)).astype(np.float64)
+        validas = pixeles > 0
+        promedios = np.zeros_like(sumas)
+        promedios[validas] = sumas[validas] / pixeles[validas, None]
+        return promedios, validas
+
+    def promedio(self, x1, y1, x2, y2):
+        """Color promedio de una caja, o None si la caja no tiene píxeles"""
+        promedios, validas = self.promedios([x1], [y1], [x2], [y2])
+        return promedios[0] if validas[0] else None
+
+
+def integral_de(frame, previa=None):
+    """Reutiliza la integral previa si corresponde al mismo frame; si no, la construye"""
+    if previa is not None and previa.frame is frame:
+        return previa
+    return ImagenIntegral(frame)
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Opciones de inferencia YOLO compartidas por los clasificadores
+Confianza, NMS, clases y máximo de detecciones se aplican dentro de la
+llamada al modelo: lo descartado nunca llega a la extracción, al CSV ni a Hive
+"""
+import configuracion
+
+
+def indices_clases(nombres_modelo, clases):
+    """Ids del modelo para una lista de nombres 'person,car' (vacía = todas → None)"""
+    pedidas = [nombre.strip() for nombre in clases.split(',') if nombre.strip()]
+    if not pedidas:
+        return None
+    por_nombre = {nombre: indice for indice, nombre in nombres_modelo.items()}
+    desconocidas = [nombre for nombre in pedidas if nombre not in por_nombre]
+    if desconocidas:
+        raise ValueError(f"Clases desconocidas para el modelo: {', '.join(desconocidas)}")
+    return sorted(por_nombre[nombre] for nombre in pedidas)
+
+
+def opciones_inferencia(nombres_modelo):
+    """kwargs de model(...) según la configuración del nodo"""
+    return {
+        'conf': configuracion.CONFIDENCE_THRESHOLD,
+        'iou': configuracion.YOLO_IOU_NMS,
+        'max_det': configuracion.YOLO_MAX_DETECCIONES,
+        'classes': indices_clases(nombres_modelo, configuracion.YOLO_CLASES),
+        'imgsz': configuracion.YOLO_IMAGEN_TAMANO,
+    }
@@ -4,11 +4,17 @@ MAIN PRINCIPAL - Sistema YOLO + Hive con Batches de 10 segundos
 """
 import os
 import time
+import argparse
 from sistema_clasificacion_con_batches import SistemaClasificacionBatches
 from sistema_batch_etl import SistemaBatchETL
 
 def main():
     """Pipeline principal con batches automáticos cada 10 segundos"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--force', action='store_true',
+                        help='reprocesar también los videos ya registrados en el manifiesto')
+    args = parser.parse_args()
+    
     print("🎬 SISTEMA YOLO + HIVE CON BATCHES DE 10 SEGUNDOS")
     print("=" * 60)
     
@@ -22,15 +28,15 @@ def main():
     # Inicializar sistema con batches
     sistema = SistemaClasificacionBatches()
     
-    # Procesar videos (automáticamente envía batches cada 10s)
-    videos_procesados = sistema.procesar_videos('videos_entrada')
+    # Procesar videos nuevos o modificados (automáticamente envía batches cada 10s)
+    videos_procesados = sistema.procesar_videos('videos_entrada', forzar=args.force)
     
     if videos_procesados > 0:
         print(f"\n🎉 ¡PIPELINE COMPLETADO!")
         print(f"📊 {videos_procesados} videos procesados")
         print("📤 Batches enviados automáticamente cada 10 segundos")
     else:
-        print("❌ No se encontraron videos para procesar")
+        print("❌ No se encontraron videos nuevos para procesar")
 
 if __name__ == "__main__":
     main()
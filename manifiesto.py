@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Manifiesto de archivos ya procesados
+Registra por archivo de entrada tamaño, mtime, hash de contenido, versión del
+modelo y filas generadas, para que una nueva corrida solo procese lo nuevo
+o modificado
+"""
+import os
+import json
+import hashlib
+from datetime import datetime
+
+import configuracion
+
+_BLOQUE_HASH = 1024 * 1024
+
+
+def hash_archivo(ruta):
+    """SHA-256 del contenido, leído por bloques"""
+    sha = hashlib.sha256()
+    with open(ruta, 'rb') as f:
+        for bloque in iter(lambda: f.read(_BLOQUE_HASH), b''):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+
+def version_modelo(ruta_pesos):
+    """Nombre de los pesos y, si el archivo existe, un prefijo de su hash"""
+    nombre = os.path.basename(ruta_pesos)
+    if os.path.exists(ruta_pesos):
+        return f"{nombre}:{hash_archivo(ruta_pesos)[:12]}"
+    return nombre
+
+
+class ManifiestoProcesados:
+    """Manifiesto JSON {ruta: metadatos} de entradas ya cargadas"""
+
+    def __init__(self, ruta, version_modelo):
+        self.ruta = ruta
+        self.version_modelo = version_modelo
+        self.entradas = {}
+        if os.path.exists(ruta):
+            with open(ruta, encoding='utf-8') as f:
+                self.entradas = json.load(f)
+
+    @staticmethod
+    def _clave(ruta_entrada):
+        return os.path.normpath(ruta_entrada)
+
+    def pendiente(self, ruta_entrada):
+        """True si el archivo es nuevo, cambió o se procesó con otro modelo"""
+        entrada = self.entradas.get(self._clave(ruta_entrada))
+        if entrada is None or entrada['version_modelo'] != self.version_modelo:
+            return True
+
+        stat = os.stat(ruta_entrada)
+        if stat.st_size != entrada['tamano']:
+            return True
+        if stat.st_mtime == entrada['mtime']:
+            return False
+        # Mismo tamaño pero otro mtime (copia, touch): decide el contenido
+        if hash_archivo(ruta_entrada) != entrada['sha256']:
+            return True
+        entrada['mtime'] = stat.st_mtime
+        self.guardar()
+        return False
+
+    def filtrar(self, rutas, forzar=False):
+        """Rutas que hay que procesar (todas con forzar=True)"""
+        if forzar:
+            return list(rutas)
+        return [ruta for ruta in rutas if self.pendiente(ruta)]
+
+    def registrar(self, ruta_entrada, filas):
+        """Marca el archivo como procesado y persiste el manifiesto"""
+        stat = os.stat(ruta_entrada)
+        self.entradas[self._clave(ruta_entrada)] = {
+            'tamano': stat.st_size,
+            'mtime': stat.st_mtime,
+            'sha256': hash_archivo(ruta_entrada),
+            'version_modelo': self.version_modelo,
+            'filas': int(filas),
+            'procesado': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        self.guardar()
+
+    def guardar(self):
+        """Escritura atómica: un corte a mitad no deja el manifiesto corrupto"""
+        directorio = os.path.dirname(self.ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        temporal = f"{self.ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(self.entradas, f, indent=2, sort_keys=True)
+        os.replace(temporal, self.ruta)
+
+
+def crear_manifiesto():
+    """Manifiesto configurado en configuracion.py para el modelo actual"""
+    return ManifiestoProcesados(
+        configuracion.MANIFIESTO_PROCESADOS, version_modelo(configuracion.YOLO_MODEL)
+    )
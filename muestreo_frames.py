@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Motor de muestreo de frames para videos
+Evita decodificar completamente los frames que no se van a procesar
+"""
+import math
+
+import cv2
+
+# read: decodifica todos los frames (comportamiento original)
+# grab: cap.grab() en los frames descartados, retrieve solo en los muestreados
+# seek: salta directamente al instante de cada muestra con CAP_PROP_POS_MSEC
+# auto: seek en videos largos con saltos mayores que un GOP, grab en el resto
+MODOS_MUESTREO = ('read', 'grab', 'seek', 'auto')
+
+
+class MuestreadorFrames:
+    """Itera (frame, frame_number, timestamp_sec) de un VideoCapture a una tasa temporal"""
+
+    def __init__(self, cap, muestras_por_segundo=1.0, modo='auto',
+                 seek_min_segundos=300, seek_salto_min_segundos=2.0, desde_segundos=0.0, pool=None):
+        if modo not in MODOS_MUESTREO:
+            raise ValueError(f"Modo de muestreo desconocido: {modo}")
+
+        self.cap = cap
+        # PoolFrames opcional: los frames se decodifican en buffers reutilizados
+        self.pool = pool
+        self.fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        total_frames = cap.get(cv2.CAP_PROP_FRAME_COUNT)
+        self.duracion_sec = total_frames / self.fps if total_frames > 0 else 0.0
+
+        # Paso en frames derivado de la tasa real del video (no un 30 fijo)
+        self.paso_frames = max(1, round(self.fps / muestras_por_segundo))
+        # Reanudación: primera muestra de la grilla en o después de desde_segundos
+        self.primera_muestra = math.ceil(desde_segundos * self.fps / self.paso_frames - 1e-9)
+        self.primera_muestra = max(0, self.primera_muestra)
+
+        if modo == 'auto':
+            # Buscar solo compensa si el salto supera el intervalo entre keyframes;
+            # si no, el decodificador vuelve a decodificar el mismo GOP en cada seek
+            salto_sec = self.paso_frames / self.fps
+            es_largo = self.duracion_sec >= seek_min_segundos
+            modo = 'seek' if es_largo and salto_sec >= seek_salto_min_segundos else 'grab'
+        self.modo = modo
+
+    def __iter__(self):
+        if self.modo == 'read':
+            return self._iterar_read()
+        if self.modo == 'grab':
+            return self._iterar_grab()
+        return self._iterar_seek()
+
+    def _leer(self):
+        """cap.read(), dentro de un buffer del pool si hay uno"""
+        if self.pool is not None:
+            return self.pool.leer(self.cap)
+        return self.cap.read()
+
+    def _posicionar(self):
+        """Ubica el decodificador en la primera muestra; devuelve su número de frame"""
+        inicio = self.primera_muestra * self.paso_frames
+        if inicio == 0:
+            return 0
+        if self.cap.set(cv2.CAP_PROP_POS_FRAMES, inicio):
+            return inicio
+        # Sin soporte de seek: descartar con grab hasta el inicio
+        for frame_count in range(inicio):
+            if not self.cap.grab():
+                return frame_count
+        return inicio
+
+    def _iterar_read(self):
+        """Decodifica y convierte todos los frames, conserva uno de cada paso"""
+        frame_count = self._posicionar()
+        while True:
+            ret, frame = self._leer()
+            if not ret:
+                break
+            if frame_count % self.paso_frames == 0:
+                yield frame, frame_count, frame_count / self.fps
+            elif self.pool is not None:
+                # Frame no muestreado: su buffer vuelve al pool para la próxima lectura
+                self.pool.liberar(frame)
+            frame_count += 1
+
+    def _iterar_grab(self, frame_count=None):
+        """Avanza con grab() y solo hace retrieve() en los frames muestreados"""
+        if frame_count is None:
+            frame_count = self._posicionar()
+        while True:
+            if frame_count % self.paso_frames == 0:
+                ret, frame = self._leer()
+                if not ret:
+                    break
+                yield frame, frame_count, frame_count / self.fps
+            elif not self.cap.grab():
+                break
+            frame_count += 1
+
+    def _iterar_seek(self):
+        """Posiciona el decodificador en cada muestra por tiempo (ms)"""
+        muestra = self.primera_muestra
+        while True:
+            objetivo_frame = muestra * self.paso_frames
+            timestamp_sec = objetivo_frame / self.fps
+
+            if not self.cap.set(cv2.CAP_PROP_POS_MSEC, timestamp_sec * 1000.0):
+                # El backend no soporta seek: continuar avanzando con grab
+                yield from self._continuar_con_grab(objetivo_frame)
+                return
+
+            ret, frame = self._leer()
+            if not ret:
+                break
+
+            # Tras el read, POS_FRAMES apunta al siguiente frame del decodificado
+            frame_number = int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)) - 1
+            if frame_number < 0:
+                frame_number = objetivo_frame
+            yield frame, frame_number, frame_number / self.fps
+            muestra += 1
+
+    def _continuar_con_grab(self, desde_frame):
+        """Fallback de seek: descarta con grab hasta llegar a desde_frame y sigue en modo grab"""
+        actual = max(0, int(self.cap.get(cv2.CAP_PROP_POS_FRAMES)))
+        for _ in range(desde_frame - actual):
+            if not self.cap.grab():
+                return
+        yield from self._iterar_grab(desde_frame)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Paleta de colores compartida por los clasificadores
+Nombra colores RGB con una tabla de búsqueda cuantizada (32x32x32) construida
+una sola vez al importar el módulo
+"""
+import numpy as np
+
+# Paleta de referencia (el orden define el desempate: gana el primero)
+PALETA = {
+    'red': (255, 0, 0), 'green': (0, 255, 0), 'blue': (0, 0, 255),
+    'yellow': (255, 255, 0), 'cyan': (0, 255, 255), 'magenta': (255, 0, 255),
+    'white': (255, 255, 255), 'black': (0, 0, 0), 'gray': (128, 128, 128),
+    'orange': (255, 165, 0), 'purple': (128, 0, 128), 'brown': (165, 42, 42)
+}
+NOMBRES_PALETA = np.array(list(PALETA), dtype=object)
+RGB_PALETA = np.array(list(PALETA.values()), dtype=np.int64)
+
+# Cuantización: 8 valores por nivel en cada canal
+NIVELES = 32
+_DESPLAZAMIENTO = 3  # log2(256 / NIVELES)
+
+
+def indices_exactos(rgb):
+    """Índice del color de paleta más cercano (distancia euclidiana) para (N, 3) RGB"""
+    rgb = np.asarray(rgb, dtype=np.float64).reshape(-1, 3)
+    distancias = ((rgb[:, None, :] - RGB_PALETA[None, :, :]) ** 2).sum(axis=2)
+    return np.argmin(distancias, axis=1)
+
+
+def _construir_tabla():
+    """Índice de paleta para el centro de cada celda RGB cuantizada"""
+    centros = (np.arange(NIVELES) << _DESPLAZAMIENTO) + (1 << _DESPLAZAMIENTO) / 2
+    r, g, b = np.meshgrid(centros, centros, centros, indexing='ij')
+    indices = indices_exactos(np.stack([r, g, b], axis=-1))
+    return indices.astype(np.uint8).reshape(NIVELES, NIVELES, NIVELES)
+
+
+TABLA_COLORES = _construir_tabla()
+# Versión plana en listas de Python para el camino escalar
+_NOMBRES_TABLA = NOMBRES_PALETA[TABLA_COLORES.ravel()].tolist()
+
+
+def indices_colores(rgb):
+    """Índice de paleta para un array (N, 3) de RGB en 0-255, vía la tabla cuantizada"""
+    q = np.clip(np.asarray(rgb), 0, 255).astype(np.int64).reshape(-1, 3) >> _DESPLAZAMIENTO
+    return TABLA_COLORES[q[:, 0], q[:, 1], q[:, 2]]
+
+
+def nombres_colores(rgb):
+    """Nombre de color para un array (N, 3) de RGB"""
+    return NOMBRES_PALETA[indices_colores(rgb)]
+
+
+def nombre_color(r, g, b):
+    """Nombre de color para un único RGB (sin pasar por NumPy)"""
+    r = min(max(int(r), 0), 255) >> _DESPLAZAMIENTO
+    g = min(max(int(g), 0), 255) >> _DESPLAZAMIENTO
+    b = min(max(int(b), 0), 255) >> _DESPLAZAMIENTO
+    return _NOMBRES_TABLA[(r * NIVELES + g) * NIVELES + b]
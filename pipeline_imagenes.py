@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pipeline de imágenes
+Decodificación y reducción en un pool de hilos (cv2 libera el GIL) →
+inferencia YOLO por batches → resultados por archivo con las boxes en la
+resolución original
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+
+
+def tamano_reducido(alto, ancho, lado_maximo=None):
+    """(alto, ancho, escala) con el lado mayor acotado a lado_maximo, como el letterbox de YOLO"""
+    if not lado_maximo or max(alto, ancho) <= lado_maximo:
+        return alto, ancho, 1.0
+    escala = min(lado_maximo / alto, lado_maximo / ancho)
+    return int(round(alto * escala)), int(round(ancho * escala)), escala
+
+
+def decodificar_imagen(ruta, lado_maximo=None):
+    """(original, reducida, escala); la reducida tiene como máximo lado_maximo px
+
+    Usa el mismo tamaño e interpolación que el letterbox de YOLO, así el
+    modelo ya no redimensiona y las detecciones no cambian.
+    """
+    original = cv2.imread(ruta)
+    if original is None:
+        return None, None, 1.0
+    alto, ancho, escala = tamano_reducido(*original.shape[:2], lado_maximo)
+    if escala == 1.0:
+        return original, original, 1.0
+    return original, cv2.resize(original, (ancho, alto), interpolation=cv2.INTER_LINEAR), escala
+
+
+def boxes_a_original(boxes, escala, forma_original):
+    """Boxes de YOLO de la imagen reducida llevadas a coordenadas de la original"""
+    if boxes is None or escala == 1.0:
+        return boxes
+    from ultralytics.engine.results import Boxes
+
+    datos = boxes.data.clone() if hasattr(boxes.data, 'clone') else boxes.data.copy()
+    datos[:, :4] /= escala
+    return Boxes(datos, forma_original[:2])
+
+
+class PipelineImagenes:
+    """Decodifica imágenes en paralelo y las infiere en batches, en orden de entrada"""
+
+    def __init__(self, inferir, tamano_batch=8, hilos=4, lado_maximo=640):
+        self.inferir = inferir
+        self.tamano_batch = tamano_batch
+        self.hilos = hilos
+        self.lado_maximo = lado_maximo
+
+    def decodificadas(self, rutas):
+        """Itera (ruta, original, reducida, escala) en orden, con lectura anticipada acotada"""
+        # Acotada: no se decodifica todo el directorio por adelantado
+        anticipadas = max(self.hilos, self.tamano_batch) * 2
+        with ThreadPoolExecutor(max_workers=self.hilos, thread_name_prefix='decodificar') as pool:
+            pendientes = deque()
+            rutas = iter(rutas)
+            for ruta in rutas:
+                pendientes.append((ruta, pool.submit(decodificar_imagen, ruta, self.lado_maximo)))
+                if len(pendientes) >= anticipadas:
+                    break
+            while pendientes:
+                ruta, futuro = pendientes.popleft()
+                siguiente = next(rutas, None)
+                if siguiente is not None:
+                    pendientes.append((siguiente, pool.submit(decodificar_imagen, siguiente, self.lado_maximo)))
+                yield (ruta, *futuro.result())
+
+    def ejecutar(self, rutas, consumir):
+        """Llama consumir(ruta, original, boxes) por imagen, en el orden de rutas
+
+        Los batches agrupan imágenes de igual tamaño reducido: con formas
+        mezcladas YOLO rellena todo el batch a un cuadrado imgsz x imgsz y
+        pierde la inferencia rectangular. Una imagen ilegible llega con
+        original=None y boxes=None.
+        """
+        orden = deque()  # imágenes en orden de entrada, hasta entregarlas
+        por_forma = {}  # forma reducida → imágenes esperando inferencia
+        max_en_espera = self.tamano_batch * 4
+        for ruta, original, reducida, escala in self.decodificadas(rutas):
+            imagen = {'ruta': ruta, 'original': original, 'reducida': reducida,
+                      'escala': escala, 'boxes': None, 'lista': original is None}
+            orden.append(imagen)
+            if original is not None:
+                lote = por_forma.setdefault(reducida.shape, [])
+                lote.append(imagen)
+                if len(lote) == self.tamano_batch:
+                    self._inferir_lote(por_forma.pop(reducida.shape))
+            # Acotar la memoria: no dejar esperando a la primera por un batch incompleto
+            while len(orden) > max_en_espera and not orden[0]['lista']:
+                self._inferir_lote(por_forma.pop(orden[0]['reducida'].shape))
+            self._entregar(orden, consumir)
+
+        for lote in por_forma.values():
+            self._inferir_lote(lote)
+        self._entregar(orden, consumir)
+
+    def _inferir_lote(self, lote):
+        results = self.inferir([imagen['reducida'] for imagen in lote])
+        for imagen, result in zip(lote, results):
+            original = imagen['original']
+            imagen['boxes'] = boxes_a_original(result.boxes, imagen['escala'], original.shape)
+            imagen['reducida'] = None
+            imagen['lista'] = True
+
+    def _entregar(self, orden, consumir):
+        """Entrega en orden las imágenes ya inferidas del frente de la cola"""
+        while orden and orden[0]['lista']:
+            imagen = orden.popleft()
+            consumir(imagen['ruta'], imagen['original'], imagen['boxes'])
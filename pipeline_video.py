@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Pipeline productor/consumidor para videos
+Decodificación (hilo) → cola acotada → inferencia (hilo) → cola acotada → extracción/envío
+"""
+import queue
+import threading
+
+import cv2
+
+from muestreo_frames import MuestreadorFrames
+from pipeline_imagenes import boxes_a_original
+from video_gstreamer import MuestreadorGStreamer, gstreamer_disponible
+
+# Marca de fin de stream entre etapas
+_FIN = object()
+
+# Tiempo máximo de espera en colas antes de revisar si hay que detenerse
+_ESPERA_COLA = 0.1
+
+
+def _poner(cola, item, detener):
+    """Encola respetando la capacidad (backpressure); False si se pidió detener"""
+    while not detener.is_set():
+        try:
+            cola.put(item, timeout=_ESPERA_COLA)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _obtener(cola, detener):
+    """Desencola esperando datos; devuelve _FIN si se pidió detener"""
+    while not detener.is_set():
+        try:
+            return cola.get(timeout=_ESPERA_COLA)
+        except queue.Empty:
+            continue
+    return _FIN
+
+
+class LectorFramesVideo:
+    """Decodifica un video en un hilo de fondo y publica los frames muestreados en una cola acotada"""
+
+    def __init__(self, video_path, tam_cola=16, muestras_por_segundo=1.0, modo_muestreo='auto',
+                 seek_min_segundos=300, seek_salto_min_segundos=2.0, desde_segundos=0.0, pool=None,
+                 gstreamer=False, lado_maximo=None, decodificador_gstreamer='decodebin'):
+        self.video_path = video_path
+        self.pool = pool
+        # GStreamer decodifica, muestrea y reduce a lado_maximo dentro del pipeline
+        self.gstreamer = gstreamer
+        self.lado_maximo = lado_maximo
+        self.decodificador_gstreamer = decodificador_gstreamer
+        # (alto, ancho) del video si los frames llegan reducidos; None si no
+        self.forma_original = None
+        self.escala = 1.0
+        self.desde_segundos = desde_segundos
+        self.muestras_por_segundo = muestras_por_segundo
+        self.modo_muestreo = modo_muestreo
+        self.seek_min_segundos = seek_min_segundos
+        self.seek_salto_min_segundos = seek_salto_min_segundos
+        self.cola = queue.Queue(maxsize=tam_cola)
+        self.fps = 30
+        self.error = None
+        self._detener = threading.Event()
+        self._hilo = None
+        self._cap = None
+        self._muestreador = None
+
+    def iniciar(self):
+        """Abre el video y arranca el hilo de decodificación"""
+        self._abrir_gstreamer()
+        if self._muestreador is None:
+            self._cap = cv2.VideoCapture(self.video_path)
+            self._muestreador = MuestreadorFrames(
+                self._cap, self.muestras_por_segundo, self.modo_muestreo,
+                self.seek_min_segundos, self.seek_salto_min_segundos, self.desde_segundos, self.pool
+            )
+        self.fps = self._muestreador.fps
+        self._hilo = threading.Thread(
+            target=self._leer, name=f"lector-{self.video_path}", daemon=True
+        )
+        self._hilo.start()
+        return self
+
+    def _abrir_gstreamer(self):
+        """Usa GStreamer si se pidió y está disponible; si no, queda el camino de OpenCV/FFmpeg
+
+        Al reanudar (desde_segundos) se usa siempre FFmpeg, que sabe hacer seek.
+        """
+        if not self.gstreamer or self.desde_segundos or not gstreamer_disponible():
+            return
+        muestreador = MuestreadorGStreamer(
+            self.video_path, self.muestras_por_segundo, self.lado_maximo,
+            self.decodificador_gstreamer, self.pool
+        )
+        if not muestreador.isOpened():
+            muestreador.release()
+            print(f"⚠️  GStreamer no pudo abrir {self.video_path}; se decodifica con FFmpeg")
+            return
+        self._cap = muestreador.cap
+        self._muestreador = muestreador
+        if muestreador.escala != 1.0:
+            self.forma_original = muestreador.forma_original
+            self.escala = muestreador.escala
+
+    def _leer(self):
+        """Bucle del hilo productor: (frame, frame_number, timestamp_sec)"""
+        try:
+            if self._cap.isOpened():
+                for item in self._muestreador:
+                    if not _poner(self.cola, item, self._detener):
+                        break
+        except Exception as e:
+            self.error = e
+        finally:
+            self._cap.release()
+            _poner(self.cola, _FIN, self._detener)
+
+    def detener(self):
+        """Detiene el hilo lector y espera a que termine"""
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+
+class PipelineVideo:
+    """Solapa decodificación, inferencia y consumo de resultados de un video"""
+
+    def __init__(self, inferir, tamano_batch=8, tam_cola=16, pool=None, **opciones_muestreo):
+        # inferir(lista_frames) -> lista de resultados en el mismo orden
+        self.inferir = inferir
+        self.tamano_batch = max(1, tamano_batch)
+        self.tam_cola = tam_cola
+        # PoolFrames opcional: cada frame vuelve al pool cuando consumir termina con él
+        self.pool = pool
+        # muestras_por_segundo, modo_muestreo, seek_* (ver LectorFramesVideo)
+        self.opciones_muestreo = opciones_muestreo
+
+    def ejecutar(self, video_path, consumir, desde_segundos=0.0):
+        """Procesa el video llamando consumir(frame, frame_number, timestamp_sec, result)
+
+        consumir se ejecuta en el hilo que llama, de modo que la extracción de
+        atributos y el envío a Hive se solapan con la decodificación y la
+        inferencia de los frames siguientes. Los errores de cualquier etapa se
+        propagan al terminar. desde_segundos reanuda el video a mitad (checkpoint).
+        Con pool, consumir no debe guardar el frame: su buffer se reutiliza al volver.
+        Si el lector entrega frames reducidos (GStreamer), result.boxes llega en
+        coordenadas del video original, con su orig_shape.
+        """
+        lector = LectorFramesVideo(
+            video_path, self.tam_cola, desde_segundos=desde_segundos, pool=self.pool,
+            **self.opciones_muestreo
+        ).iniciar()
+        resultados = queue.Queue(maxsize=self.tam_cola)
+        detener = threading.Event()
+        errores = []
+
+        hilo_inferencia = threading.Thread(
+            target=self._inferir_lotes,
+            args=(lector.cola, resultados, detener, errores),
+            name=f"inferencia-{video_path}",
+            daemon=True,
+        )
+        hilo_inferencia.start()
+
+        try:
+            while True:
+                item = _obtener(resultados, detener)
+                if item is _FIN:
+                    break
+                if lector.forma_original is not None:
+                    item[3].boxes = boxes_a_original(item[3].boxes, lector.escala, lector.forma_original)
+                consumir(*item)
+                if self.pool is not None:
+                    self.pool.liberar(item[0])
+        finally:
+            detener.set()
+            lector.detener()
+            hilo_inferencia.join()
+
+        if errores:
+            raise errores[0]
+        if lector.error is not None:
+            raise lector.error
+
+        return lector.fps
+
+    def _inferir_lotes(self, entrada, salida, detener, errores):
+        """Bucle del hilo de inferencia: agrupa frames y publica resultados en orden"""
+        try:
+            fin = False
+            while not fin:
+                lote = []
+                while len(lote) < self.tamano_batch:
+                    item = _obtener(entrada, detener)
+                    if item is _FIN:
+                        fin = True
+                        break
+                    lote.append(item)
+
+                if not lote:
+                    break
+
+                results = self.inferir([frame for frame, _, _ in lote])
+                for (frame, frame_number, timestamp_sec), result in zip(lote, results):
+                    if not _poner(salida, (frame, frame_number, timestamp_sec, result), detener):
+                        return
+        except Exception as e:
+            errores.append(e)
+        finally:
+            _poner(salida, _FIN, detener)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Pool de buffers de frames
+cap.read(image=buf) decodifica dentro de un array ya asignado: los frames se
+reutilizan en lugar de pedir ~2.7 MB nuevos (1280x720x3) en cada lectura
+"""
+import threading
+import weakref
+from collections import deque
+
+import numpy as np
+
+
+class PoolFrames:
+    """Buffers preasignados y reutilizados para las lecturas de un VideoCapture
+
+    Quien recibe un frame de leer() lo devuelve con liberar() cuando ya no lo
+    usa (después de la inferencia y la extracción). Un frame que no se libera
+    no rompe nada: lo recoge el GC y el pool asigna otro. Un frame liberado
+    vuelve con otro contenido: no sirve para cachés por identidad entre
+    frames (integral_de). Seguro entre hilos (un lector produce, el
+    consumidor libera).
+    """
+
+    def __init__(self, max_libres=64):
+        self.max_libres = max_libres
+        self.forma = None  # forma de los buffers; la fija el primer frame leído
+        self.asignados = 0
+        self.reutilizados = 0
+        self._libres = deque()
+        # id → frame entregado; débil para no retener frames que nunca se liberan
+        self._en_uso = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def leer(self, cap):
+        """cap.read() dentro de un buffer del pool → (ok, frame)"""
+        buf, nuevo = self._tomar()
+        ok, frame = cap.read() if buf is None else cap.read(image=buf)
+        if not ok or frame is None:
+            if buf is not None:
+                self._devolver(buf)
+            return False, None
+        with self._lock:
+            if frame is not buf:
+                # Primer frame o cambio de resolución: OpenCV asignó uno nuevo
+                self.asignados += 1
+                self.forma = frame.shape
+            elif nuevo:
+                self.asignados += 1
+            else:
+                self.reutilizados += 1
+            self._en_uso[id(frame)] = frame
+        return True, frame
+
+    def liberar(self, frame):
+        """Devuelve un frame de leer() al pool; ignora frames ajenos o ya liberados"""
+        if frame is None:
+            return
+        with self._lock:
+            if self._en_uso.get(id(frame)) is not frame:
+                return
+            del self._en_uso[id(frame)]
+        self._devolver(frame)
+
+    def _tomar(self):
+        """(buffer, es_nuevo); (None, False) si aún no se conoce la forma"""
+        with self._lock:
+            while self._libres:
+                buf = self._libres.pop()
+                if buf.shape == self.forma:
+                    return buf, False
+            forma = self.forma
+        if forma is None:
+            return None, False
+        # Todos en uso (p. ej. frames esperando en las colas): uno más
+        return np.empty(forma, dtype=np.uint8), True
+
+    def _devolver(self, buf):
+        with self._lock:
+            if buf.shape == self.forma and len(self._libres) < self.max_libres:
+                self._libres.append(buf)
+
+    def estadisticas(self):
+        with self._lock:
+            return {
+                'asignados': self.asignados,
+                'reutilizados': self.reutilizados,
+                'libres': len(self._libres),
+                'en_uso': len(self._en_uso),
+            }
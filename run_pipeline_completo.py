@@ -1,8 +1,9 @@
 from src.sistema_clasificacion import SistemaClasificacion
 from src.sistema_batch_etl import SistemaBatchETL
 import os
+import argparse
 
-def ejecutar_pipeline_completo():
+def ejecutar_pipeline_completo(forzar=False):
     print("🚀 INICIANDO PIPELINE COMPLETO YOLO → HIVE")
     print("=" * 50)
     
@@ -10,22 +11,29 @@ def ejecutar_pipeline_completo():
     print("\n📸 FASE 1: CLASIFICACIÓN DE IMÁGENES Y VIDEOS")
     print("-" * 40)
     
-    sistema = SistemaClasificacion()
+    # Las detecciones se escriben al CSV por chunks mientras se procesan
+    archivo_csv = 'detecciones_yolo.csv'
+    sistema = SistemaClasificacion(archivo_csv)
     
     # Procesar imágenes
-    imagenes_procesadas = sistema.procesar_imagenes('imagenes_entrada')
+    imagenes_procesadas = sistema.procesar_imagenes('imagenes_entrada', forzar)
     print(f"✅ Procesadas {imagenes_procesadas} imágenes")
     
     # Procesar videos
-    videos_procesados = sistema.procesar_videos('videos_entrada')
+    videos_procesados = sistema.procesar_videos('videos_entrada', forzar)
     print(f"✅ Procesados {videos_procesados} videos")
     
+    if not sistema.procesados:
+        print("\n⏭️  Sin entradas nuevas o modificadas: nada que cargar (usar --force para reprocesar)")
+        return True
+    
     # Guardar CSV
-    if sistema.guardar_csv('detecciones_yolo.csv'):
+    if sistema.guardar_csv():
         print(f"✅ CSV generado con {len(sistema.detecciones)} detecciones")
     else:
-        print("❌ Error generando CSV")
-        return False
+        # Entradas nuevas pero sin objetos detectados: no hay nada que cargar
+        sistema.registrar_procesados()
+        return True
     
     # FASE 2: ETL A HIVE
     print("\n📤 FASE 2: CARGA ETL A HIVE")
@@ -47,10 +55,12 @@ def ejecutar_pipeline_completo():
         print("❌ Error creando tabla")
         return False
     
-    # Cargar datos
-    registros_cargados = etl.cargar_csv_a_hive('detecciones_yolo.csv')
+    # Cargar datos (el ETL también lee el CSV por lotes)
+    registros_cargados = etl.cargar_csv_a_hive(archivo_csv)
     if registros_cargados > 0:
         print(f"✅ Cargados {registros_cargados} registros a Hive")
+        # Recién ahora las entradas cuentan como procesadas para la próxima corrida
+        print(f"📒 {sistema.registrar_procesados()} entradas registradas en el manifiesto")
     else:
         print("❌ Error cargando datos")
         return False
@@ -65,4 +75,8 @@ def ejecutar_pipeline_completo():
     return True
 
 if __name__ == "__main__":
-    ejecutar_pipeline_completo()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Pipeline completo YOLO → Hive")
+    parser.add_argument('--force', action='store_true',
+                        help='reprocesar también las entradas ya registradas en el manifiesto')
+    args = parser.parse_args()
+    ejecutar_pipeline_completo(forzar=args.force)
\ No newline at end of file
@@ -7,18 +7,45 @@ import pandas as pd
 from pyhive import hive
 import subprocess
 import os
+import time
+import uuid
 from datetime import datetime
+import configuracion
+from esquema_detecciones import (
+    COLUMNAS_PARTICION, columnas_datos, definicion_columnas_hive, esquema_arrow
+)
+
+# Esquemas (host, puerto, base, tabla) ya verificados en este proceso:
+# el CREATE DATABASE/TABLE IF NOT EXISTS se ejecuta una sola vez por proceso
+_ESQUEMAS_ASEGURADOS = set()
 
 class SistemaBatchETL:
     def __init__(self):
-        # Usar configuración exacta del test exitoso
-        self.hive_host = 'localhost'
-        self.hive_port = 10000
-        self.database = 'yolo_project'
-        self.tabla = 'yolo_objects'
-        self.username = 'jose_dev'
+        # Servidor, credenciales y tabla desde la configuración del nodo
+        self.hive_host = configuracion.HIVE_HOST
+        self.hive_port = configuracion.HIVE_PORT
+        self.database = configuracion.HIVE_DATABASE
+        self.tabla = configuracion.HIVE_TABLA
+        self.username = configuracion.HIVE_USERNAME
+        self.auth = configuracion.HIVE_AUTH
         self.conn = None
         
+        # Sesión persistente: se reutiliza entre batches y se verifica si estuvo inactiva
+        self.VERIFICAR_CONEXION_SEGUNDOS = configuracion.HIVE_VERIFICAR_CONEXION_SEGUNDOS
+        self.ultimo_uso = 0.0
+        self.usando_database = False
+        
+        # Carga masiva: 'archivo' = un LOAD DATA por batch, 'filas' = un INSERT por fila
+        self.modo_carga = configuracion.HIVE_MODO_CARGA
+        self.staging_dir = configuracion.HIVE_STAGING_DIR
+        self.staging_hdfs_dir = configuracion.HIVE_STAGING_HDFS_DIR
+        
+        # Formato de la tabla: 'parquet' (particionada, columnar) o 'textfile' (legacy)
+        self.formato_tabla = configuracion.HIVE_FORMATO_TABLA
+        self.particionada = self.formato_tabla == 'parquet'
+        # Posiciones (en el batch) de las filas que entraron en la última carga
+        self.posiciones_cargadas = []
+        
         print(f"🔧 ETL configurado para Hive en {self.hive_host}:{self.hive_port}")
     
     def _get_wsl_ip(self):
@@ -35,64 +62,123 @@ class SistemaBatchETL:
         
         return 'localhost'
     
+    def _clave_esquema(self):
+        """Identifica la tabla destino para el caché de esquemas asegurados"""
+        return (self.hive_host, self.hive_port, self.database, self.tabla)
+    
+    def _conexion_viva(self):
+        """Health check barato de la sesión abierta"""
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchall()
+            return True
+        except Exception:
+            return False
+    
+    def _descartar_conexion(self):
+        """Cierra sin ruido una sesión que ya no responde"""
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+        self.conn = None
+        self.usando_database = False
+    
     def conectar_hive(self):
-        """Conectar a HiveServer2 usando configuración que funciona"""
+        """Conectar a HiveServer2, reutilizando la sesión abierta si sigue viva"""
+        if self.conn is not None:
+            inactiva = time.monotonic() - self.ultimo_uso
+            if inactiva < self.VERIFICAR_CONEXION_SEGUNDOS or self._conexion_viva():
+                self.ultimo_uso = time.monotonic()
+                return True
+            print("⚠️ Sesión de Hive caída, reconectando...")
+            self._descartar_conexion()
+        
+        # Si el esquema ya se aseguró, abrir directamente sobre la base del proyecto
+        esquema_listo = self._clave_esquema() in _ESQUEMAS_ASEGURADOS
         try:
             print(f"🔗 Conectando a {self.hive_host}:{self.hive_port}...")
             self.conn = hive.Connection(
-                host='localhost', 
-                port=10000,
-                database='default',
-                username='jose_dev',
-                auth='NONE' 
+                host=self.hive_host,
+                port=self.hive_port,
+                database=self.database if esquema_listo else 'default',
+                username=self.username,
+                auth=self.auth
             )
+            self.usando_database = esquema_listo
+            self.ultimo_uso = time.monotonic()
             print("✅ Conectado a HiveServer2")
             return True
         except Exception as e:
             print(f"❌ Error conectando a Hive: {e}")
+            self.conn = None
             return False
     
+    def _ejecutar(self, cursor, sql):
+        """Ejecuta una sentencia reconectando una vez si la sesión se cayó"""
+        try:
+            cursor.execute(sql)
+            self.ultimo_uso = time.monotonic()
+            return cursor
+        except Exception:
+            if self._conexion_viva():
+                # La sesión está bien: es un error de la sentencia
+                raise
+            print("⚠️ Sesión de Hive perdida, reintentando con una nueva conexión...")
+            self._descartar_conexion()
+            if not self.asegurar_sesion():
+                raise
+            cursor = self.conn.cursor()
+            cursor.execute(sql)
+            self.ultimo_uso = time.monotonic()
+            return cursor
+    
+    def _usar_database(self, cursor):
+        """Selecciona la base del proyecto solo si la sesión aún no la usa"""
+        if not self.usando_database:
+            cursor.execute(f'USE {self.database}')
+            self.usando_database = True
+    
+    def asegurar_sesion(self):
+        """Deja lista una sesión viva con el esquema creado (para cada batch)"""
+        return self.conectar_hive() and self.crear_base_datos_y_tabla()
+    
     def crear_base_datos_y_tabla(self):
-        """Crear base de datos y tabla si no existen"""
+        """Crear base de datos y tabla si no existen (una vez por proceso)"""
+        if self._clave_esquema() in _ESQUEMAS_ASEGURADOS:
+            try:
+                self._usar_database(self.conn.cursor())
+                return True
+            except Exception as e:
+                print(f"❌ Error seleccionando base de datos: {e}")
+                return False
+        
         try:
             cursor = self.conn.cursor()
             
             # Crear base de datos
             cursor.execute(f'CREATE DATABASE IF NOT EXISTS {self.database}')
             cursor.execute(f'USE {self.database}')
+            self.usando_database = True
             print(f"✅ Base de datos {self.database} lista")
             
             # Crear tabla con todos los campos del CSV
-            create_table_sql = f"""
+            if self.particionada:
+                create_table_sql = f"""
+            CREATE TABLE IF NOT EXISTS {self.tabla} (
+{definicion_columnas_hive(columnas_datos(True))}
+            )
+            PARTITIONED BY (
+{definicion_columnas_hive(COLUMNAS_PARTICION)}
+            )
+            STORED AS PARQUET
+            TBLPROPERTIES ('parquet.compression'='SNAPPY')
+            """
+            else:
+                create_table_sql = f"""
             CREATE TABLE IF NOT EXISTS {self.tabla} (
-                source_type STRING,
-                source_id STRING,
-                frame_number INT,
-                class_id INT,
-                class_name STRING,
-                confidence DOUBLE,
-                x_min INT,
-                y_min INT,
-                x_max INT,
-                y_max INT,
-                width INT,
-                height INT,
-                area_pixels INT,
-                frame_width INT,
-                frame_height INT,
-                bbox_area_ratio DOUBLE,
-                center_x DOUBLE,
-                center_y DOUBLE,
-                center_x_norm DOUBLE,
-                center_y_norm DOUBLE,
-                position_region STRING,
-                dominant_color_name STRING,
-                dom_r INT,
-                dom_g INT,
-                dom_b INT,
-                timestamp_sec DOUBLE,
-                ingestion_date STRING,
-                detection_id STRING
+{definicion_columnas_hive()}
             )
             ROW FORMAT DELIMITED
             FIELDS TERMINATED BY ','
@@ -100,6 +186,7 @@ class SistemaBatchETL:
             """
             
             cursor.execute(create_table_sql)
+            _ESQUEMAS_ASEGURADOS.add(self._clave_esquema())
             print(f"✅ Tabla {self.tabla} verificada/creada")
             return True
             
@@ -108,7 +195,7 @@ class SistemaBatchETL:
             return False
     
     def cargar_csv_a_hive(self, csv_file='detecciones_prueba.csv'):
-        """Cargar CSV a Hive"""
+        """Cargar CSV a Hive (exportaciones y depuración; el flujo normal usa cargar_registros_a_hive)"""
         if not os.path.exists(csv_file):
             print(f"❌ No se encontró {csv_file}")
             return 0
@@ -116,47 +203,209 @@ class SistemaBatchETL:
         try:
             # Leer CSV
             df = pd.read_csv(csv_file)
+        except Exception as e:
+            print(f"❌ Error leyendo {csv_file}: {e}")
+            return 0
+        
+        return self.cargar_registros_a_hive(df)
+    
+    def cargar_registros_a_hive(self, registros):
+        """Cargar detecciones en memoria a Hive, sin pasar por un CSV intermedio
+        
+        Acepta una lista de diccionarios (una detección por elemento), un
+        DataFrame o una tabla de pyarrow con las columnas de yolo_objects.
+        self.posiciones_cargadas guarda las posiciones de las filas que entraron.
+        """
+        self.posiciones_cargadas = []
+        try:
+            df = self._a_dataframe(registros).reset_index(drop=True)
+            if df.empty:
+                return 0
             print(f"📊 Cargando {len(df)} registros...")
             
             cursor = self.conn.cursor()
-            cursor.execute(f'USE {self.database}')
+            self._usar_database(cursor)
             
-            # Insertar registros uno por uno
-            registros_insertados = 0
+            if self.modo_carga == 'archivo':
+                try:
+                    return self._cargar_con_load_data(cursor, df)
+                except Exception as e:
+                    print(f"⚠️ LOAD DATA falló ({e}), usando inserción fila por fila")
+                    cursor = self.conn.cursor()
+                    # Las particiones que ya entraron con LOAD DATA no se repiten
+                    cargadas = len(self.posiciones_cargadas)
+                    df = df.drop(index=self.posiciones_cargadas)
+                    return cargadas + self._cargar_fila_por_fila(cursor, df)
             
-            for _, row in df.iterrows():
-                insert_sql = f"""
-                INSERT INTO {self.tabla} VALUES (
-                    '{row['source_type']}', '{row['source_id']}', {row['frame_number']},
-                    {row['class_id']}, '{row['class_name']}', {row['confidence']},
-                    {row['x_min']}, {row['y_min']}, {row['x_max']}, {row['y_max']},
-                    {row['width']}, {row['height']}, {row['area_pixels']},
-                    {row['frame_width']}, {row['frame_height']}, {row['bbox_area_ratio']},
-                    {row['center_x']}, {row['center_y']}, {row['center_x_norm']}, {row['center_y_norm']},
-                    '{row['position_region']}', '{row['dominant_color_name']}',
-                    {row['dom_r']}, {row['dom_g']}, {row['dom_b']},
-                    {row['timestamp_sec']}, '{row['ingestion_date']}', '{row['detection_id']}'
-                )
-                """
+            return self._cargar_fila_por_fila(cursor, df)
+            
+        except Exception as e:
+            print(f"❌ Error cargando datos: {e}")
+            # Filas que alcanzaron a entrar antes del error: quien reintenta no las repite
+            return len(self.posiciones_cargadas)
+    
+    def _a_dataframe(self, registros):
+        """Normaliza los formatos de entrada admitidos a un DataFrame"""
+        if isinstance(registros, pd.DataFrame):
+            return registros
+        if hasattr(registros, 'to_pandas'):
+            # pyarrow.Table / RecordBatch
+            return registros.to_pandas()
+        return pd.DataFrame.from_records(list(registros))
+    
+    def _preparar_dataframe(self, df, columnas):
+        """Ordena y tipa las columnas según el esquema de la tabla"""
+        salida = pd.DataFrame(index=df.index)
+        for columna, tipo in columnas:
+            valores = df[columna] if columna in df.columns else pd.Series(None, index=df.index)
+            if tipo == 'INT':
+                # Int64 evita que un NaN convierta la columna en float ("1.0" no es INT en Hive)
+                salida[columna] = pd.to_numeric(valores, errors='coerce').round().astype('Int64')
+            elif tipo == 'DOUBLE':
+                salida[columna] = pd.to_numeric(valores, errors='coerce').astype('float64')
+            else:
+                salida[columna] = valores.astype('string')
+        return salida
+    
+    def _preparar_para_textfile(self, df):
+        """Ordena y tipa las columnas como la tabla TEXTFILE delimitada por comas"""
+        salida = self._preparar_dataframe(df, columnas_datos(False))
+        for columna in salida.columns:
+            if salida[columna].dtype == 'string':
+                # Sin ESCAPED BY en la tabla: comas y saltos de línea romperían la fila
+                salida[columna] = salida[columna].str.replace(r'[,\r\n]', ' ', regex=True)
+        return salida
+    
+    def _particiones(self, df):
+        """Agrupa el batch por (ingestion_day, source_type) → [(cláusula PARTITION, filas)]"""
+        dias = df['ingestion_date'].astype(str).str[:10]
+        grupos = df.groupby([dias.rename('ingestion_day'), df['source_type']], sort=True, observed=True)
+        return [
+            (f"PARTITION (ingestion_day='{dia}', source_type='{origen}')", grupo)
+            for (dia, origen), grupo in grupos
+        ]
+    
+    def _nuevo_archivo_staging(self, extension):
+        """Ruta única en el directorio de staging"""
+        os.makedirs(self.staging_dir, exist_ok=True)
+        return os.path.join(
+            os.path.abspath(self.staging_dir), f"{self.tabla}_{uuid.uuid4().hex}.{extension}"
+        )
+    
+    def _escribir_parquet(self, df):
+        """Escribe las filas como Parquet (Snappy) con los tipos de la tabla"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        columnas = columnas_datos(True)
+        tabla = pa.Table.from_pandas(
+            self._preparar_dataframe(df, columnas),
+            schema=esquema_arrow(columnas),
+            preserve_index=False
+        )
+        archivo = self._nuevo_archivo_staging('parquet')
+        pq.write_table(tabla, archivo, compression='snappy')
+        return archivo
+    
+    def _escribir_textfile(self, df):
+        """Escribe las filas como texto delimitado por comas sin encabezado"""
+        archivo = self._nuevo_archivo_staging('csv')
+        # \\N es la marca de NULL por defecto de Hive en TEXTFILE
+        self._preparar_para_textfile(df).to_csv(archivo, index=False, header=False, na_rep='\\N')
+        return archivo
+    
+    def _load_data(self, cursor, archivo, particion=''):
+        """Mueve un archivo de staging a la tabla (y registra la partición si aplica)"""
+        try:
+            if self.staging_hdfs_dir:
+                # HiveServer2 remoto: subir a HDFS y mover el archivo dentro de la tabla
+                destino = f"{self.staging_hdfs_dir.rstrip('/')}/{os.path.basename(archivo)}"
+                subprocess.run(['hdfs', 'dfs', '-put', '-f', archivo, destino], check=True)
+                load_sql = f"LOAD DATA INPATH '{destino}' INTO TABLE {self.tabla} {particion}"
+            else:
+                # HiveServer2 en esta misma máquina: lee el archivo local directamente
+                load_sql = f"LOAD DATA LOCAL INPATH '{archivo}' INTO TABLE {self.tabla} {particion}"
+            
+            return self._ejecutar(cursor, load_sql.strip())
+        finally:
+            if os.path.exists(archivo):
+                os.remove(archivo)
+    
+    def _cargar_con_load_data(self, cursor, df):
+        """Carga el batch con un LOAD DATA por partición (uno solo en TEXTFILE)"""
+        if self.particionada:
+            for particion, grupo in self._particiones(df):
+                cursor = self._load_data(cursor, self._escribir_parquet(grupo), particion)
+                self.posiciones_cargadas.extend(grupo.index)
+        else:
+            self._load_data(cursor, self._escribir_textfile(df))
+            self.posiciones_cargadas.extend(df.index)
+        
+        print(f"✅ Cargados {len(df)} registros a Hive (LOAD DATA)")
+        return len(df)
+    
+    def _literal_sql(self, valor, tipo):
+        """Literal HiveQL para un valor del esquema"""
+        if pd.isna(valor):
+            return 'NULL'
+        if tipo == 'STRING':
+            return "'" + str(valor).replace('\\', '\\\\').replace("'", "\\'") + "'"
+        if tipo == 'INT':
+            return str(int(valor))
+        return str(float(valor))
+    
+    def _cargar_fila_por_fila(self, cursor, df):
+        """Fallback: un INSERT por detección (un job de Hive por fila)"""
+        registros_insertados = 0
+        
+        if self.particionada:
+            lotes = self._particiones(df)
+        else:
+            lotes = [('', df)]
+        columnas = columnas_datos(self.particionada)
+        
+        for particion, filas in lotes:
+            for posicion, row in filas.iterrows():
+                valores = ', '.join(self._literal_sql(row.get(c), tipo) for c, tipo in columnas)
+                insert_sql = f"INSERT INTO {self.tabla} {particion} VALUES ({valores})"
                 
-                cursor.execute(insert_sql)
+                cursor = self._ejecutar(cursor, insert_sql)
+                self.posiciones_cargadas.append(posicion)
                 registros_insertados += 1
                 
                 if registros_insertados % 10 == 0:
                     print(f"📤 Insertados {registros_insertados}/{len(df)} registros...")
-            
-            print(f"✅ Cargados {registros_insertados} registros a Hive")
-            return registros_insertados
-            
+        
+        print(f"✅ Cargados {registros_insertados} registros a Hive")
+        return registros_insertados
+    
+    def ids_ya_cargados(self, source_type, source_id, detection_ids, ids_por_consulta=1000):
+        """Conjunto de los detection_ids del lote que ya están en la tabla (re-envío tras una caída)"""
+        cargados = set()
+        try:
+            cursor = self.conn.cursor()
+            self._usar_database(cursor)
+            for inicio in range(0, len(detection_ids), ids_por_consulta):
+                ids = ', '.join(
+                    self._literal_sql(i, 'STRING') for i in detection_ids[inicio:inicio + ids_por_consulta]
+                )
+                cursor = self._ejecutar(cursor, (
+                    f"SELECT detection_id FROM {self.tabla} "
+                    f"WHERE source_type = {self._literal_sql(source_type, 'STRING')} "
+                    f"AND source_id = {self._literal_sql(source_id, 'STRING')} "
+                    f"AND detection_id IN ({ids})"
+                ))
+                cargados.update(fila[0] for fila in cursor.fetchall())
+            return cargados
         except Exception as e:
-            print(f"❌ Error cargando datos: {e}")
-            return 0
+            print(f"⚠️ No se pudo verificar el lote previo ({e}); se vuelve a enviar")
+            return set()
     
     def mostrar_estadisticas(self):
         """Mostrar estadísticas de la tabla"""
         try:
             cursor = self.conn.cursor()
-            cursor.execute(f'USE {self.database}')
+            self._usar_database(cursor)
             
             # Total registros
             cursor.execute(f'SELECT COUNT(*) FROM {self.tabla}')
@@ -177,6 +426,8 @@ class SistemaBatchETL:
         """Cerrar conexión a Hive"""
         if self.conn:
             self.conn.close()
+            self.conn = None
+            self.usando_database = False
             print("🔌 Conexión a Hive cerrada")
 
 if __name__ == "__main__":
@@ -4,20 +4,55 @@ Sistema de Clasificación - YOLO para Imágenes y Videos
 Genera CSV local (staging layer)
 """
 import os
-import cv2
 import pandas as pd
 from ultralytics import YOLO
 import uuid
 from datetime import datetime
-import numpy as np
+import configuracion
+from pipeline_video import PipelineVideo
+from pool_frames import PoolFrames
+from pipeline_imagenes import PipelineImagenes
+from imagen_integral import integral_de
+from color_dominante import color_dominante
+from paleta_colores import nombre_color
+from sumidero_detecciones import SumideroDetecciones
+from inferencia_yolo import opciones_inferencia
 
 class SistemaClasificacion:
     """Sistema unificado para clasificar imágenes y videos con YOLO"""
     
-    def __init__(self):
+    def __init__(self, archivo_salida='detecciones_staging.csv'):
         """Inicializar el modelo YOLO"""
-        self.model = YOLO('yolov8n.pt')
-        self.detecciones = []
+        self.model = YOLO(configuracion.YOLO_MODEL)
+        # Confianza, NMS, clases y tope de detecciones se aplican dentro de YOLO
+        self.opciones_inferencia = opciones_inferencia(self.model.names)
+        # Las detecciones se escriben por chunks al staging mientras se producen
+        self.detecciones = SumideroDetecciones(
+            archivo_salida,
+            filas_por_chunk=configuracion.SALIDA_FILAS_POR_CHUNK,
+            memoria_max_mb=configuracion.SALIDA_MEMORIA_MAX_MB
+        )
+        self.modo_color = configuracion.COLOR_DOMINANTE_MODO
+        self._integral = None  # imagen integral del último frame analizado
+        self.pipeline = PipelineVideo(
+            self._inferir_frames,
+            tamano_batch=configuracion.YOLO_BATCH_INFERENCIA,
+            tam_cola=configuracion.PIPELINE_TAMANO_COLA,
+            pool=PoolFrames() if configuracion.PIPELINE_REUTILIZAR_FRAMES else None,
+            muestras_por_segundo=configuracion.MUESTREO_FRAMES_POR_SEGUNDO,
+            modo_muestreo=configuracion.MUESTREO_MODO,
+            seek_min_segundos=configuracion.MUESTREO_SEEK_MIN_SEGUNDOS,
+            seek_salto_min_segundos=configuracion.MUESTREO_SEEK_SALTO_MIN_SEGUNDOS,
+            gstreamer=configuracion.VIDEO_GSTREAMER,
+            lado_maximo=configuracion.YOLO_IMAGEN_TAMANO,
+            decodificador_gstreamer=configuracion.VIDEO_GSTREAMER_DECODIFICADOR
+        )
+        self.pipeline_imagenes = PipelineImagenes(
+            self._inferir_frames,
+            tamano_batch=configuracion.YOLO_BATCH_INFERENCIA,
+            hilos=configuracion.IMAGENES_HILOS_DECODIFICACION,
+            lado_maximo=configuracion.YOLO_IMAGEN_TAMANO
+        )
         
     def procesar_imagenes(self, carpeta='imagenes_entrada'):
         """Procesa todas las imágenes en la carpeta"""
@@ -30,9 +65,9 @@ class SistemaClasificacion:
         
         print(f"📸 Procesando {len(imagenes)} imágenes...")
         
-        for img_file in imagenes:
-            img_path = os.path.join(carpeta, img_file)
-            self._procesar_imagen(img_path, img_file)
+        # Decodificación en paralelo e inferencia por batches; extracción en este hilo
+        rutas = [os.path.join(carpeta, img_file) for img_file in imagenes]
+        self.pipeline_imagenes.ejecutar(rutas, self._procesar_imagen)
             
         return len(imagenes)
     
@@ -53,52 +88,39 @@ class SistemaClasificacion:
             
         return len(videos)
     
-    def _procesar_imagen(self, img_path, img_file):
-        """Procesa una imagen individual"""
-        img = cv2.imread(img_path)
+    def _inferir_frames(self, frames):
+        """Ejecuta YOLO sobre un frame o una lista de frames como un solo batch"""
+        return self.model(frames, **self.opciones_inferencia)
+    
+    def _procesar_imagen(self, img_path, img, boxes):
+        """Extrae las detecciones de una imagen ya inferida (boxes en su resolución)"""
         if img is None:
             return
-            
-        results = self.model(img)
         
-        for result in results:
+        img_file = os.path.basename(img_path)
+        if boxes is not None:
+            for box in boxes:
+                deteccion = self._extraer_atributos(
+                    box, img, img_file, 'image', 0, 0
+                )
+                self.detecciones.agregar(deteccion)
+    
+    def _procesar_video(self, video_path, video_file):
+        """Procesa un video extrayendo frames"""
+        def consumir(frame, frame_number, timestamp_sec, result):
+            # El buffer del frame se reutiliza (pool): la integral del anterior no sirve
+            self._integral = None
             boxes = result.boxes
             if boxes is not None:
                 for box in boxes:
                     deteccion = self._extraer_atributos(
-                        box, img, img_file, 'image', 0, 0
+                        box, frame, video_file, 'video', 
+                        frame_number, timestamp_sec
                     )
-                    self.detecciones.append(deteccion)
-    
-    def _procesar_video(self, video_path, video_file):
-        """Procesa un video extrayendo frames"""
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS) or 30
-        frame_count = 0
+                    self.detecciones.agregar(deteccion)
         
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-                
-            # Procesar cada 30 frames (aprox 1 segundo)
-            if frame_count % 30 == 0:
-                timestamp_sec = frame_count / fps
-                results = self.model(frame)
-                
-                for result in results:
-                    boxes = result.boxes
-                    if boxes is not None:
-                        for box in boxes:
-                            deteccion = self._extraer_atributos(
-                                box, frame, video_file, 'video', 
-                                frame_count, timestamp_sec
-                            )
-                            self.detecciones.append(deteccion)
-            
-            frame_count += 1
-            
-        cap.release()
+        # Decodificación e inferencia en hilos; extracción en este hilo
+        self.pipeline.ejecutar(video_path, consumir)
     
     def _extraer_atributos(self, box, frame, source_id, source_type, 
                           frame_number, timestamp_sec):
@@ -115,7 +137,8 @@ class SistemaClasificacion:
         height = y2 - y1
         area_pixels = width * height
         
-        frame_height, frame_width = frame.shape[:2]
+        # Con GStreamer el frame llega reducido y la box en coordenadas del original
+        frame_height, frame_width = (getattr(box, 'orig_shape', None) or frame.shape)[:2]
         bbox_area_ratio = area_pixels / (frame_width * frame_height)
         
         center_x = (x1 + x2) / 2
@@ -128,9 +151,13 @@ class SistemaClasificacion:
             center_x_norm, center_y_norm
         )
         
-        # C. Color Dominante
-        roi = frame[int(y1):int(y2), int(x1):int(x2)]
-        color_info = self._obtener_color_dominante(roi)
+        # C. Color Dominante (en 'mean', integral del frame: O(1) por caja)
+        if self.modo_color == 'mean':
+            self._integral = integral_de(frame, self._integral)
+        escala_x, escala_y = frame.shape[1] / frame_width, frame.shape[0] / frame_height
+        color_info = self._obtener_color_dominante(
+            frame, int(x1 * escala_x), int(y1 * escala_y), int(x2 * escala_x), int(y2 * escala_y)
+        )
         
         return {
             # A. Información Básica
@@ -188,14 +215,17 @@ class SistemaClasificacion:
             
         return f"{row}-{col}"
     
-    def _obtener_color_dominante(self, roi):
-        """Obtiene el color dominante de una región"""
-        if roi.size == 0:
+    def _obtener_color_dominante(self, frame, x1, y1, x2, y2):
+        """Obtiene el color dominante de una región del frame"""
+        color = color_dominante(
+            frame, x1, y1, x2, y2, self.modo_color,
+            self._integral, configuracion.COLOR_DOMINANTE_MAX_PIXELES
+        )
+        if color is None:
             return {'name': 'black', 'r': 0, 'g': 0, 'b': 0}
             
-        roi_rgb = cv2.cvtColor(roi, cv2.COLOR_BGR2RGB)
-        color_promedio = np.mean(roi_rgb.reshape(-1, 3), axis=0)
-        r, g, b = color_promedio.astype(int)
+        # El frame es BGR: se invierte el color en lugar de convertir la ROI
+        r, g, b = color[::-1].astype(int)
         
         return {
             'name': self._clasificar_color(r, g, b),
@@ -205,33 +235,37 @@ class SistemaClasificacion:
         }
     
     def _clasificar_color(self, r, g, b):
-        """Clasifica un color RGB en nombre"""
-        if r > 200 and g > 200 and b > 200:
-            return 'white'
-        elif r < 50 and g < 50 and b < 50:
-            return 'black'
-        elif r > g and r > b:
-            return 'red'
-        elif g > r and g > b:
-            return 'green'
-        elif b > r and b > g:
-            return 'blue'
-        elif r > 150 and g > 150:
-            return 'yellow'
-        else:
-            return 'other'
+        """Clasifica un color RGB en nombre (paleta compartida)"""
+        return nombre_color(r, g, b)
     
-    def guardar_csv(self, archivo='detecciones_staging.csv'):
-        """Guarda todas las detecciones en CSV (staging layer)"""
-        if not self.detecciones:
+    def guardar_csv(self, archivo=None):
+        """Escribe el último chunk y cierra el archivo de staging (CSV o Parquet)"""
+        filas = self.detecciones.cerrar(archivo)
+        if not filas:
             print("❌ No hay detecciones para guardar")
             return False
             
-        df = pd.DataFrame(self.detecciones)
-        df.to_csv(archivo, index=False)
-        print(f"✅ Guardadas {len(self.detecciones)} detecciones en {archivo}")
+        print(f"✅ Guardadas {filas} detecciones en {self.detecciones.ruta} "
+              f"({self.detecciones.chunks_escritos} chunks)")
         return True
 
+def contar_clases(archivo, filas_por_chunk=100000):
+    """Conteo de class_name del archivo de staging sin cargarlo entero"""
+    if archivo.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        archivo_pq = pq.ParquetFile(archivo)
+        chunks = (
+            archivo_pq.read_row_group(i, columns=['class_name']).to_pandas()
+            for i in range(archivo_pq.num_row_groups)
+        )
+    else:
+        chunks = pd.read_csv(archivo, usecols=['class_name'], chunksize=filas_por_chunk)
+    
+    conteo = pd.Series(dtype='int64')
+    for chunk in chunks:
+        conteo = conteo.add(chunk['class_name'].value_counts(), fill_value=0)
+    return conteo.astype('int64').sort_values(ascending=False)
+
 def main():
     """Función principal del sistema de clasificación"""
     print("🤖 SISTEMA DE CLASIFICACIÓN - YOLO")
@@ -252,10 +286,10 @@ def main():
         print(f"Videos procesados: {num_videos}")
         print(f"Total detecciones: {len(clasificador.detecciones)}")
         
-        # Mostrar estadísticas
-        df = pd.DataFrame(clasificador.detecciones)
-        print(f"Clases detectadas: {df['class_name'].nunique()}")
-        print("Top 5 clases:", df['class_name'].value_counts().head().to_dict())
+        # Mostrar estadísticas leyendo el staging por chunks
+        clases = contar_clases(clasificador.detecciones.ruta)
+        print(f"Clases detectadas: {len(clases)}")
+        print("Top 5 clases:", clases.head().to_dict())
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
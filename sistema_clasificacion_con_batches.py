@@ -3,117 +3,294 @@
 Sistema de Clasificación YOLO con Batches de 10 segundos para videos
 """
 import cv2
-import pandas as pd
 from ultralytics import YOLO
 import os
+import time
+import threading
 from datetime import datetime
 import uuid
 import colorsys
-import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import configuracion
 from sistema_batch_etl import SistemaBatchETL
+from enviador_hive import EnviadorHive
+from pipeline_video import PipelineVideo
+from pool_frames import PoolFrames
+from pipeline_imagenes import PipelineImagenes
+from imagen_integral import integral_de
+from color_dominante import color_dominante
+from paleta_colores import nombre_color
+from inferencia_yolo import opciones_inferencia
+from extraccion_vectorizada import (
+    arrays_desde_boxes, extraer_atributos_lote, filas_lote
+)
+from batcher_adaptativo import BatcherAdaptativo, MetricasBatches
+from manifiesto import crear_manifiesto, version_modelo
+from checkpoint_videos import CheckpointsVideos
+from servicio_camaras import LectorCamara, ServicioCamaras, abrir_fuente, parsear_camaras
+
+# Instancia propia de cada proceso del pool de videos (YOLO se carga una sola vez)
+_sistema_worker = None
+
+def _inicializar_worker(hilos_torch):
+    """Inicializa un proceso del pool: limita hilos de torch/OpenCV y carga YOLO"""
+    global _sistema_worker
+    import torch
+    
+    # Sin esto cada proceso usaría todos los núcleos y se sobresuscribe la CPU
+    torch.set_num_threads(hilos_torch)
+    cv2.setNumThreads(1)
+    _sistema_worker = SistemaClasificacionBatches()
+
+def _procesar_video_en_worker(video_path, video_file):
+    """Tarea del pool: procesa un video completo con la instancia del proceso"""
+    # La sesión de Hive del proceso se reutiliza entre los videos que le tocan
+    return _sistema_worker._procesar_video_con_batches(video_path, video_file)
 
 class SistemaClasificacionBatches:
     def __init__(self):
         print("🤖 Inicializando YOLO con sistema de batches...")
-        self.model = YOLO('yolov8n.pt')
+        self.model = YOLO(configuracion.YOLO_MODEL)
+        # Confianza, NMS, clases y tope de detecciones se aplican dentro de YOLO
+        self.opciones_inferencia = opciones_inferencia(self.model.names)
         self.detecciones = []
+        self.resumen_videos = []
+        self.modo_color = configuracion.COLOR_DOMINANTE_MODO
+        # Caché de integral_de para _extraer_atributos (solo benchmarks)
+        self._integral = None
         self.etl = SistemaBatchETL()
-        
-        # Configuración de batches para videos
-        self.BATCH_DURACION_SEGUNDOS = 10
-        self.batch_actual = []
-        self.tiempo_inicio_batch = 0
-        
-        print("✅ Sistema listo con batches de 10 segundos")
+        # Los batches de video se cargan en un hilo de fondo mientras sigue la inferencia
+        self.enviador = EnviadorHive(
+            self.etl,
+            tam_cola=configuracion.HIVE_ENVIO_TAM_COLA,
+            reintentos=configuracion.HIVE_ENVIO_REINTENTOS,
+            espera_inicial=configuracion.HIVE_ENVIO_ESPERA_INICIAL
+        )
+        self.checkpoints = CheckpointsVideos(
+            configuracion.CHECKPOINTS_DIR, version_modelo(configuracion.YOLO_MODEL)
+        )
+        
+        # Batches de video: se cortan por filas, bytes o segundos de video (lo primero)
+        self.batcher = BatcherAdaptativo(
+            max_filas=configuracion.BATCH_TAMAÑO_MAXIMO,
+            max_bytes=configuracion.BATCH_MAXIMO_MB * 1024 ** 2,
+            max_segundos=configuracion.BATCH_DURACION_SEGUNDOS
+        )
+        
+        # Pipeline decodificación → inferencia por batches → extracción/envío
+        self.pipeline = PipelineVideo(
+            self._inferir_frames,
+            tamano_batch=configuracion.YOLO_BATCH_INFERENCIA,
+            tam_cola=configuracion.PIPELINE_TAMANO_COLA,
+            pool=PoolFrames() if configuracion.PIPELINE_REUTILIZAR_FRAMES else None,
+            muestras_por_segundo=configuracion.MUESTREO_FRAMES_POR_SEGUNDO,
+            modo_muestreo=configuracion.MUESTREO_MODO,
+            seek_min_segundos=configuracion.MUESTREO_SEEK_MIN_SEGUNDOS,
+            seek_salto_min_segundos=configuracion.MUESTREO_SEEK_SALTO_MIN_SEGUNDOS,
+            gstreamer=configuracion.VIDEO_GSTREAMER,
+            lado_maximo=configuracion.YOLO_IMAGEN_TAMANO,
+            decodificador_gstreamer=configuracion.VIDEO_GSTREAMER_DECODIFICADOR
+        )
+        
+        # Imágenes: decodificación en un pool de hilos + inferencia por batches
+        self.pipeline_imagenes = PipelineImagenes(
+            self._inferir_frames,
+            tamano_batch=configuracion.YOLO_BATCH_INFERENCIA,
+            hilos=configuracion.IMAGENES_HILOS_DECODIFICACION,
+            lado_maximo=configuracion.YOLO_IMAGEN_TAMANO
+        )
+        
+        print(f"✅ Sistema listo con batches de hasta {configuracion.BATCH_DURACION_SEGUNDOS}s "
+              f"/ {configuracion.BATCH_TAMAÑO_MAXIMO} filas / {configuracion.BATCH_MAXIMO_MB} MB")
     
     def _procesar_video_con_batches(self, video_path, video_file):
-        """Procesa video enviando batches cada 10 segundos"""
+        """Procesa un video enviando batches a Hive por filas, bytes o segundos de video"""
         print(f"🎬 Procesando video con batches: {video_file}")
         
-        cap = cv2.VideoCapture(video_path)
-        fps = cap.get(cv2.CAP_PROP_FPS) or 30
-        frame_count = 0
-        
-        # Inicializar primer batch
-        self.batch_actual = []
-        self.tiempo_inicio_batch = 0
-        batch_numero = 1
-        
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
+        # Reanudar desde el último checkpoint si una corrida anterior se cortó
+        checkpoint = self.checkpoints.cargar(video_path)
+        batches_enviados = checkpoint['batches_enviados'] if checkpoint else 0
+        desde_segundos = checkpoint['segundos_enviados'] if checkpoint else 0.0
+        lote_incierto = checkpoint['lote_en_envio'] if checkpoint else None
+        # Batches que la corrida anterior envió después de uno fallido: pueden estar en Hive
+        revisar_hasta = (checkpoint.get('segundos_intentados') or 0.0) if checkpoint else 0.0
+        if checkpoint:
+            print(f"♻️  Reanudando {video_file} desde {desde_segundos}s "
+                  f"({batches_enviados} batches ya enviados)")
+        
+        # Inicializar primer batch (reutiliza la memoria de las columnas)
+        self.batcher.descartar()
+        self.batcher.metricas.reiniciar()
+        if lote_incierto is not None and checkpoint.get('filas_en_envio'):
+            # Reproducir el corte del batch en vuelo para poder reconocerlo en Hive
+            self.batcher.forzar_corte(checkpoint['filas_en_envio'])
+        batch_numero = batches_enviados + 1
+        segundos_enviados = desde_segundos
+        total_detecciones = 0
+        registros_enviados = 0
+        checkpoint_al_dia = True
+        # Avance persistido; tras la inicialización solo lo modifica el hilo de envío
+        ultimo_batch, ultimo_segundo = batches_enviados, desde_segundos
+        lote_en_envio = lote_incierto
+        filas_en_envio = checkpoint.get('filas_en_envio') if checkpoint else None
+        segundos_intentados = revisar_hasta
+        
+        def guardar_checkpoint():
+            self.checkpoints.guardar(
+                video_path, ultimo_batch, ultimo_segundo, lote_en_envio, filas_en_envio,
+                segundos_intentados or None
+            )
+        
+        def batch_enviado(numero, hasta_segundos, filas, registros):
+            """Avanza el checkpoint si el batch llegó completo a Hive (hilo de envío)"""
+            nonlocal registros_enviados, checkpoint_al_dia, ultimo_batch, ultimo_segundo
+            nonlocal lote_en_envio, filas_en_envio
+            registros_enviados += registros
             
-            # Procesar cada 30 frames (aprox 1 segundo)
-            if frame_count % 30 == 0:
-                timestamp_sec = frame_count / fps
-                
-                # Verificar si necesitamos enviar batch (cada 10 segundos)
-                if timestamp_sec >= (batch_numero * self.BATCH_DURACION_SEGUNDOS):
-                    if self.batch_actual:
-                        self._enviar_batch_a_hive(video_file, batch_numero - 1)
-                    
-                    # Iniciar nuevo batch
-                    self.batch_actual = []
-                    batch_numero += 1
-                
-                # Procesar frame
-                results = self.model(frame)
-                
-                for result in results:
-                    boxes = result.boxes
-                    if boxes is not None:
-                        for box in boxes:
-                            deteccion = self._extraer_atributos(
-                                box, frame, video_file, 'video', 
-                                frame_count, timestamp_sec
-                            )
-                            # Agregar al batch actual
-                            self.batch_actual.append(deteccion)
+            # Si un batch falla, el checkpoint queda en el anterior para reintentarlo
+            checkpoint_al_dia = checkpoint_al_dia and registros == filas
+            if checkpoint_al_dia:
+                ultimo_batch, ultimo_segundo = numero, hasta_segundos
+                lote_en_envio = filas_en_envio = None
+                guardar_checkpoint()
+        
+        def cerrar_batch(hasta_segundos, motivo):
+            """Encola el batch actual para Hive sin detener la inferencia
             
-            frame_count += 1
-        
-        # Enviar último batch si tiene datos
-        if self.batch_actual:
-            self._enviar_batch_a_hive(video_file, batch_numero - 1)
-        
-        cap.release()
-        print(f"✅ Video procesado: {video_file} - {batch_numero} batches enviados")
+            hasta_segundos es el timestamp del primer frame que queda fuera del batch.
+            """
+            nonlocal batch_numero, segundos_enviados
+            numero, desde = batch_numero, segundos_enviados
+            filas = len(self.batcher)
+            if not filas:
+                return
+            batch_numero += 1
+            segundos_enviados = hasta_segundos
+            df_batch = self.batcher.tomar(hasta_segundos, motivo)
+            ya_cargadas = 0
+            
+            if numero == lote_incierto or desde < revisar_hasta:
+                # Única consulta desde este hilo: esperar a que el envío esté libre
+                self.enviador.vaciar()
+                ids = self._ids_ya_cargados(video_file, df_batch['detection_id'].tolist())
+                if ids:
+                    # La corrida anterior cargó todo o parte del batch: solo va lo que falta
+                    df_batch = df_batch[~df_batch['detection_id'].isin(ids)]
+                    ya_cargadas = filas - len(df_batch)
+                    if not len(df_batch):
+                        print(f"⏭️  Batch {numero} de {video_file} ya estaba en Hive")
+                        batch_enviado(numero, hasta_segundos, filas, filas)
+                        return
+                    print(f"♻️  Batch {numero} de {video_file}: {ya_cargadas} filas ya estaban en Hive")
+            
+            def al_iniciar():
+                nonlocal lote_en_envio, filas_en_envio, segundos_intentados
+                # Write-ahead: si el proceso muere durante la carga, el batch queda marcado
+                if checkpoint_al_dia:
+                    lote_en_envio, filas_en_envio = numero, filas
+                else:
+                    # Detrás de un batch fallido: la reanudación debe cotejarlo con Hive
+                    segundos_intentados = max(segundos_intentados, hasta_segundos)
+                guardar_checkpoint()
+            
+            self._enviar_batch_a_hive(
+                df_batch, video_file, numero, desde, hasta_segundos, al_iniciar,
+                lambda registros: batch_enviado(numero, hasta_segundos, filas, registros + ya_cargadas)
+            )
+        
+        def consumir(frame, frame_number, timestamp_sec, result):
+            """Etapa final del pipeline: atributos, batches adaptativos y envío"""
+            nonlocal total_detecciones
+            
+            # Cortar antes de agregar el frame: un batch nunca parte un frame
+            motivo = self.batcher.motivo_corte(timestamp_sec)
+            if motivo:
+                cerrar_batch(timestamp_sec, motivo)
+            
+            # Atributos de todas las detecciones del frame de una vez (columnar)
+            lote = self._extraer_lote(
+                result.boxes, frame, video_file, 'video', frame_number, timestamp_sec
+            )
+            if filas_lote(lote):
+                self.batcher.agregar_lote(lote, timestamp_sec)
+                total_detecciones += filas_lote(lote)
+        
+        # Decodificación e inferencia corren en hilos mientras aquí se extrae; el envío va aparte
+        try:
+            self.pipeline.ejecutar(video_path, consumir, desde_segundos=desde_segundos)
+            
+            # Enviar último batch si tiene datos
+            cerrar_batch(float('inf'), 'final')
+        finally:
+            # Lo ya encolado llega a Hive aunque el video haya fallado a mitad
+            self.enviador.vaciar()
+        if checkpoint_al_dia:
+            # Video completo: desde aquí lo cubre el manifiesto
+            self.checkpoints.eliminar(video_path)
+        
+        print(f"✅ Video procesado: {video_file} - {batch_numero - 1 - batches_enviados} batches enviados")
+        return {
+            'video': video_file,
+            'batches': batch_numero - 1 - batches_enviados,
+            'detecciones': total_detecciones,
+            'registros': registros_enviados,
+            'metricas_batches': self.batcher.metricas.batches
+        }
     
-    def _enviar_batch_a_hive(self, video_file, batch_numero):
-        """Envía un batch de 10 segundos a Hive"""
-        if not self.batch_actual:
-            return
-        
-        tiempo_inicio = (batch_numero - 1) * self.BATCH_DURACION_SEGUNDOS
-        tiempo_fin = batch_numero * self.BATCH_DURACION_SEGUNDOS
-        
+    def _inferir_frames(self, frames):
+        """Ejecuta YOLO sobre una lista de frames como un solo batch"""
+        return self.model(frames, **self.opciones_inferencia)
+    
+    def _extraer_lote(self, boxes, frame, source_id, source_type, frame_number=0, timestamp_sec=0.0):
+        """Atributos de todas las boxes de un resultado de YOLO como lote columnar"""
+        xyxy, conf, cls = arrays_desde_boxes(boxes)
+        return extraer_atributos_lote(
+            xyxy, conf, cls, frame, self.model.names,
+            source_id, source_type, frame_number, timestamp_sec,
+            modo_color=self.modo_color, max_pixeles_color=configuracion.COLOR_DOMINANTE_MAX_PIXELES,
+            forma_original=getattr(boxes, 'orig_shape', None)
+        )
+    
+    def _ids_ya_cargados(self, video_file, detection_ids):
+        """detection_ids del batch (deterministas) que una corrida anterior ya cargó en Hive"""
+        if not self.etl.asegurar_sesion():
+            return set()
+        return self.etl.ids_ya_cargados('video', video_file, detection_ids)
+    
+    def _enviar_batch_a_hive(self, df_batch, video_file, batch_numero, desde_segundos, hasta_segundos,
+                             al_iniciar=None, al_terminar=None):
+        """Encola un batch de video para el hilo de envío a Hive
+
+        al_terminar(registros) se llama desde el hilo de envío con los registros cargados.
+        """
+        hasta = 'fin' if hasta_segundos == float('inf') else f"{hasta_segundos:.1f}s"
         print(f"📤 Enviando batch {batch_numero} de {video_file}")
-        print(f"   ⏱️  Ventana: {tiempo_inicio}s - {tiempo_fin}s")
-        print(f"   📊 Detecciones: {len(self.batch_actual)}")
-        
-        # Crear DataFrame del batch
-        df_batch = pd.DataFrame(self.batch_actual)
+        print(f"   ⏱️  Ventana: {desde_segundos:.1f}s - {hasta}")
+        print(f"   📊 Detecciones: {len(df_batch)}")
         
-        # Guardar CSV temporal del batch
-        csv_batch = f"batch_{video_file}_{batch_numero:03d}.csv"
-        df_batch.to_csv(csv_batch, index=False)
+        # Copia opcional del batch en CSV (depuración / exportación)
+        if configuracion.EXPORTAR_CSV_BATCHES:
+            self._exportar_csv(df_batch, f"batch_{video_file}_{batch_numero:03d}.csv")
         
-        # Conectar y enviar a Hive
-        if self.etl.conectar_hive():
-            if self.etl.crear_base_datos_y_tabla():
-                registros = self.etl.cargar_csv_a_hive(csv_batch)
-                print(f"   ✅ {registros} registros enviados a Hive")
-            self.etl.cerrar_conexion()
-        
-        # Limpiar archivo temporal
-        if os.path.exists(csv_batch):
-            os.remove(csv_batch)
-        
-        print(f"   🎯 Batch {batch_numero} completado")
+        # Hive directo desde memoria, reutilizando la sesión abierta, sin frenar el video
+        self.enviador.enviar(
+            df_batch, f"Batch {batch_numero} de {video_file}", al_iniciar, al_terminar
+        )
+    
+    def _exportar_csv(self, df, nombre):
+        """Guarda una copia del batch en CSV dentro de la carpeta de datos"""
+        os.makedirs(configuracion.CARPETA_DATA, exist_ok=True)
+        ruta = os.path.join(configuracion.CARPETA_DATA, nombre)
+        df.to_csv(ruta, index=False)
+        print(f"   💾 Copia del batch en {ruta}")
     
     def _extraer_atributos(self, box, frame, source_id, source_type, frame_number=0, timestamp_sec=0.0):
-        """Extraer atributos de una detección"""
+        """Extraer atributos de una detección
+
+        Versión por box que reemplazó extraer_atributos_lote; sin uso en el
+        flujo, se conserva como referencia de benchmarks/bench_extraccion_atributos.py.
+        """
         # Obtener coordenadas y confianza
         conf = float(box.conf[0])
         cls_id = int(box.cls[0])
@@ -152,10 +329,14 @@ class SistemaClasificacionBatches:
         
         position_region = f"{pos_y}_{pos_x}"
         
-        # Color dominante del bounding box
-        roi = frame[int(y1):int(y2), int(x1):int(x2)]
-        if roi.size > 0:
-            avg_color = np.mean(roi, axis=(0, 1))
+        # Color dominante del bounding box (en 'mean', O(1) con la integral del frame)
+        if self.modo_color == 'mean':
+            self._integral = integral_de(frame, self._integral)
+        avg_color = color_dominante(
+            frame, int(x1), int(y1), int(x2), int(y2), self.modo_color,
+            self._integral, configuracion.COLOR_DOMINANTE_MAX_PIXELES
+        )
+        if avg_color is not None:
             dom_b, dom_g, dom_r = avg_color.astype(int)
             
             # Convertir a nombre de color aproximado
@@ -196,107 +377,287 @@ class SistemaClasificacionBatches:
         }
     
     def _get_color_name(self, r, g, b):
-        """Obtener nombre aproximado del color"""
-        colors = {
-            'red': (255, 0, 0), 'green': (0, 255, 0), 'blue': (0, 0, 255),
-            'yellow': (255, 255, 0), 'cyan': (0, 255, 255), 'magenta': (255, 0, 255),
-            'white': (255, 255, 255), 'black': (0, 0, 0), 'gray': (128, 128, 128),
-            'orange': (255, 165, 0), 'purple': (128, 0, 128), 'brown': (165, 42, 42)
-        }
-        
-        min_dist = float('inf')
-        closest_color = 'gray'
-        
-        for name, (cr, cg, cb) in colors.items():
-            dist = ((r - cr) ** 2 + (g - cg) ** 2 + (b - cb) ** 2) ** 0.5
-            if dist < min_dist:
-                min_dist = dist
-                closest_color = name
-        
-        return closest_color
+        """Obtener nombre aproximado del color (paleta compartida)"""
+        return nombre_color(r, g, b)
     
-    def procesar_videos(self, carpeta_videos='videos_entrada'):
-        """Procesar todos los videos con sistema de batches"""
+    def procesar_videos(self, carpeta_videos='videos_entrada', workers=None, forzar=False):
+        """Procesar todos los videos con sistema de batches
+        
+        Con workers > 1 los videos se reparten en un pool de procesos; cada
+        proceso carga su propio YOLO una vez. Los resúmenes se devuelven en
+        orden alfabético de video sin importar cuál termine primero.
+        Los videos ya registrados en el manifiesto (mismo contenido y modelo)
+        se saltan salvo con forzar=True.
+        """
         if not os.path.exists(carpeta_videos):
             print(f"❌ Carpeta {carpeta_videos} no existe")
             return 0
         
-        videos_procesados = 0
         extensiones = ('.mp4', '.avi', '.mov', '.mkv')
+        videos = sorted(
+            archivo for archivo in os.listdir(carpeta_videos)
+            if archivo.lower().endswith(extensiones)
+        )
+        rutas = [os.path.join(carpeta_videos, archivo) for archivo in videos]
+        
+        manifiesto = crear_manifiesto()
+        rutas = manifiesto.filtrar(rutas, forzar)
+        omitidos = len(videos) - len(rutas)
+        videos = [os.path.basename(ruta) for ruta in rutas]
+        if omitidos:
+            print(f"⏭️  {omitidos} videos sin cambios desde la última corrida (usar --force para reprocesar)")
+        if not videos:
+            return 0
         
-        for archivo in os.listdir(carpeta_videos):
-            if archivo.lower().endswith(extensiones):
-                video_path = os.path.join(carpeta_videos, archivo)
-                print(f"\n🎬 Procesando: {archivo}")
-                
-                self._procesar_video_con_batches(video_path, archivo)
-                videos_procesados += 1
+        if workers is None:
+            workers = configuracion.VIDEOS_WORKERS
+        workers = max(1, min(workers, len(videos)))
         
+        if workers > 1:
+            resumenes = self._procesar_videos_en_paralelo(rutas, videos, workers)
+        else:
+            resumenes = []
+            for video_path, archivo in zip(rutas, videos):
+                print(f"\n🎬 Procesando: {archivo}")
+                resumenes.append(self._procesar_video_con_batches(video_path, archivo))
+        
+        # La sesión de Hive se mantuvo abierta entre batches
+        self.enviador.cerrar()
+        self.etl.cerrar_conexion()
+        
+        self.resumen_videos = resumenes
+        metricas = MetricasBatches()
+        for video_path, resumen in zip(rutas, resumenes):
+            print(f"   📊 {resumen['video']}: {resumen['batches']} batches, "
+                  f"{resumen['detecciones']} detecciones")
+            metricas.extender(resumen['metricas_batches'])
+            # Solo se marca como procesado si todas sus detecciones llegaron a Hive
+            if resumen['registros'] == resumen['detecciones']:
+                manifiesto.registrar(video_path, resumen['registros'])
+        metricas.imprimir('Batches de video')
+        
+        videos_procesados = len(resumenes)
         print(f"\n✅ Videos procesados con batches: {videos_procesados}")
         return videos_procesados
+    
+    def _procesar_videos_en_paralelo(self, rutas, videos, workers):
+        """Reparte los videos en un pool de procesos y junta los resúmenes en orden"""
+        hilos_torch = configuracion.TORCH_HILOS_POR_WORKER or max(1, (os.cpu_count() or 1) // workers)
+        print(f"\n⚙️  Procesando {len(videos)} videos con {workers} procesos "
+              f"({hilos_torch} hilos de torch cada uno)")
+        
+        # spawn: no heredar por fork el estado de hilos de torch/OpenCV del padre
+        contexto = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=contexto,
+            initializer=_inicializar_worker,
+            initargs=(hilos_torch,)
+        ) as pool:
+            # map conserva el orden de entrada → resultado determinista
+            return list(pool.map(_procesar_video_en_worker, rutas, videos))
+
+    def procesar_imagenes(self, carpeta_imagenes='imagenes_entrada', forzar=False):
+        """Procesar imágenes nuevas o modificadas, enviando a Hive por batches adaptativos
 
-    def procesar_imagenes(self, carpeta_imagenes='imagenes_entrada'):
-        """Procesar imágenes (envío inmediato a Hive)"""
+        Se corta por filas, bytes o segundos de reloj desde la primera detección
+        del batch; cada imagen se registra en el manifiesto cuando su batch llega
+        completo a Hive.
+        """
         if not os.path.exists(carpeta_imagenes):
             print(f"❌ Carpeta {carpeta_imagenes} no existe")
             return 0
         
         imagenes_procesadas = 0
         extensiones = ('.jpg', '.jpeg', '.png', '.bmp')
-        detecciones_imagenes = []
-        
-        for archivo in os.listdir(carpeta_imagenes):
-            if archivo.lower().endswith(extensiones):
-                imagen_path = os.path.join(carpeta_imagenes, archivo)
-                print(f"🖼️  Procesando: {archivo}")
-                
-                # Cargar y procesar imagen
-                frame = cv2.imread(imagen_path)
-                if frame is None:
-                    print(f"❌ No se pudo cargar: {archivo}")
-                    continue
-                
-                # Detectar objetos
-                results = self.model(frame)
-                detecciones_imagen = 0
-                
-                for result in results:
-                    boxes = result.boxes
-                    if boxes is not None:
-                        for box in boxes:
-                            deteccion = self._extraer_atributos(
-                                box, frame, archivo, 'image', 0, 0.0
-                            )
-                            detecciones_imagenes.append(deteccion)
-                            detecciones_imagen += 1
-                
-                print(f"   ✅ {detecciones_imagen} objetos detectados")
-                imagenes_procesadas += 1
-        
-        # Enviar todas las imágenes a Hive de una vez
-        if detecciones_imagenes:
-            print(f"\n📤 Enviando {len(detecciones_imagenes)} detecciones de imágenes a Hive...")
+        batcher = BatcherAdaptativo(
+            max_filas=configuracion.BATCH_TAMAÑO_MAXIMO,
+            max_bytes=configuracion.BATCH_MAXIMO_MB * 1024 ** 2,
+            max_segundos=configuracion.BATCH_IMAGENES_SEGUNDOS
+        )
+        # Imágenes (ruta → filas) cuyas detecciones van en el batch actual
+        imagenes_batch = {}
+        batches_enviados = 0
+        
+        todas = sorted(
+            os.path.join(carpeta_imagenes, archivo) for archivo in os.listdir(carpeta_imagenes)
+            if archivo.lower().endswith(extensiones)
+        )
+        manifiesto = crear_manifiesto()
+        rutas = manifiesto.filtrar(todas, forzar)
+        if len(todas) > len(rutas):
+            print(f"⏭️  {len(todas) - len(rutas)} imágenes sin cambios desde la última corrida")
+        
+        def batch_enviado(imagenes, filas, registros):
+            # Solo se registran las imágenes de un batch que llegó completo (hilo de envío)
+            if registros == filas:
+                for imagen_path, filas_imagen in imagenes.items():
+                    manifiesto.registrar(imagen_path, filas_imagen)
+        
+        def cerrar_batch(motivo):
+            nonlocal imagenes_batch, batches_enviados
+            imagenes, imagenes_batch = imagenes_batch, {}
+            filas = len(batcher)
+            if not filas:
+                # Imágenes sin detecciones: registrar cuando el hilo de envío esté libre
+                self.enviador.vaciar()
+                batch_enviado(imagenes, 0, 0)
+                return
+            batches_enviados += 1
+            df_batch = batcher.tomar(time.monotonic(), motivo)
+            print(f"\n📤 Enviando batch {batches_enviados} de imágenes: "
+                  f"{filas} detecciones de {len(imagenes)} imágenes")
+            
+            if configuracion.EXPORTAR_CSV_BATCHES:
+                self._exportar_csv(df_batch, f"detecciones_imagenes_{batches_enviados:03d}.csv")
             
-            # Crear DataFrame
-            df_imagenes = pd.DataFrame(detecciones_imagenes)
+            # Hive directo desde memoria, en segundo plano mientras siguen las imágenes
+            self.enviador.enviar(
+                df_batch, f"Batch {batches_enviados} de imágenes",
+                al_terminar=lambda registros: batch_enviado(imagenes, filas, registros)
+            )
+        
+        def consumir(imagen_path, frame, boxes):
+            """Atributos de una imagen ya inferida (en orden de archivo) y corte de batch"""
+            nonlocal imagenes_procesadas
+            archivo = os.path.basename(imagen_path)
+            print(f"🖼️  Procesando: {archivo}")
+            if frame is None:
+                print(f"❌ No se pudo cargar: {archivo}")
+                return
             
-            # Guardar CSV temporal
-            csv_imagenes = "detecciones_imagenes_temp.csv"
-            df_imagenes.to_csv(csv_imagenes, index=False)
+            # Cortar antes de agregar la imagen: sus detecciones van juntas en un batch
+            motivo = batcher.motivo_corte(time.monotonic())
+            if motivo:
+                cerrar_batch(motivo)
             
-            # Enviar a Hive
-            if self.etl.conectar_hive():
-                if self.etl.crear_base_datos_y_tabla():
-                    registros = self.etl.cargar_csv_a_hive(csv_imagenes)
-                    print(f"   ✅ {registros} registros enviados a Hive")
-                self.etl.cerrar_conexion()
+            lote = self._extraer_lote(boxes, frame, archivo, 'image', 0, 0.0)
+            batcher.agregar_lote(lote, time.monotonic())
             
-            # Limpiar archivo temporal
-            if os.path.exists(csv_imagenes):
-                os.remove(csv_imagenes)
+            print(f"   ✅ {filas_lote(lote)} objetos detectados")
+            imagenes_batch[imagen_path] = filas_lote(lote)
+            imagenes_procesadas += 1
+        
+        # Decodificación en paralelo e inferencia por batches; extracción y envío aquí
+        self.pipeline_imagenes.ejecutar(rutas, consumir)
+        cerrar_batch('final')
+        self.enviador.cerrar()
+        self.etl.cerrar_conexion()
+        batcher.metricas.imprimir('Batches de imágenes')
         
         print(f"✅ Imágenes procesadas: {imagenes_procesadas}")
         return imagenes_procesadas
+    
+    def procesar_camaras(self, camaras=None, duracion_segundos=None):
+        """Ingesta continua de cámaras en vivo hacia Hive (hasta Ctrl+C o duracion_segundos)
+
+        Cada cámara tiene su batcher (filas, bytes o segundos de la cámara).
+        El source_id lleva el inicio de la sesión: los frame_number vuelven a
+        0 al reiniciar el servicio y los ids de detección no deben repetirse.
+        """
+        if camaras is None:
+            camaras = configuracion.CAMARAS
+        camaras = parsear_camaras(camaras, configuracion.CAMARAS_MUESTRAS_POR_SEGUNDO)
+        if not camaras:
+            print("❌ No hay cámaras configuradas (CAMARAS)")
+            return 0
+        
+        sesion = datetime.now().strftime('%Y%m%dT%H%M%S')
+        lectores = [
+            LectorCamara(
+                nombre,
+                lambda fuente=fuente: abrir_fuente(
+                    fuente, configuracion.CAMARAS_FPS, configuracion.CAMARAS_ANCHO,
+                    configuracion.CAMARAS_ALTO, configuracion.CAMARAS_GSTREAMER
+                ),
+                muestras_por_segundo=tasa,
+                tam_cola=configuracion.CAMARAS_TAMANO_COLA,
+                reconectar_segundos=configuracion.CAMARAS_RECONECTAR_SEGUNDOS,
+                pool=PoolFrames() if configuracion.PIPELINE_REUTILIZAR_FRAMES else None
+            )
+            for nombre, fuente, tasa in camaras
+        ]
+        
+        # El predictor de ultralytics no es thread-safe: un modelo por hilo de inferencia
+        inferidores = [self._inferir_frames]
+        for _ in range(1, max(1, configuracion.CAMARAS_HILOS_INFERENCIA)):
+            modelo = YOLO(configuracion.YOLO_MODEL)
+            inferidores.append(lambda frames, modelo=modelo: modelo(frames, **self.opciones_inferencia))
+        servicio = ServicioCamaras(
+            lectores, inferidores,
+            tamano_batch=configuracion.YOLO_BATCH_INFERENCIA,
+            tam_cola=configuracion.PIPELINE_TAMANO_COLA
+        )
+        
+        batchers = {
+            nombre: BatcherAdaptativo(
+                max_filas=configuracion.BATCH_TAMAÑO_MAXIMO,
+                max_bytes=configuracion.BATCH_MAXIMO_MB * 1024 ** 2,
+                max_segundos=configuracion.BATCH_DURACION_SEGUNDOS
+            )
+            for nombre, _, _ in camaras
+        }
+        batches = dict.fromkeys(batchers, 0)
+        ultimos = dict.fromkeys(batchers, 0.0)
+        total_detecciones = 0
+        
+        def cerrar_batch(nombre, motivo):
+            batcher = batchers[nombre]
+            if not len(batcher):
+                return
+            batches[nombre] += 1
+            df_batch = batcher.tomar(ultimos[nombre], motivo)
+            print(f"📤 Enviando batch {batches[nombre]} de la cámara {nombre}: {len(df_batch)} detecciones")
+            if configuracion.EXPORTAR_CSV_BATCHES:
+                self._exportar_csv(df_batch, f"batch_{nombre}_{sesion}_{batches[nombre]:03d}.csv")
+            self.enviador.enviar(df_batch, f"Batch {batches[nombre]} de la cámara {nombre}")
+        
+        def consumir(nombre, frame, frame_number, timestamp_sec, result):
+            """Atributos de una muestra y corte del batch de su cámara"""
+            nonlocal total_detecciones
+            motivo = batchers[nombre].motivo_corte(timestamp_sec)
+            if motivo:
+                cerrar_batch(nombre, motivo)
+            ultimos[nombre] = timestamp_sec
+            
+            lote = self._extraer_lote(
+                result.boxes, frame, f"{nombre}_{sesion}", 'camera', frame_number, timestamp_sec
+            )
+            if filas_lote(lote):
+                batchers[nombre].agregar_lote(lote, timestamp_sec)
+                total_detecciones += filas_lote(lote)
+        
+        print(f"📹 {len(camaras)} cámaras, {len(inferidores)} hilos de inferencia: "
+              + ", ".join(f"{nombre} ({tasa:g}/s)" for nombre, _, tasa in camaras))
+        temporizador = None
+        if duracion_segundos:
+            temporizador = threading.Timer(duracion_segundos, servicio.detener)
+            temporizador.daemon = True
+            temporizador.start()
+        try:
+            servicio.ejecutar(consumir)
+        except KeyboardInterrupt:
+            print("\n⏹️  Deteniendo cámaras...")
+        finally:
+            if temporizador is not None:
+                temporizador.cancel()
+            # Lo acumulado de cada cámara llega a Hive antes de cerrar
+            for nombre in batchers:
+                cerrar_batch(nombre, 'final')
+            self.enviador.cerrar()
+            self.etl.cerrar_conexion()
+        
+        metricas = MetricasBatches()
+        for nombre, estadisticas in servicio.estadisticas().items():
+            error = f"  ❌ {estadisticas['error']}" if estadisticas['error'] else ""
+            print(f"   📊 {nombre}: {estadisticas['leidos']} frames leídos, "
+                  f"{estadisticas['procesados']} inferidos, {estadisticas['descartados']} descartados "
+                  f"por atraso, {batches[nombre]} batches{error}")
+            metricas.extender(batchers[nombre].metricas.batches)
+        metricas.imprimir('Batches de cámaras')
+        
+        print(f"✅ Detecciones de cámaras: {total_detecciones}")
+        return total_detecciones
 
 if __name__ == "__main__":
     print("🎬 SISTEMA DE CLASIFICACIÓN CON BATCHES DE 10 SEGUNDOS")
@@ -2,13 +2,13 @@
 -- ANÁLISIS TEMPORAL
 -- ===================================
 
--- 1. Detecciones por fecha de ingesta
+-- 1. Detecciones por fecha de ingesta (ingestion_day es columna de partición)
 SELECT 
-    DATE(ingestion_date) as fecha,
+    ingestion_day as fecha,
     COUNT(*) as detecciones_del_dia,
     COUNT(DISTINCT source_id) as archivos_procesados
 FROM yolo_project.yolo_objects 
-GROUP BY DATE(ingestion_date) 
+GROUP BY ingestion_day 
 ORDER BY fecha DESC;
 
 -- 2. Detecciones por hora del día
@@ -31,12 +31,13 @@ WHERE source_type = 'video'
 GROUP BY source_id 
 ORDER BY total_detecciones DESC;
 
--- 4. Últimas detecciones procesadas
+-- 4. Últimas detecciones procesadas (solo lee las particiones de los últimos 7 días)
 SELECT 
     source_id,
     class_name,
     confidence,
     ingestion_date
 FROM yolo_project.yolo_objects 
+WHERE ingestion_day >= DATE_SUB(CURRENT_DATE, 7)
 ORDER BY ingestion_date DESC 
 LIMIT 20;
\ No newline at end of file
@@ -4,18 +4,17 @@ Ejecutor de queries SQL para análisis de datos YOLO
 """
 from pyhive import hive
 import os
+import sys
 import glob
 
+# Se ejecuta como script desde la raíz (python sql/ejecutar_queries.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import configuracion
+
 def conectar_hive():
     """Conectar a Hive usando configuración que funciona"""
     try:
-        conn = hive.Connection(
-            host='localhost',
-            port=10000,
-            database='yolo_project',
-            username='jose_dev',
-            auth='NONE'
-        )
+        conn = hive.Connection(**configuracion.HIVE_CONFIG)
         print("✅ Conectado a Hive")
         return conn
     except Exception as e:
@@ -1,7 +1,12 @@
 import pandas as pd
 from pyhive import hive
-import math
 from datetime import datetime
+import os
+import sys
+
+# Se ejecuta como script desde la raíz (python src/sistema_batch_etl.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import configuracion
 
 class SistemaBatchETL:
     """Sistema ETL para cargar datos YOLO a Hive"""
@@ -9,13 +14,10 @@ class SistemaBatchETL:
     def __init__(self):
         self.conn = None
         self.cursor = None
-        self.hive_config = {
-            'host': '172.25.54.102',  # IP de WSL
-            'port': 10000,
-            'database': 'yolo_project',
-            'username': 'jose_dev',
-            'auth': 'NOSASL'
-        }
+        # En WSL: YOLOHIVE_HIVE_HOST=<IP de WSL> y, si aplica, YOLOHIVE_HIVE_AUTH=NOSASL
+        self.hive_config = dict(configuracion.HIVE_CONFIG)
+        self.database = configuracion.HIVE_DATABASE
+        self.tabla = configuracion.HIVE_TABLA
     
     def str_literal(self, value):
         """Convierte valor a string literal SQL seguro"""
@@ -39,12 +41,12 @@ class SistemaBatchETL:
         """Crea la base de datos y tabla si no existen"""
         try:
             # Crear base de datos
-            self.cursor.execute("CREATE DATABASE IF NOT EXISTS yolo_project")
-            self.cursor.execute("USE yolo_project")
+            self.cursor.execute(f"CREATE DATABASE IF NOT EXISTS {self.database}")
+            self.cursor.execute(f"USE {self.database}")
             
             # Crear tabla
-            create_table_sql = """
-                CREATE TABLE IF NOT EXISTS yolo_objects (
+            create_table_sql = f"""
+                CREATE TABLE IF NOT EXISTS {self.tabla} (
                     imagen STRING,
                     clase STRING,
                     confianza DOUBLE,
@@ -57,7 +59,7 @@ class SistemaBatchETL:
             """
             
             self.cursor.execute(create_table_sql)
-            print("✅ Tabla yolo_objects verificada/creada")
+            print(f"✅ Tabla {self.tabla} verificada/creada")
             return True
             
         except Exception as e:
@@ -67,32 +69,23 @@ class SistemaBatchETL:
     def cargar_csv_a_hive(self, archivo_csv, batch_size=1000, debug=False):
         """Carga datos del CSV a Hive usando batch processing optimizado"""
         try:
-            # Leer CSV
-            df = pd.read_csv(archivo_csv)
-            print(f"📊 Datos leídos: {len(df)} registros")
-            
-            # Limpiar datos
-            clean_data = df.dropna()
-            print(f"� Datos limpios: {len(clean_data)} registros")
-            
-            if len(clean_data) == 0:
-                print("❌ No hay datos válidos para cargar")
-                return 0
-            
-            # Configurar batch processing
-            n = len(clean_data)
-            total_batches = math.ceil(n / batch_size)
-            table_name = "yolo_objects"
+            table_name = self.tabla
             cols = "(imagen, clase, confianza, x, y, ancho, alto, timestamp_proc)"
             
-            print(f"📤 Cargando {n} registros en {total_batches} lotes de {batch_size}...")
+            print(f"📤 Cargando {archivo_csv} en lotes de {batch_size}...")
             
+            registros_leidos = 0
             registros_cargados = 0
             
-            # Procesar en lotes
-            for i, start in enumerate(range(0, n, batch_size), start=1):
-                chunk = clean_data.iloc[start:start+batch_size]
-                print(f"📦 Enviando paquete {i} de {total_batches}... ({len(chunk)} registros)")
+            # Leer el CSV por lotes: nunca se tiene el archivo completo en memoria
+            for i, chunk in enumerate(pd.read_csv(archivo_csv, chunksize=batch_size), start=1):
+                registros_leidos += len(chunk)
+                
+                # Limpiar datos
+                chunk = chunk.dropna()
+                if len(chunk) == 0:
+                    continue
+                print(f"📦 Enviando paquete {i}... ({len(chunk)} registros)")
                 
                 values = []
                 for _, row in chunk.iterrows():
@@ -124,7 +117,11 @@ class SistemaBatchETL:
                     # Continuar con el siguiente paquete
                     continue
             
-            print(f"🎉 Carga completada: {registros_cargados}/{n} registros cargados")
+            if registros_cargados == 0:
+                print("❌ No hay datos válidos para cargar")
+                return 0
+            
+            print(f"🎉 Carga completada: {registros_cargados}/{registros_leidos} registros cargados")
             return registros_cargados
             
         except Exception as e:
@@ -135,14 +132,14 @@ class SistemaBatchETL:
         """Muestra estadísticas de la tabla"""
         try:
             # Total de registros
-            self.cursor.execute("SELECT COUNT(*) FROM yolo_objects")
+            self.cursor.execute(f"SELECT COUNT(*) FROM {self.tabla}")
             total = self.cursor.fetchone()[0]
             print(f"📊 Total registros en Hive: {total}")
             
             # Top 5 clases
-            self.cursor.execute("""
+            self.cursor.execute(f"""
                 SELECT clase, COUNT(*) as cantidad 
-                FROM yolo_objects 
+                FROM {self.tabla} 
                 GROUP BY clase 
                 ORDER BY cantidad DESC 
                 LIMIT 5
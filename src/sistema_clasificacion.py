@@ -1,83 +1,122 @@
-import pandas as pd
 import cv2
 import os
 import csv
 from datetime import datetime
 from ultralytics import YOLO
-import numpy as np
+import sys
+
+# Se ejecuta como script desde la raíz (python src/sistema_clasificacion.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import configuracion
+from sumidero_detecciones import BufferFilas, SumideroDetecciones
+from manifiesto import crear_manifiesto
+from inferencia_yolo import opciones_inferencia
 
 class SistemaClasificacion:
     """Sistema unificado para clasificar imágenes y videos con YOLO"""
     
-    def __init__(self):
+    def __init__(self, archivo_salida='detecciones_yolo.csv'):
         """Inicializar el modelo YOLO"""
-        self.model = YOLO('yolov8n.pt')
-        self.detecciones = []
+        self.model = YOLO(configuracion.YOLO_MODEL)
+        # CONFIDENCE_THRESHOLD y demás filtros se aplican dentro de YOLO
+        self.opciones_inferencia = opciones_inferencia(self.model.names)
+        # Detecciones volcadas al CSV por chunks a medida que se producen
+        self.detecciones = SumideroDetecciones(
+            archivo_salida,
+            filas_por_chunk=configuracion.SALIDA_FILAS_POR_CHUNK,
+            memoria_max_mb=configuracion.SALIDA_MEMORIA_MAX_MB,
+            buffer=BufferFilas()
+        )
+        # Entradas nuevas procesadas en esta corrida → filas generadas.
+        # Se registran en el manifiesto recién cuando su carga a Hive terminó
+        self.manifiesto = crear_manifiesto()
+        self.procesados = {}
         
-    def procesar_imagenes(self, carpeta='imagenes_entrada'):
-        """Procesa todas las imágenes en la carpeta"""
+    def procesar_imagenes(self, carpeta='imagenes_entrada', forzar=False):
+        """Procesa las imágenes nuevas o modificadas de la carpeta"""
         if not os.path.exists(carpeta):
             print(f"❌ Carpeta {carpeta} no existe")
             return 0
             
         imagenes = [f for f in os.listdir(carpeta) 
                    if f.lower().endswith(('.png', '.jpg', '.jpeg'))]
+        imagenes = self._filtrar_pendientes(carpeta, imagenes, forzar)
         
         print(f"📸 Procesando {len(imagenes)} imágenes...")
         
         for img_file in imagenes:
             img_path = os.path.join(carpeta, img_file)
+            filas_antes = len(self.detecciones)
             self._procesar_imagen(img_path, img_file)
+            self.procesados[img_path] = len(self.detecciones) - filas_antes
             
         return len(imagenes)
     
-    def procesar_videos(self, carpeta='videos_entrada'):
-        """Procesa todos los videos en la carpeta"""
+    def procesar_videos(self, carpeta='videos_entrada', forzar=False):
+        """Procesa los videos nuevos o modificados de la carpeta"""
         if not os.path.exists(carpeta):
             print(f"❌ Carpeta {carpeta} no existe")
             return 0
             
         videos = [f for f in os.listdir(carpeta) 
                 if f.lower().endswith(('.mp4', '.avi', '.mov'))]
+        videos = self._filtrar_pendientes(carpeta, videos, forzar)
         
         print(f"🎥 Procesando {len(videos)} videos...")
         
         for vid_file in videos:
             vid_path = os.path.join(carpeta, vid_file)
+            filas_antes = len(self.detecciones)
             self._procesar_video(vid_path, vid_file)
+            self.procesados[vid_path] = len(self.detecciones) - filas_antes
             
         return len(videos)
     
+    def _filtrar_pendientes(self, carpeta, archivos, forzar):
+        """Deja solo los archivos que no figuran en el manifiesto (o todos con forzar)"""
+        pendientes = [
+            f for f in archivos
+            if forzar or self.manifiesto.pendiente(os.path.join(carpeta, f))
+        ]
+        if len(pendientes) < len(archivos):
+            print(f"⏭️  {len(archivos) - len(pendientes)} archivos sin cambios desde la última corrida")
+        return pendientes
+    
+    def registrar_procesados(self):
+        """Marca en el manifiesto las entradas de esta corrida (tras cargarlas)"""
+        for ruta, filas in self.procesados.items():
+            self.manifiesto.registrar(ruta, filas)
+        return len(self.procesados)
+    
     def _procesar_imagen(self, ruta_imagen, nombre_archivo):
         """Procesa una imagen individual"""
         imagen = cv2.imread(ruta_imagen)
         if imagen is None:
             return
             
-        results = self.model(imagen)
+        results = self.model(imagen, **self.opciones_inferencia)
         
         for result in results:
             boxes = result.boxes
             if boxes is not None:
                 for box in boxes:
                     conf = float(box.conf[0])
-                    if conf > 0.5:  # Solo detecciones con alta confianza
-                        cls_id = int(box.cls[0])
-                        cls_name = self.model.names[cls_id]
-                        x1, y1, x2, y2 = box.xyxy[0].tolist()
-                        
-                        deteccion = {
-                            'imagen': nombre_archivo,
-                            'clase': cls_name,
-                            'confianza': conf,
-                            'x': int(x1),
-                            'y': int(y1),
-                            'ancho': int(x2 - x1),
-                            'alto': int(y2 - y1),
-                            'timestamp_proc': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        }
-                        
-                        self.detecciones.append(deteccion)
+                    cls_id = int(box.cls[0])
+                    cls_name = self.model.names[cls_id]
+                    x1, y1, x2, y2 = box.xyxy[0].tolist()
+                    
+                    deteccion = {
+                        'imagen': nombre_archivo,
+                        'clase': cls_name,
+                        'confianza': conf,
+                        'x': int(x1),
+                        'y': int(y1),
+                        'ancho': int(x2 - x1),
+                        'alto': int(y2 - y1),
+                        'timestamp_proc': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                    }
+                    
+                    self.detecciones.agregar(deteccion)
     
     def _procesar_video(self, ruta_video, nombre_archivo):
         """Procesa un video frame por frame"""
@@ -86,9 +125,11 @@ class SistemaClasificacion:
             return
             
         frame_count = 0
+        frame = None
         
         while True:
-            ret, frame = cap.read()
+            # Decodifica sobre el mismo array: sin un frame nuevo por lectura
+            ret, frame = cap.read(image=frame)
             if not ret:
                 break
                 
@@ -96,42 +137,40 @@ class SistemaClasificacion:
             
             # Procesar cada 30 frames para optimizar
             if frame_count % 30 == 0:
-                results = self.model(frame)
+                results = self.model(frame, **self.opciones_inferencia)
                 
                 for result in results:
                     boxes = result.boxes
                     if boxes is not None:
                         for box in boxes:
                             conf = float(box.conf[0])
-                            if conf > 0.5:
-                                cls_id = int(box.cls[0])
-                                cls_name = self.model.names[cls_id]
-                                x1, y1, x2, y2 = box.xyxy[0].tolist()
-                                
-                                deteccion = {
-                                    'imagen': f"{nombre_archivo}_frame_{frame_count}",
-                                    'clase': cls_name,
-                                    'confianza': conf,
-                                    'x': int(x1),
-                                    'y': int(y1),
-                                    'ancho': int(x2 - x1),
-                                    'alto': int(y2 - y1),
-                                    'timestamp_proc': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                                }
-                                
-                                self.detecciones.append(deteccion)
+                            cls_id = int(box.cls[0])
+                            cls_name = self.model.names[cls_id]
+                            x1, y1, x2, y2 = box.xyxy[0].tolist()
+                            
+                            deteccion = {
+                                'imagen': f"{nombre_archivo}_frame_{frame_count}",
+                                'clase': cls_name,
+                                'confianza': conf,
+                                'x': int(x1),
+                                'y': int(y1),
+                                'ancho': int(x2 - x1),
+                                'alto': int(y2 - y1),
+                                'timestamp_proc': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                            }
+                            
+                            self.detecciones.agregar(deteccion)
         
         cap.release()
     
-    def guardar_csv(self, archivo='detecciones_yolo.csv'):
-        """Guarda todas las detecciones en CSV"""
-        if not self.detecciones:
+    def guardar_csv(self, archivo=None):
+        """Escribe el último chunk y cierra el CSV"""
+        filas = self.detecciones.cerrar(archivo)
+        if not filas:
             print("❌ No hay detecciones para guardar")
             return False
             
-        df = pd.DataFrame(self.detecciones)
-        df.to_csv(archivo, index=False)
-        print(f"💾 Guardadas {len(self.detecciones)} detecciones en {archivo}")
+        print(f"💾 Guardadas {filas} detecciones en {self.detecciones.ruta}")
         return True
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Sumidero de detecciones con memoria acotada
+Escribe las detecciones al archivo de staging por chunks (CSV o row groups de
+Parquet) a medida que se producen, en lugar de acumularlas hasta el final
+"""
+import os
+import sys
+
+import pandas as pd
+
+from buffer_detecciones import BufferDetecciones
+from esquema_detecciones import COLUMNAS_YOLO_OBJECTS, esquema_arrow
+
+
+class BufferFilas:
+    """Buffer mínimo de dicts para esquemas distintos a yolo_objects"""
+
+    def __init__(self):
+        self.filas = []
+        self._bytes_por_fila = None
+
+    def __len__(self):
+        return len(self.filas)
+
+    @property
+    def bytes_filas(self):
+        """Estimación a partir del tamaño de la primera fila"""
+        return len(self.filas) * (self._bytes_por_fila or 0)
+
+    def agregar(self, deteccion):
+        if self._bytes_por_fila is None:
+            self._bytes_por_fila = sys.getsizeof(deteccion) + sum(
+                sys.getsizeof(valor) for valor in deteccion.values()
+            )
+        self.filas.append(deteccion)
+
+    def vaciar(self):
+        self.filas = []
+
+    def a_dataframe(self):
+        return pd.DataFrame(self.filas)
+
+
+class SumideroDetecciones:
+    """Acumula detecciones en un buffer y lo vuelca al archivo al llenarse"""
+
+    def __init__(self, ruta, filas_por_chunk=50000, memoria_max_mb=256, buffer=None, formato=None):
+        self.ruta = ruta
+        self.formato = formato or ('parquet' if ruta.endswith('.parquet') else 'csv')
+        self.filas_por_chunk = filas_por_chunk
+        self.memoria_max_bytes = memoria_max_mb * 1024 * 1024
+        self.buffer = buffer if buffer is not None else BufferDetecciones()
+        self.filas_escritas = 0
+        self.chunks_escritos = 0
+        self._writer_parquet = None
+        self._esquema_parquet = None
+
+    def __len__(self):
+        """Detecciones recibidas (escritas + pendientes)"""
+        return self.filas_escritas + len(self.buffer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def agregar(self, deteccion):
+        """Agrega una detección (dict) y vuelca si se alcanzó algún límite"""
+        self.buffer.agregar(deteccion)
+        self._volcar_si_lleno()
+
+    def agregar_lote(self, lote):
+        """Agrega un lote columnar (solo con BufferDetecciones)"""
+        self.buffer.agregar_lote(lote)
+        self._volcar_si_lleno()
+
+    def _volcar_si_lleno(self):
+        if len(self.buffer) >= self.filas_por_chunk or self.buffer.bytes_filas >= self.memoria_max_bytes:
+            self.volcar()
+
+    def volcar(self):
+        """Escribe las filas pendientes como un chunk nuevo del archivo"""
+        if not len(self.buffer):
+            return 0
+        df = self.buffer.a_dataframe()
+        if self.formato == 'parquet':
+            self._escribir_row_group(df)
+        else:
+            # Primer chunk crea el archivo con cabecera; los siguientes agregan
+            primero = self.chunks_escritos == 0
+            df.to_csv(self.ruta, mode='w' if primero else 'a', header=primero, index=False)
+        filas = len(df)
+        self.filas_escritas += filas
+        self.chunks_escritos += 1
+        self.buffer.vaciar()
+        return filas
+
+    def _escribir_row_group(self, df):
+        """Agrega un row group al Parquet, con el esquema fijado por el primer chunk"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._writer_parquet is None:
+            if list(df.columns) == [nombre for nombre, _ in COLUMNAS_YOLO_OBJECTS]:
+                self._esquema_parquet = esquema_arrow(COLUMNAS_YOLO_OBJECTS)
+            else:
+                self._esquema_parquet = pa.Table.from_pandas(df, preserve_index=False).schema
+            self._writer_parquet = pq.ParquetWriter(self.ruta, self._esquema_parquet, compression='snappy')
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        self._writer_parquet.write_table(tabla.cast(self._esquema_parquet))
+
+    def cerrar(self, ruta_final=None):
+        """Vuelca lo pendiente, cierra el archivo y opcionalmente lo mueve; devuelve filas escritas"""
+        self.volcar()
+        if self._writer_parquet is not None:
+            self._writer_parquet.close()
+            self._writer_parquet = None
+        if ruta_final and ruta_final != self.ruta and self.chunks_escritos:
+            os.replace(self.ruta, ruta_final)
+            self.ruta = ruta_final
+        return self.filas_escritas
@@ -0,0 +1,74 @@
+"""Datos de prueba compartidos por los tests"""
+import pyarrow.parquet as pq
+
+
+def deteccion(i):
+    """Fila de yolo_objects con valores fijos; varían frame, video, timestamp e id"""
+    return {
+        'source_type': 'video', 'source_id': f"v{i % 2}.mp4", 'frame_number': i,
+        'class_id': 0, 'class_name': 'person', 'confidence': 0.9,
+        'x_min': 1, 'y_min': 2, 'x_max': 3, 'y_max': 4, 'width': 2, 'height': 2,
+        'area_pixels': 4, 'frame_width': 10, 'frame_height': 10, 'bbox_area_ratio': 0.04,
+        'center_x': 2.0, 'center_y': 3.0, 'center_x_norm': 0.2, 'center_y_norm': 0.3,
+        'position_region': 'top_left', 'dominant_color_name': 'red',
+        'dom_r': 200, 'dom_g': 10, 'dom_b': 10, 'timestamp_sec': i / 2,
+        'ingestion_date': '2024-01-01T00:00:00.000001',
+        'detection_id': f"{i:08x}-0000-0000-0000-000000000000",
+    }
+
+
+class HiveFalso:
+    """Sustituto local de pyhive.hive: cuenta conexiones y sentencias"""
+
+    def __init__(self):
+        self.conexiones = 0
+        self.sentencias = []
+        self.caida = False
+        self.falla_load = False
+        self.loads_antes_de_fallar = None  # N: los LOAD DATA fallan a partir del N+1
+        self.inserts_antes_de_fallar = None  # N: los INSERT fallan a partir del N+1
+        self.archivos_cargados = []
+
+    def Connection(self, **kwargs):
+        self.conexiones += 1
+        self.caida = False
+        return ConexionFalsa(self, kwargs)
+
+    def contar(self, prefijo):
+        return sum(1 for sql in self.sentencias if sql.strip().upper().startswith(prefijo))
+
+
+class ConexionFalsa:
+    def __init__(self, hive, kwargs):
+        self.hive = hive
+        self.kwargs = kwargs
+
+    def cursor(self):
+        return CursorFalso(self.hive)
+
+    def close(self):
+        pass
+
+
+class CursorFalso:
+    def __init__(self, hive):
+        self.hive = hive
+
+    def execute(self, sql):
+        if self.hive.caida:
+            raise ConnectionError('TSocket read 0 bytes')
+        if sql.startswith('LOAD DATA'):
+            if self.hive.falla_load or len(self.hive.archivos_cargados) == self.hive.loads_antes_de_fallar:
+                raise RuntimeError('LOAD DATA no permitido')
+            ruta = sql.split("'")[1]
+            if ruta.endswith('.parquet'):
+                self.hive.archivos_cargados.append(pq.read_table(ruta))
+            else:
+                with open(ruta) as f:
+                    self.hive.archivos_cargados.append(f.read())
+        if sql.startswith('INSERT') and self.hive.contar('INSERT') == self.hive.inserts_antes_de_fallar:
+            raise RuntimeError('Error de ejecución en INSERT')
+        self.hive.sentencias.append(sql)
+
+    def fetchall(self):
+        return [(1,)]
@@ -0,0 +1,75 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from batcher_adaptativo import BatcherAdaptativo
+from esquema_detecciones import NOMBRES_COLUMNAS
+from datos_prueba import deteccion
+
+
+def lote(inicio, filas):
+    """Lote columnar con las detecciones inicio..inicio+filas-1"""
+    detecciones = [deteccion(i) for i in range(inicio, inicio + filas)]
+    return {columna: np.array([d[columna] for d in detecciones]) for columna in NOMBRES_COLUMNAS}
+
+
+class TestBatcherAdaptativo(unittest.TestCase):
+    def cortes(self, batcher, frames):
+        """Simula el bucle de video: (segundo, filas) por frame → filas por batch"""
+        tamanos = []
+        siguiente = 0
+        for segundo, filas in frames:
+            motivo = batcher.motivo_corte(segundo)
+            if motivo:
+                tamanos.append((len(batcher.tomar(segundo, motivo)), motivo))
+            batcher.agregar_lote(lote(siguiente, filas), segundo)
+            siguiente += filas
+        tamanos.append((len(batcher.tomar(segundo)), 'final'))
+        return tamanos
+
+    def test_corte_por_tiempo_desde_la_primera_deteccion(self):
+        batcher = BatcherAdaptativo(max_filas=0, max_bytes=0, max_segundos=10)
+        frames = [(0, 0), (1, 0), (3, 1)] + [(s, 1) for s in range(4, 20)]
+        self.assertEqual(self.cortes(batcher, frames), [(10, 'tiempo'), (7, 'final')])
+
+    def test_corte_por_filas_sin_partir_frames(self):
+        batcher = BatcherAdaptativo(max_filas=5, max_bytes=0, max_segundos=0)
+        self.assertEqual(
+            self.cortes(batcher, [(s, 3) for s in range(5)]),
+            [(6, 'filas'), (6, 'filas'), (3, 'final')]
+        )
+
+    def test_corte_por_bytes(self):
+        batcher = BatcherAdaptativo(max_filas=0, max_bytes=1, max_segundos=0)
+        tamanos = self.cortes(batcher, [(s, 2) for s in range(3)])
+        self.assertEqual([motivo for _, motivo in tamanos], ['bytes', 'bytes', 'final'])
+
+    def test_corte_forzado_al_reanudar(self):
+        batcher = BatcherAdaptativo(max_filas=2, max_bytes=0, max_segundos=0)
+        batcher.forzar_corte(4)
+        tamanos = self.cortes(batcher, [(s, 1) for s in range(7)])
+        self.assertEqual(tamanos, [(4, 'reanudacion'), (2, 'filas'), (1, 'final')])
+
+    def test_el_batch_sobrevive_al_buffer(self):
+        batcher = BatcherAdaptativo()
+        batcher.agregar_lote(lote(0, 3), 0)
+        df = batcher.tomar(1)
+        batcher.agregar_lote(lote(100, 3), 2)
+        self.assertEqual(df['frame_number'].tolist(), [0, 1, 2])
+
+    def test_metricas(self):
+        batcher = BatcherAdaptativo(max_filas=5, max_bytes=0, max_segundos=0)
+        self.cortes(batcher, [(s, 3) for s in range(5)])
+        resumen = batcher.metricas.resumen()
+        self.assertEqual(resumen['batches'], 3)
+        self.assertEqual(resumen['filas'], 15)
+        self.assertEqual((resumen['filas_min'], resumen['filas_max']), (3, 6))
+        self.assertEqual(resumen['motivos'], {'filas': 2, 'final': 1})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from buffer_detecciones import BufferDetecciones
+from esquema_detecciones import NOMBRES_COLUMNAS
+from extraccion_vectorizada import extraer_atributos_lote
+from datos_prueba import deteccion
+
+
+class TestBufferDetecciones(unittest.TestCase):
+    def test_filas_crecen_y_coinciden_con_list_de_dicts(self):
+        buffer = BufferDetecciones(capacidad=2)
+        filas = [deteccion(i) for i in range(10)]
+        for fila in filas:
+            buffer.agregar(fila)
+
+        self.assertEqual(len(buffer), 10)
+        self.assertGreaterEqual(buffer.capacidad, 10)
+        df = buffer.a_dataframe()
+        self.assertEqual(list(df.columns), NOMBRES_COLUMNAS)
+        esperado = pd.DataFrame(filas)
+        for columna in NOMBRES_COLUMNAS:
+            self.assertEqual(df[columna].astype(str).tolist(), esperado[columna].astype(str).tolist())
+        self.assertEqual(str(df['frame_number'].dtype), 'int32')
+        self.assertEqual(str(df['class_name'].dtype), 'category')
+
+    def test_lotes_columnares_y_arrow(self):
+        frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        lote = extraer_atributos_lote(
+            np.array([[0, 0, 10, 10], [50, 50, 90, 90]], dtype=float), np.array([0.5, 0.7]),
+            np.array([0, 1]), frame, {0: 'person', 1: 'car'}, 'img.jpg', 'image'
+        )
+        buffer = BufferDetecciones()
+        buffer.agregar_lote(lote)
+        buffer.agregar_lote(lote)
+
+        tabla = buffer.a_arrow()
+        self.assertEqual(tabla.num_rows, 4)
+        self.assertEqual(tabla.column('class_name').to_pylist(), ['person', 'car'] * 2)
+        self.assertEqual(str(tabla.schema.field('source_id').type.value_type), 'string')
+        self.assertEqual(tabla.column('detection_id').to_pylist()[:2], list(lote['detection_id']))
+
+    def test_vaciar_reutiliza_la_memoria(self):
+        buffer = BufferDetecciones(capacidad=4)
+        for i in range(3):
+            buffer.agregar(deteccion(i))
+        reservados = buffer.nbytes
+        buffer.vaciar()
+        self.assertEqual(len(buffer), 0)
+        buffer.agregar(deteccion(7))
+        self.assertEqual(buffer.nbytes, reservados)
+        self.assertEqual(buffer.a_dataframe()['source_id'].tolist(), ['v1.mp4'])
+
+
+if __name__ == '__main__':
+    unittest.main()
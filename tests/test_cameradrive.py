@@ -0,0 +1,141 @@
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from codigobase.cameradrive import FrameRingBuffer, streamingmultiplescamaras
+from pool_frames import PoolFrames
+
+
+class TestFrameRingBuffer(unittest.TestCase):
+    def test_read_next_en_orden(self):
+        buffer = FrameRingBuffer(capacity=4)
+        for i in range(3):
+            buffer.put(f'f{i}', timestamp=float(i))
+
+        leidos = [buffer.read_next(0) for _ in range(3)]
+
+        self.assertEqual(leidos, [(0, 0.0, 'f0'), (1, 1.0, 'f1'), (2, 2.0, 'f2')])
+        self.assertIsNone(buffer.read_next(0))
+        self.assertEqual(buffer.stats(), {'written': 3, 'dropped': 0, 'duplicated': 0, 'pending': 0})
+
+    def test_sobrescritos_cuentan_como_descartados(self):
+        """El productor nunca espera: lo que se pisó antes de leerse se descarta y se cuenta"""
+        buffer = FrameRingBuffer(capacity=3)
+        for i in range(10):
+            buffer.put(i)
+
+        self.assertEqual(buffer.read_next(0)[0], 7)
+        self.assertEqual(buffer.frames_dropped, 7)
+        self.assertEqual([buffer.read_next(0)[2] for _ in range(2)], [8, 9])
+
+    def test_read_latest_descartados_y_duplicados(self):
+        buffer = FrameRingBuffer(capacity=8)
+        self.assertIsNone(buffer.read_latest())
+        for i in range(5):
+            buffer.put(i)
+
+        self.assertEqual(buffer.read_latest()[2], 4)
+        self.assertEqual(buffer.read_latest()[2], 4)
+        self.assertEqual((buffer.frames_dropped, buffer.frames_duplicated), (4, 1))
+        # peek no altera los contadores
+        self.assertEqual(buffer.peek()[2], 4)
+        self.assertEqual(buffer.frames_duplicated, 1)
+
+    def test_read_next_espera_y_close_despierta(self):
+        buffer = FrameRingBuffer()
+        threading.Timer(0.05, buffer.put, args=('nuevo',)).start()
+        self.assertEqual(buffer.read_next(timeout=5)[2], 'nuevo')
+
+        inicio = time.monotonic()
+        self.assertIsNone(buffer.read_next(timeout=0.05))
+        self.assertGreaterEqual(time.monotonic() - inicio, 0.04)
+
+        threading.Timer(0.05, buffer.close).start()
+        self.assertIsNone(buffer.read_next())
+
+
+class TestLecturaEnHilo(unittest.TestCase):
+    """La cámara 'RTSP' en modo windows abre cualquier ruta con cv2.VideoCapture"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'camara.avi')
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'MJPG'), 25, (64, 48))
+        for i in range(40):
+            writer.write(np.full((48, 64, 3), i * 5, dtype=np.uint8))
+        writer.release()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def abrir(self, **opciones):
+        return streamingmultiplescamaras(camera_type=1, location=self.video, windows=True, **opciones)
+
+    def test_read_next_entrega_todo_en_orden(self):
+        camara = self.abrir(threaded=True, buffer_size=64)
+        self.assertIsNotNone(camara.read())
+
+        secuencias = []
+        while True:
+            item = camara.read_next(timeout=5)
+            if item is None:
+                break
+            secuencias.append(item[0])
+        camara.release()
+
+        estadisticas = camara.getFrameStats()
+        self.assertEqual(estadisticas['written'], 40)
+        self.assertEqual(secuencias, sorted(secuencias))
+        # read() consumió uno; lo saltado se contó como descartado
+        self.assertEqual(1 + len(secuencias) + estadisticas['dropped'], 40)
+        # Fin del stream: el hilo termina en lugar de girar sobre una captura muerta
+        self.assertFalse(camara.isReady())
+        self.assertEqual(camara.hasError()[0][-1], 3)
+        self.assertIsNone(camara.read())
+
+    def test_frame_pool_recicla_lo_entregado_y_lo_descartado(self):
+        pool = PoolFrames()
+        camara = self.abrir(threaded=True, buffer_size=4, frame_pool=pool)
+
+        entregados = 0
+        while True:
+            item = camara.read_next(timeout=5)
+            if item is None:
+                break
+            entregados += 1
+            time.sleep(0.002)
+            camara.release_frame(item[2])
+        camara.release()
+
+        estadisticas = camara.getFrameStats()
+        self.assertEqual(entregados + estadisticas['dropped'], 40)
+        # Lo sobrescrito sin leer volvió al pool: nada queda en uso
+        self.assertEqual(pool.estadisticas()['en_uso'], 0)
+        self.assertLessEqual(pool.asignados, 4 + 2)
+        # Con pool read_latest no repite frames
+        self.assertEqual(estadisticas['duplicated'], 0)
+
+    def test_sin_hilo_misma_api(self):
+        camara = self.abrir()
+        self.assertIsNone(camara.cam_thread)
+        self.assertEqual([camara.read_next()[0] for _ in range(3)], [0, 1, 2])
+        self.assertEqual(camara.read_latest()[0], 3)
+        camara.release()
+
+    def test_enforce_fps_arranca_el_hilo(self):
+        camara = self.abrir(enforce_fps=True)
+        self.assertIsNotNone(camara.read_next(timeout=5))
+        camara.release()
+        self.assertIsNone(camara.cam_thread)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,221 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import configuracion
+import sistema_batch_etl
+import sistema_clasificacion_con_batches
+from checkpoint_videos import CheckpointsVideos
+from datos_prueba import ConexionFalsa, CursorFalso, HiveFalso
+
+
+class Caida(BaseException):
+    """Simula que el proceso muere (no la atrapa ningún except Exception)"""
+
+
+class CursorConConteo(CursorFalso):
+    """Responde SELECT detection_id ... IN (ids) con los ids realmente cargados"""
+
+    def execute(self, sql):
+        if sql.startswith('LOAD DATA'):
+            self.hive.intentos_load += 1
+            # El batch rechazado falla en LOAD y también en el fallback fila por fila
+            self.hive.rechazando = self.hive.intentos_load == self.hive.rechazar_load
+        if self.hive.rechazando and sql.startswith(('LOAD DATA', 'INSERT')):
+            raise RuntimeError('Hive rechazó la carga')
+        super().execute(sql)
+        if sql.startswith('LOAD DATA') and self.hive.caer_tras_load == len(self.hive.archivos_cargados):
+            raise Caida()
+        if sql.startswith('SELECT detection_id'):
+            ids = {i.strip(" '") for i in sql.split('IN (')[1].rstrip(')').split(',')}
+            cargados = {i for tabla in self.hive.archivos_cargados
+                        for i in tabla.column('detection_id').to_pylist()}
+            self.filas = [(i,) for i in ids & cargados]
+
+    def fetchall(self):
+        return getattr(self, 'filas', [(1,)])
+
+
+class HiveConConteo(HiveFalso):
+    caer_tras_load = None
+    rechazar_load = None  # número de LOAD DATA (1, 2, ...) cuyo batch no se carga
+    intentos_load = 0
+    rechazando = False
+
+    def Connection(self, **kwargs):
+        self.conexiones += 1
+        conexion = ConexionFalsa(self, kwargs)
+        conexion.cursor = lambda: CursorConConteo(self)
+        return conexion
+
+
+class BoxesFalsas:
+    """Una detección por frame con la interfaz de ultralytics Boxes"""
+
+    class _Tensor:
+        def __init__(self, valores):
+            self.valores = np.array(valores)
+
+        def cpu(self):
+            return self
+
+        def numpy(self):
+            return self.valores
+
+    def __init__(self):
+        self.xyxy = self._Tensor([[4.0, 4.0, 30.0, 30.0]])
+        self.conf = self._Tensor([0.9])
+        self.cls = self._Tensor([0])
+
+    def __len__(self):
+        return 1
+
+
+class YOLOFalso:
+    names = {0: 'person'}
+    fallar_desde = None  # número de frames inferidos tras el cual "se cae"
+
+    def __init__(self, pesos):
+        self.inferidos = 0
+
+    def __call__(self, frames, **opciones):
+        self.inferidos += len(frames)
+        if self.fallar_desde is not None and self.inferidos > self.fallar_desde:
+            raise RuntimeError('CUDA out of memory')
+        return [type('Resultado', (), {'boxes': BoxesFalsas()})() for _ in frames]
+
+
+class TestCheckpointsVideos(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'camara.avi')
+        writer = cv2.VideoWriter(self.video, cv2.VideoWriter_fourcc(*'MJPG'), 25, (64, 48))
+        for i in range(35 * 25):
+            writer.write(np.full((48, 64, 3), i % 256, dtype=np.uint8))
+        writer.release()
+
+        self.originales = (
+            sistema_clasificacion_con_batches.YOLO, sistema_batch_etl.hive,
+            configuracion.CHECKPOINTS_DIR, configuracion.YOLO_BATCH_INFERENCIA,
+            configuracion.BATCH_TAMAÑO_MAXIMO
+        )
+        self.hive = HiveConConteo()
+        sistema_clasificacion_con_batches.YOLO = YOLOFalso
+        sistema_batch_etl.hive = self.hive
+        sistema_batch_etl._ESQUEMAS_ASEGURADOS.clear()
+        configuracion.CHECKPOINTS_DIR = os.path.join(self.tmp.name, 'checkpoints')
+        configuracion.YOLO_BATCH_INFERENCIA = 1
+
+    def tearDown(self):
+        (sistema_clasificacion_con_batches.YOLO, sistema_batch_etl.hive,
+         configuracion.CHECKPOINTS_DIR, configuracion.YOLO_BATCH_INFERENCIA,
+         configuracion.BATCH_TAMAÑO_MAXIMO) = self.originales
+        YOLOFalso.fallar_desde = None
+        sistema_batch_etl._ESQUEMAS_ASEGURADOS.clear()
+        self.tmp.cleanup()
+
+    def crear_sistema(self):
+        sistema = sistema_clasificacion_con_batches.SistemaClasificacionBatches()
+        sistema.etl.staging_dir = os.path.join(self.tmp.name, 'staging')
+        return sistema
+
+    def ids_cargados(self):
+        return [i for tabla in self.hive.archivos_cargados for i in tabla.column('detection_id').to_pylist()]
+
+    def test_guardar_cargar_e_invalidar(self):
+        checkpoints = CheckpointsVideos(configuracion.CHECKPOINTS_DIR, 'yolov8n.pt')
+        self.assertIsNone(checkpoints.cargar(self.video))
+        checkpoints.guardar(self.video, 3, 30, lote_en_envio=4, filas_en_envio=10)
+        self.assertEqual(checkpoints.cargar(self.video)['batches_enviados'], 3)
+        self.assertIsNone(CheckpointsVideos(configuracion.CHECKPOINTS_DIR, 'yolov8s.pt').cargar(self.video))
+        os.utime(self.video, (1, 1))
+        self.assertIsNone(checkpoints.cargar(self.video))
+
+    def test_reanuda_tras_caida_en_la_inferencia(self):
+        # Se cae al inferir el frame del segundo 25: ventanas 1 y 2 ya enviadas
+        YOLOFalso.fallar_desde = 25
+        with self.assertRaises(RuntimeError):
+            self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+        self.assertEqual(len(self.ids_cargados()), 20)
+
+        YOLOFalso.fallar_desde = None
+        sistema = self.crear_sistema()
+        self.assertEqual(sistema.checkpoints.cargar(self.video)['segundos_enviados'], 20)
+        resumen = sistema._procesar_video_con_batches(self.video, 'camara.avi')
+
+        # Solo se recalculan los segundos 20-34 y no hay duplicados
+        self.assertEqual(resumen['detecciones'], 15)
+        self.assertEqual(len(self.ids_cargados()), 35)
+        self.assertEqual(len(set(self.ids_cargados())), 35)
+        self.assertIsNone(sistema.checkpoints.cargar(self.video))
+
+    def test_batch_cargado_antes_de_la_caida_no_se_duplica(self):
+        # El proceso muere justo después del LOAD del segundo batch
+        self.hive.caer_tras_load = 2
+        with self.assertRaises(Caida):
+            self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+        self.assertEqual(len(self.ids_cargados()), 20)
+
+        self.hive.caer_tras_load = None
+        sistema = self.crear_sistema()
+        self.assertEqual(sistema.checkpoints.cargar(self.video)['lote_en_envio'], 2)
+        sistema._procesar_video_con_batches(self.video, 'camara.avi')
+
+        self.assertEqual(len(self.ids_cargados()), 35)
+        self.assertEqual(len(set(self.ids_cargados())), 35)
+
+    def test_batch_cargado_a_medias_envia_solo_lo_que_falta(self):
+        self.hive.caer_tras_load = 2
+        with self.assertRaises(Caida):
+            self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+        # Del segundo batch solo llegaron 4 de sus 10 filas
+        self.hive.archivos_cargados[1] = self.hive.archivos_cargados[1].slice(0, 4)
+
+        self.hive.caer_tras_load = None
+        self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+
+        self.assertEqual(self.hive.archivos_cargados[2].num_rows, 6)
+        self.assertEqual(len(self.ids_cargados()), 35)
+        self.assertEqual(len(set(self.ids_cargados())), 35)
+
+    def test_batches_posteriores_a_uno_fallido_no_se_duplican(self):
+        """Falla el batch 2, los 3 y 4 se cargan; al reanudar solo se completa el 2"""
+        reintentos = configuracion.HIVE_ENVIO_REINTENTOS
+        configuracion.HIVE_ENVIO_REINTENTOS = 0
+        self.addCleanup(setattr, configuracion, 'HIVE_ENVIO_REINTENTOS', reintentos)
+        self.hive.rechazar_load = 2
+        resumen = self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+        self.assertEqual(resumen['registros'], 25)
+
+        self.hive.rechazar_load = None
+        sistema = self.crear_sistema()
+        checkpoint = sistema.checkpoints.cargar(self.video)
+        self.assertEqual((checkpoint['batches_enviados'], checkpoint['lote_en_envio']), (1, 2))
+        sistema._procesar_video_con_batches(self.video, 'camara.avi')
+
+        self.assertEqual(len(self.ids_cargados()), 35)
+        self.assertEqual(len(set(self.ids_cargados())), 35)
+        self.assertIsNone(sistema.checkpoints.cargar(self.video))
+
+    def test_reanudacion_reproduce_el_corte_del_batch_en_vuelo(self):
+        """Aunque cambien los límites, el batch incierto se corta igual que antes"""
+        self.hive.caer_tras_load = 2
+        with self.assertRaises(Caida):
+            self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+
+        self.hive.caer_tras_load = None
+        configuracion.BATCH_TAMAÑO_MAXIMO = 7
+        self.crear_sistema()._procesar_video_con_batches(self.video, 'camara.avi')
+
+        self.assertEqual([t.num_rows for t in self.hive.archivos_cargados], [10, 10, 7, 7, 1])
+        self.assertEqual(len(set(self.ids_cargados())), 35)
+
+
+if __name__ == '__main__':
+    unittest.main()
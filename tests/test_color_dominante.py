@@ -0,0 +1,49 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from color_dominante import MODOS_COLOR, color_dominante, colores_dominantes
+from paleta_colores import nombre_color
+
+
+def nombre_bgr(bgr):
+    b, g, r = bgr.astype(int)
+    return nombre_color(r, g, b)
+
+
+class TestColorDominante(unittest.TestCase):
+    def setUp(self):
+        # Camisa roja (60% de la caja) sobre fondo azul
+        self.frame = np.zeros((100, 100, 3), dtype=np.uint8)
+        self.frame[:] = (255, 0, 0)
+        self.frame[10:90, 12:87] = (0, 0, 255)
+
+    def test_promedio_mezcla_los_colores(self):
+        self.assertEqual(nombre_bgr(color_dominante(self.frame, 0, 0, 100, 100, 'mean')), 'purple')
+
+    def test_histograma_y_kmeans_encuentran_el_rojo(self):
+        for modo in ('histogram', 'kmeans'):
+            color = color_dominante(self.frame, 0, 0, 100, 100, modo, max_pixeles=256)
+            np.testing.assert_allclose(color, (0, 0, 255))
+
+    def test_caja_vacia_y_modo_invalido(self):
+        for modo in MODOS_COLOR:
+            self.assertIsNone(color_dominante(self.frame, 50, 50, 50, 80, modo))
+        with self.assertRaises(ValueError):
+            color_dominante(self.frame, 0, 0, 10, 10, 'mediana')
+
+    def test_varias_cajas(self):
+        colores, validas = colores_dominantes(
+            self.frame, np.array([0, 20, 5]), np.array([0, 20, 5]),
+            np.array([100, 40, 5]), np.array([100, 40, 9]), 'histogram'
+        )
+        self.assertEqual(list(validas), [True, True, False])
+        self.assertEqual([nombre_bgr(c) for c in colores[:2]], ['red', 'red'])
+
+
+if __name__ == '__main__':
+    unittest.main()
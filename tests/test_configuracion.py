@@ -0,0 +1,72 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from carga_configuracion import aplicar_overrides, convertir
+
+
+def espacio_base():
+    return {
+        'HIVE_HOST': 'localhost', 'HIVE_PORT': 10000, 'EXPORTAR_CSV_BATCHES': False,
+        'MUESTREO_FRAMES_POR_SEGUNDO': 1.0, 'BATCH_TAMAÑO_MAXIMO': 5000,
+        'HIVE_STAGING_HDFS_DIR': None, 'HIVE_CONFIG': {'host': 'localhost'},
+    }
+
+
+class TestCargaConfiguracion(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.archivo = os.path.join(self.tmp.name, 'nodo.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def escribir(self, datos):
+        with open(self.archivo, 'w', encoding='utf-8') as f:
+            json.dump(datos, f)
+
+    def test_tipos_desde_texto(self):
+        self.assertIs(convertir('X', 'si', False), True)
+        self.assertIs(convertir('X', 'off', True), False)
+        self.assertEqual(convertir('X', '8', 1), 8)
+        self.assertEqual(convertir('X', '0.2', 1.0), 0.2)
+        self.assertEqual(convertir('X', 3, 1.0), 3.0)
+        self.assertIsNone(convertir('X', '', None))
+        for valor, referencia in (('ocho', 1), ('quizas', True), (2.5, 1)):
+            with self.assertRaises(ValueError):
+                convertir('X', valor, referencia)
+
+    def test_archivo_y_entorno_con_prioridad(self):
+        self.escribir({'HIVE_HOST': '172.25.54.102', 'HIVE_PORT': 10001, 'BATCH_TAMAÑO_MAXIMO': 2000})
+        espacio = espacio_base()
+        aplicados = aplicar_overrides(espacio, self.archivo, {
+            'YOLOHIVE_HIVE_PORT': '10002',
+            'YOLOHIVE_EXPORTAR_CSV_BATCHES': 'true',
+            'YOLOHIVE_HIVE_STAGING_HDFS_DIR': '/user/hive/staging',
+        })
+        self.assertEqual(espacio['HIVE_HOST'], '172.25.54.102')
+        self.assertEqual(espacio['HIVE_PORT'], 10002)
+        self.assertEqual(espacio['BATCH_TAMAÑO_MAXIMO'], 2000)
+        self.assertIs(espacio['EXPORTAR_CSV_BATCHES'], True)
+        self.assertEqual(espacio['HIVE_STAGING_HDFS_DIR'], '/user/hive/staging')
+        self.assertEqual(aplicados['HIVE_PORT'], 'YOLOHIVE_HIVE_PORT')
+        self.assertEqual(aplicados['HIVE_HOST'], self.archivo)
+
+    def test_nombre_ascii_en_entorno(self):
+        espacio = espacio_base()
+        aplicar_overrides(espacio, '', {'YOLOHIVE_BATCH_TAMANO_MAXIMO': '300'})
+        self.assertEqual(espacio['BATCH_TAMAÑO_MAXIMO'], 300)
+
+    def test_ajuste_desconocido_o_no_escalar(self):
+        for datos in ({'HIVE_HOTS': 'x'}, {'HIVE_CONFIG': {}}):
+            self.escribir(datos)
+            with self.assertRaises(ValueError):
+                aplicar_overrides(espacio_base(), self.archivo, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
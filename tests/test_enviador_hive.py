@@ -0,0 +1,136 @@
+import os
+import sys
+import threading
+import time
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from enviador_hive import EnviadorHive
+
+
+class ETLFalso:
+    """Sustituto de SistemaBatchETL con carga lenta y fallos programables"""
+
+    def __init__(self, demora=0.0, fallos=0):
+        self.demora = demora
+        self.fallos = fallos
+        self.cargados = []
+        self.intentos = 0
+        self.liberar = threading.Event()
+        self.liberar.set()
+
+    def asegurar_sesion(self):
+        return True
+
+    def cargar_registros_a_hive(self, df):
+        self.liberar.wait()
+        self.intentos += 1
+        time.sleep(self.demora)
+        if self.fallos:
+            self.fallos -= 1
+            return 0
+        self.cargados.append(df['n'].tolist())
+        return len(df)
+
+
+class ETLParcial(ETLFalso):
+    """Inserta fila por fila y la primera carga se corta tras cortar_en filas"""
+
+    def __init__(self, cortar_en):
+        super().__init__()
+        self.cortar_en = cortar_en
+        self.filas = []
+        self.posiciones_cargadas = []
+
+    def cargar_registros_a_hive(self, df):
+        self.intentos += 1
+        self.posiciones_cargadas = []
+        for posicion, n in enumerate(df['n']):
+            if self.intentos == 1 and posicion == self.cortar_en:
+                return len(self.posiciones_cargadas)
+            self.filas.append(n)
+            self.posiciones_cargadas.append(posicion)
+        return len(df)
+
+
+def batch(n, filas=2):
+    return pd.DataFrame({'n': [n] * filas})
+
+
+class TestEnviadorHive(unittest.TestCase):
+    def test_no_bloquea_y_respeta_el_orden(self):
+        etl = ETLFalso(demora=0.05)
+        terminados = []
+        with EnviadorHive(etl, tam_cola=8) as enviador:
+            inicio = time.perf_counter()
+            for n in range(5):
+                enviador.enviar(batch(n), al_terminar=terminados.append)
+            self.assertLess(time.perf_counter() - inicio, 0.05)
+        self.assertEqual([fila[0] for fila in etl.cargados], [0, 1, 2, 3, 4])
+        self.assertEqual(terminados, [2] * 5)
+        self.assertEqual(enviador.registros_enviados, 10)
+
+    def test_cola_acotada(self):
+        """Con la cola llena enviar() espera a Hive en vez de acumular batches"""
+        etl = ETLFalso()
+        etl.liberar.clear()
+        enviador = EnviadorHive(etl, tam_cola=1).iniciar()
+        enviador.enviar(batch(0))  # lo toma el hilo y queda esperando a Hive
+        time.sleep(0.05)
+        enviador.enviar(batch(1))  # ocupa la cola
+
+        bloqueado = threading.Thread(target=enviador.enviar, args=(batch(2),))
+        bloqueado.start()
+        bloqueado.join(0.1)
+        self.assertTrue(bloqueado.is_alive())
+
+        etl.liberar.set()
+        bloqueado.join(1)
+        enviador.cerrar()
+        self.assertEqual(len(etl.cargados), 3)
+
+    def test_reintentos_con_backoff(self):
+        etl = ETLFalso(fallos=2)
+        resultados = []
+        enviador = EnviadorHive(etl, reintentos=3, espera_inicial=0.01)
+        enviador.enviar(batch(0), al_terminar=resultados.append)
+        enviador.cerrar()
+        self.assertEqual(etl.intentos, 3)
+        self.assertEqual(resultados, [2])
+
+    def test_carga_parcial_reintenta_solo_lo_que_falta(self):
+        etl = ETLParcial(cortar_en=2)
+        resultados = []
+        enviador = EnviadorHive(etl, reintentos=3, espera_inicial=0.0)
+        enviador.enviar(pd.DataFrame({'n': ['a', 'b', 'c', 'd']}), al_terminar=resultados.append)
+        enviador.cerrar()
+        self.assertEqual(etl.filas, ['a', 'b', 'c', 'd'])
+        self.assertEqual(etl.intentos, 2)
+        self.assertEqual(resultados, [4])
+        self.assertEqual((enviador.registros_enviados, enviador.batches_enviados), (4, 1))
+
+    def test_sin_exito_reporta_cero(self):
+        etl = ETLFalso(fallos=10)
+        resultados = []
+        enviador = EnviadorHive(etl, reintentos=1, espera_inicial=0.0)
+        enviador.enviar(batch(0), al_terminar=resultados.append)
+        enviador.cerrar()
+        self.assertEqual(resultados, [0])
+        self.assertEqual(enviador.batches_fallidos, 1)
+
+    def test_error_del_hilo_se_propaga(self):
+        def falla():
+            raise RuntimeError('disco lleno')
+
+        enviador = EnviadorHive(ETLFalso())
+        enviador.enviar(batch(0), al_iniciar=falla)
+        with self.assertRaises(RuntimeError):
+            enviador.vaciar()
+        enviador.cerrar()
+
+
+if __name__ == '__main__':
+    unittest.main()
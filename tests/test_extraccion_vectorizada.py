@@ -0,0 +1,91 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from esquema_detecciones import NOMBRES_COLUMNAS
+from extraccion_vectorizada import concatenar_lotes, extraer_atributos_lote, filas_lote
+
+
+class TestExtraccionVectorizada(unittest.TestCase):
+    def setUp(self):
+        # Frame BGR 100x200: mitad izquierda roja, mitad derecha azul
+        self.frame = np.zeros((100, 200, 3), dtype=np.uint8)
+        self.frame[:, :100] = (0, 0, 250)
+        self.frame[:, 100:] = (250, 0, 0)
+        self.xyxy = np.array([
+            [10.7, 5.2, 50.9, 30.8],     # arriba a la izquierda, rojo
+            [150.0, 70.0, 190.0, 95.0],  # abajo a la derecha, azul
+            [80.0, 40.0, 80.0, 60.0],    # ancho cero → ROI vacía
+        ])
+        self.conf = np.array([0.912345, 0.5, 0.3])
+        self.cls = np.array([0, 2, 0])
+        self.nombres = {0: 'person', 2: 'car'}
+
+    def extraer(self):
+        return extraer_atributos_lote(
+            self.xyxy, self.conf, self.cls, self.frame, self.nombres,
+            'video.mp4', 'video', 30, 1.0049
+        )
+
+    def test_columnas_y_valores(self):
+        lote = self.extraer()
+        self.assertEqual(list(lote), NOMBRES_COLUMNAS)
+        self.assertEqual(filas_lote(lote), 3)
+
+        self.assertEqual(list(lote['class_name']), ['person', 'car', 'person'])
+        self.assertEqual(list(lote['x_min']), [10, 150, 80])
+        # width = int(x2 - x1), no int(x2) - int(x1)
+        self.assertEqual(list(lote['width']), [40, 40, 0])
+        self.assertEqual(list(lote['height']), [25, 25, 20])
+        self.assertEqual(lote['confidence'][0], 0.9123)
+        self.assertEqual(list(lote['position_region']), ['top_left', 'bottom_right', 'middle_center'])
+        self.assertEqual(list(lote['dominant_color_name']), ['red', 'blue', 'gray'])
+        self.assertEqual((lote['dom_r'][0], lote['dom_g'][0], lote['dom_b'][0]), (250, 0, 0))
+        self.assertEqual(lote['dom_r'][2], 128)
+        self.assertEqual(lote['timestamp_sec'][0], 1.0)
+        self.assertEqual(len(set(lote['detection_id'])), 3)
+        self.assertTrue(all(len(i) == 16 for i in lote['detection_id']))
+
+    def test_ids_deterministas(self):
+        """El mismo frame reprocesado da los mismos ids; otro frame, otros"""
+        ids = list(self.extraer()['detection_id'])
+        self.assertEqual(list(self.extraer()['detection_id']), ids)
+        otro_frame = extraer_atributos_lote(
+            self.xyxy, self.conf, self.cls, self.frame, self.nombres, 'video.mp4', 'video', 31
+        )
+        self.assertFalse(set(ids) & set(otro_frame['detection_id']))
+
+    def test_frame_reducido_con_forma_original(self):
+        """Frame reducido a la mitad (GStreamer) y boxes originales: mismos atributos"""
+        reducido = self.frame[::2, ::2]
+        lote = extraer_atributos_lote(
+            self.xyxy[:2], self.conf[:2], self.cls[:2], reducido, self.nombres,
+            'video.mp4', 'video', 30, 1.0, forma_original=self.frame.shape[:2]
+        )
+        completo = extraer_atributos_lote(
+            self.xyxy[:2], self.conf[:2], self.cls[:2], self.frame, self.nombres,
+            'video.mp4', 'video', 30, 1.0
+        )
+        for columna in ('x_min', 'width', 'frame_width', 'frame_height', 'bbox_area_ratio',
+                        'position_region', 'dominant_color_name', 'dom_r', 'dom_b'):
+            self.assertEqual(list(lote[columna]), list(completo[columna]), columna)
+
+    def test_sin_detecciones(self):
+        lote = extraer_atributos_lote(
+            np.empty((0, 4)), np.empty(0), np.empty(0, dtype=int), self.frame,
+            self.nombres, 'img.jpg', 'image'
+        )
+        self.assertEqual(filas_lote(lote), 0)
+
+    def test_concatenar(self):
+        lote = concatenar_lotes([self.extraer(), self.extraer()])
+        self.assertEqual(filas_lote(lote), 6)
+        self.assertEqual(filas_lote(concatenar_lotes([])), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from imagen_integral import ImagenIntegral, integral_de
+
+
+class TestImagenIntegral(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.frame = rng.integers(0, 256, (97, 131, 3), dtype=np.uint8)
+        self.integral = ImagenIntegral(self.frame)
+        self.rng = rng
+
+    def test_igual_que_np_mean_de_la_roi(self):
+        for _ in range(500):
+            x1, x2 = sorted(self.rng.integers(0, 140, 2))
+            y1, y2 = sorted(self.rng.integers(0, 105, 2))
+            roi = self.frame[y1:y2, x1:x2]
+            promedio = self.integral.promedio(x1, y1, x2, y2)
+            if roi.size == 0:
+                self.assertIsNone(promedio)
+            else:
+                np.testing.assert_array_equal(
+                    promedio.astype(int), np.mean(roi, axis=(0, 1)).astype(int)
+                )
+
+    def test_vectorizado_con_cajas_vacias(self):
+        promedios, validas = self.integral.promedios([0, 10, 50], [0, 10, 5], [131, 10, 60], [97, 20, 5])
+        self.assertEqual(list(validas), [True, False, False])
+        np.testing.assert_allclose(promedios[0], self.frame.reshape(-1, 3).mean(axis=0))
+
+    def test_reutiliza_la_integral_del_mismo_frame(self):
+        self.assertIs(integral_de(self.frame, self.integral), self.integral)
+        self.assertIsNot(integral_de(self.frame.copy(), self.integral), self.integral)
+
+
+if __name__ == '__main__':
+    unittest.main()
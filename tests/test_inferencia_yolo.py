@@ -0,0 +1,36 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import configuracion
+from inferencia_yolo import indices_clases, opciones_inferencia
+
+NOMBRES = {0: 'person', 1: 'bicycle', 2: 'car', 16: 'dog'}
+
+
+class TestOpcionesInferencia(unittest.TestCase):
+    def setUp(self):
+        self.originales = (configuracion.YOLO_CLASES, configuracion.CONFIDENCE_THRESHOLD)
+
+    def tearDown(self):
+        configuracion.YOLO_CLASES, configuracion.CONFIDENCE_THRESHOLD = self.originales
+
+    def test_clases_por_nombre(self):
+        self.assertIsNone(indices_clases(NOMBRES, ''))
+        self.assertEqual(indices_clases(NOMBRES, 'dog, person'), [0, 16])
+        with self.assertRaises(ValueError):
+            indices_clases(NOMBRES, 'person,unicornio')
+
+    def test_opciones_desde_configuracion(self):
+        configuracion.YOLO_CLASES = 'car'
+        configuracion.CONFIDENCE_THRESHOLD = 0.6
+        opciones = opciones_inferencia(NOMBRES)
+        self.assertEqual(opciones['classes'], [2])
+        self.assertEqual(opciones['conf'], 0.6)
+        self.assertEqual(set(opciones), {'conf', 'iou', 'max_det', 'classes', 'imgsz'})
+
+
+if __name__ == '__main__':
+    unittest.main()
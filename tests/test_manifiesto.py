@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from manifiesto import ManifiestoProcesados
+
+
+class TestManifiestoProcesados(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ruta_manifiesto = os.path.join(self.tmp.name, 'data', 'manifiesto.json')
+        self.entrada = os.path.join(self.tmp.name, 'video.mp4')
+        with open(self.entrada, 'wb') as f:
+            f.write(b'contenido original')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def manifiesto(self, version='yolov8n.pt:abc'):
+        return ManifiestoProcesados(self.ruta_manifiesto, version)
+
+    def test_solo_procesa_lo_nuevo(self):
+        manifiesto = self.manifiesto()
+        self.assertEqual(manifiesto.filtrar([self.entrada]), [self.entrada])
+        manifiesto.registrar(self.entrada, 42)
+
+        # Otra corrida lee el manifiesto persistido
+        recargado = self.manifiesto()
+        self.assertEqual(recargado.filtrar([self.entrada]), [])
+        self.assertEqual(recargado.filtrar([self.entrada], forzar=True), [self.entrada])
+        self.assertEqual(recargado.entradas[os.path.normpath(self.entrada)]['filas'], 42)
+
+    def test_contenido_modificado_o_modelo_nuevo(self):
+        self.manifiesto().registrar(self.entrada, 1)
+        self.assertTrue(self.manifiesto(version='yolov8s.pt:def').pendiente(self.entrada))
+
+        with open(self.entrada, 'wb') as f:
+            f.write(b'contenido cambiado')
+        os.utime(self.entrada, (1, 1))
+        self.assertTrue(self.manifiesto().pendiente(self.entrada))
+
+    def test_touch_sin_cambios_no_reprocesa(self):
+        self.manifiesto().registrar(self.entrada, 1)
+        os.utime(self.entrada, (1, 1))
+        manifiesto = self.manifiesto()
+        self.assertFalse(manifiesto.pendiente(self.entrada))
+        # El nuevo mtime queda guardado para evitar volver a calcular el hash
+        self.assertEqual(self.manifiesto().entradas[os.path.normpath(self.entrada)]['mtime'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
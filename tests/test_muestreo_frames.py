@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from muestreo_frames import MuestreadorFrames
+
+
+class TestMuestreadorFrames(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.video = os.path.join(cls.tmp.name, 'sintetico.avi')
+        writer = cv2.VideoWriter(cls.video, cv2.VideoWriter_fourcc(*'MJPG'), 25, (64, 48))
+        for i in range(130):
+            writer.write(np.full((48, 64, 3), (i * 2) % 256, dtype=np.uint8))
+        writer.release()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def muestrear(self, modo, muestras_por_segundo=1.0, desde_segundos=0.0):
+        cap = cv2.VideoCapture(self.video)
+        try:
+            muestreador = MuestreadorFrames(cap, muestras_por_segundo, modo, desde_segundos=desde_segundos)
+            return muestreador.modo, [(n, round(t, 2), int(f[0, 0, 0])) for f, n, t in muestreador]
+        finally:
+            cap.release()
+
+    def test_modos_equivalentes(self):
+        """read, grab y seek devuelven los mismos frames muestreados"""
+        _, referencia = self.muestrear('read')
+        self.assertEqual([n for n, _, _ in referencia], [0, 25, 50, 75, 100, 125])
+        self.assertEqual([t for _, t, _ in referencia], [0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+
+        for modo in ('grab', 'seek'):
+            _, muestras = self.muestrear(modo)
+            self.assertEqual([n for n, _, _ in muestras], [n for n, _, _ in referencia], modo)
+            for (_, _, valor), (_, _, esperado) in zip(muestras, referencia):
+                self.assertLessEqual(abs(valor - esperado), 2, modo)
+
+    def test_reanudar_desde_segundos(self):
+        """Al reanudar se salta a la primera muestra de la grilla original"""
+        for modo in ('read', 'grab', 'seek'):
+            _, muestras = self.muestrear(modo, desde_segundos=2.5)
+            self.assertEqual([n for n, _, _ in muestras], [75, 100, 125], modo)
+
+    def test_paso_desde_fps_real(self):
+        """La tasa de muestreo se deriva del FPS del video"""
+        _, muestras = self.muestrear('grab', muestras_por_segundo=5.0)
+        self.assertEqual([n for n, _, _ in muestras][:4], [0, 5, 10, 15])
+
+    def test_auto_en_video_corto_usa_grab(self):
+        modo, _ = self.muestrear('auto')
+        self.assertEqual(modo, 'grab')
+
+    def test_modo_invalido(self):
+        cap = cv2.VideoCapture(self.video)
+        with self.assertRaises(ValueError):
+            MuestreadorFrames(cap, 1.0, 'todo')
+        cap.release()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from paleta_colores import PALETA, indices_colores, indices_exactos, nombre_color, nombres_colores
+
+
+class TestPaletaColores(unittest.TestCase):
+    def test_colores_de_la_paleta(self):
+        for nombre, (r, g, b) in PALETA.items():
+            self.assertEqual(nombre_color(r, g, b), nombre)
+        rgb = np.array(list(PALETA.values()))
+        self.assertEqual(list(nombres_colores(rgb)), list(PALETA))
+
+    def test_escalar_y_vectorizado_coinciden(self):
+        rgb = np.random.default_rng(0).integers(0, 256, (1000, 3))
+        esperados = [nombre_color(r, g, b) for r, g, b in rgb]
+        self.assertEqual(list(nombres_colores(rgb)), esperados)
+
+    def test_cercano_a_la_distancia_exacta(self):
+        rgb = np.random.default_rng(1).integers(0, 256, (20000, 3))
+        self.assertGreater((indices_colores(rgb) == indices_exactos(rgb)).mean(), 0.95)
+
+    def test_valores_fuera_de_rango(self):
+        self.assertEqual(nombre_color(300, -5, -5), 'red')
+        self.assertEqual(nombres_colores(np.array([[300.7, -5, -5]]))[0], 'red')
+
+
+if __name__ == '__main__':
+    unittest.main()
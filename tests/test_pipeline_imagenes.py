@@ -0,0 +1,75 @@
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from ultralytics.engine.results import Boxes
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pipeline_imagenes import PipelineImagenes, decodificar_imagen
+
+
+def inferir_centro(frames):
+    """Una box sobre el cuarto central de cada frame, en sus propias coordenadas"""
+    resultados = []
+    for frame in frames:
+        alto, ancho = frame.shape[:2]
+        datos = np.array([[ancho / 4, alto / 4, ancho * 3 / 4, alto * 3 / 4, 0.9, 0]])
+        resultados.append(SimpleNamespace(boxes=Boxes(datos, (alto, ancho))))
+    return resultados
+
+
+class TestPipelineImagenes(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.rutas = []
+        for i, (ancho, alto) in enumerate([(1280, 720), (640, 360), (960, 1280), (1280, 720), (320, 240)]):
+            ruta = os.path.join(self.tmp.name, f'{i}.png')
+            cv2.imwrite(ruta, np.full((alto, ancho, 3), i * 40, dtype=np.uint8))
+            self.rutas.append(ruta)
+        self.rutas.insert(2, os.path.join(self.tmp.name, 'corrupta.jpg'))
+        with open(self.rutas[2], 'wb') as f:
+            f.write(b'no es una imagen')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reduce_como_el_letterbox(self):
+        original, reducida, escala = decodificar_imagen(self.rutas[0], 640)
+        self.assertEqual(reducida.shape[:2], (360, 640))
+        self.assertEqual(escala, 0.5)
+        original, reducida, escala = decodificar_imagen(self.rutas[-1], 640)
+        self.assertIs(original, reducida)
+
+    def test_orden_batches_y_boxes_en_resolucion_original(self):
+        tamanos = []
+
+        def inferir(frames):
+            tamanos.append(len(frames))
+            # Un batch solo junta imágenes del mismo tamaño (inferencia rectangular)
+            self.assertEqual(len({f.shape for f in frames}), 1)
+            self.assertTrue(all(max(f.shape[:2]) <= 640 for f in frames))
+            return inferir_centro(frames)
+
+        recibidos = []
+        pipeline = PipelineImagenes(inferir, tamano_batch=2, hilos=3, lado_maximo=640)
+        pipeline.ejecutar(self.rutas, lambda ruta, frame, boxes: recibidos.append((ruta, frame, boxes)))
+
+        self.assertEqual([ruta for ruta, _, _ in recibidos], self.rutas)
+        self.assertEqual(tamanos, [2, 1, 1, 1])
+        self.assertIsNone(recibidos[2][1])
+        for ruta, frame, boxes in recibidos:
+            if frame is None:
+                continue
+            alto, ancho = frame.shape[:2]
+            np.testing.assert_allclose(
+                boxes.xyxy[0], [ancho / 4, alto / 4, ancho * 3 / 4, alto * 3 / 4], atol=1.0
+            )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pipeline_video import PipelineVideo
+from pool_frames import PoolFrames
+
+
+def crear_video(ruta, num_frames=95, fps=30, ancho=64, alto=48):
+    """Genera un video sintético cuyo frame i tiene el valor i en el pixel (0, 0)"""
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'MJPG'), fps, (ancho, alto))
+    for i in range(num_frames):
+        frame = np.full((alto, ancho, 3), i % 256, dtype=np.uint8)
+        writer.write(frame)
+    writer.release()
+
+
+class TestPipelineVideo(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'sintetico.avi')
+        crear_video(self.video)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_orden_y_batches(self):
+        """Los resultados llegan en orden, con batches del tamaño configurado"""
+        tamanos = []
+
+        def inferir(frames):
+            tamanos.append(len(frames))
+            return [f'res-{len(tamanos)}-{i}' for i in range(len(frames))]
+
+        recibidos = []
+        pipeline = PipelineVideo(inferir, tamano_batch=2, tam_cola=1)
+        pipeline.ejecutar(self.video, lambda f, n, t, r: recibidos.append((n, round(t, 2), r)))
+
+        self.assertEqual([n for n, _, _ in recibidos], [0, 30, 60, 90])
+        self.assertEqual([t for _, t, _ in recibidos], [0.0, 1.0, 2.0, 3.0])
+        self.assertEqual(tamanos, [2, 2])
+        self.assertEqual(recibidos[3][2], 'res-2-1')
+
+    def test_pool_reutiliza_frames_sin_mezclarlos(self):
+        """Con pool cada frame llega con su contenido y los buffers se reciclan"""
+        pool = PoolFrames()
+        valores = []
+        pipeline = PipelineVideo(lambda frames: frames, tamano_batch=2, tam_cola=1, pool=pool,
+                                 muestras_por_segundo=30, modo_muestreo='read')
+        pipeline.ejecutar(self.video, lambda f, n, t, r: valores.append((n, int(f[0, 0, 0]))))
+
+        self.assertEqual(len(valores), 95)
+        self.assertTrue(all(abs(valor - n % 256) <= 3 for n, valor in valores))
+        # En vuelo como máximo: colas, lote de inferencia y el frame en consumo
+        self.assertLess(pool.asignados, 10)
+        self.assertEqual(pool.estadisticas()['en_uso'], 0)
+
+    def test_error_en_consumidor_detiene_hilos(self):
+        """Un error en la etapa final se propaga y no deja hilos colgados"""
+        def consumir(frame, frame_number, timestamp_sec, result):
+            raise ValueError('fallo')
+
+        pipeline = PipelineVideo(lambda frames: frames, tamano_batch=1, tam_cola=1)
+        with self.assertRaises(ValueError):
+            pipeline.ejecutar(self.video, consumir)
+
+    def test_error_en_inferencia_se_propaga(self):
+        """Un error del modelo se propaga al hilo que llama"""
+        def inferir(frames):
+            raise RuntimeError('modelo')
+
+        pipeline = PipelineVideo(inferir, tamano_batch=4)
+        with self.assertRaises(RuntimeError):
+            pipeline.ejecutar(self.video, lambda *args: None)
+
+
+if __name__ == '__main__':
+    unittest.main()
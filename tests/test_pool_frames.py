@@ -0,0 +1,101 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from muestreo_frames import MuestreadorFrames
+from pool_frames import PoolFrames
+
+
+def crear_video(ruta, num_frames=10, ancho=64, alto=48):
+    """Video sintético cuyo frame i tiene el valor 20 * i en todos los pixeles"""
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'MJPG'), 25, (ancho, alto))
+    for i in range(num_frames):
+        writer.write(np.full((alto, ancho, 3), 20 * i, dtype=np.uint8))
+    writer.release()
+
+
+class TestPoolFrames(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'video.avi')
+        crear_video(self.video)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reutiliza_el_buffer_liberado(self):
+        pool = PoolFrames()
+        cap = cv2.VideoCapture(self.video)
+        buffers = set()
+        valores = []
+        while True:
+            ok, frame = pool.leer(cap)
+            if not ok:
+                break
+            buffers.add(id(frame))
+            valores.append(int(frame[0, 0, 0]))
+            pool.liberar(frame)
+        cap.release()
+
+        self.assertEqual(len(buffers), 1)
+        # Cada lectura trae el contenido de su frame (MJPG con pérdida: tolerancia)
+        np.testing.assert_allclose(valores, [20 * i for i in range(10)], atol=3)
+        self.assertEqual(pool.estadisticas(), {'asignados': 1, 'reutilizados': 9, 'libres': 1, 'en_uso': 0})
+
+    def test_frames_retenidos_no_se_pisan(self):
+        """Mientras un frame no se libera, el pool no lo entrega a otra lectura"""
+        pool = PoolFrames()
+        cap = cv2.VideoCapture(self.video)
+        retenidos = [pool.leer(cap)[1] for _ in range(3)]
+        self.assertEqual(len({id(frame) for frame in retenidos}), 3)
+        self.assertEqual([round(f[0, 0, 0] / 20) for f in retenidos], [0, 1, 2])
+
+        for frame in retenidos:
+            pool.liberar(frame)
+        pool.liberar(retenidos[0])  # doble liberación: se ignora
+        pool.liberar(np.zeros_like(retenidos[0]))  # frame ajeno: se ignora
+        self.assertEqual(pool.estadisticas()['libres'], 3)
+
+        ok, frame = pool.leer(cap)
+        self.assertIn(id(frame), {id(f) for f in retenidos})
+        self.assertEqual(pool.asignados, 3)
+        cap.release()
+
+    def test_cambio_de_resolucion(self):
+        otro = os.path.join(self.tmp.name, 'grande.avi')
+        crear_video(otro, ancho=128, alto=96)
+        pool = PoolFrames()
+        for ruta, forma in ((self.video, (48, 64, 3)), (otro, (96, 128, 3))):
+            cap = cv2.VideoCapture(ruta)
+            for _ in range(2):
+                ok, frame = pool.leer(cap)
+                self.assertEqual(frame.shape, forma)
+                pool.liberar(frame)
+            cap.release()
+        self.assertEqual(pool.forma, (96, 128, 3))
+        self.assertEqual(pool.asignados, 2)
+
+    def test_muestreo_read_recicla_los_frames_descartados(self):
+        """En modo 'read' los frames no muestreados no piden buffers nuevos"""
+        pool = PoolFrames()
+        cap = cv2.VideoCapture(self.video)
+        muestras = []
+        for frame, frame_number, _ in MuestreadorFrames(cap, 5, 'read', pool=pool):
+            muestras.append(frame_number)
+            pool.liberar(frame)
+        cap.release()
+
+        self.assertEqual(muestras, [0, 5])
+        self.assertEqual(pool.asignados, 1)
+        self.assertEqual(pool.reutilizados, 9)
+        self.assertEqual(pool.estadisticas()['en_uso'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
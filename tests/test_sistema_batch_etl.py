@@ -0,0 +1,212 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import sistema_batch_etl
+from sistema_batch_etl import SistemaBatchETL
+from datos_prueba import HiveFalso
+
+
+def csv_detecciones(ruta, filas=3):
+    fila = {
+        'source_type': 'video', 'source_id': 'v.mp4', 'frame_number': 0,
+        'class_id': 0, 'class_name': 'person', 'confidence': 0.9,
+        'x_min': 1, 'y_min': 2, 'x_max': 3, 'y_max': 4, 'width': 2, 'height': 2,
+        'area_pixels': 4, 'frame_width': 10, 'frame_height': 10, 'bbox_area_ratio': 0.04,
+        'center_x': 2.0, 'center_y': 3.0, 'center_x_norm': 0.2, 'center_y_norm': 0.3,
+        'position_region': 'top_left', 'dominant_color_name': 'red',
+        'dom_r': 200, 'dom_g': 10, 'dom_b': 10, 'timestamp_sec': 0.0,
+        'ingestion_date': '2024-01-01 00:00:00', 'detection_id': 'abcd1234'
+    }
+    pd.DataFrame([fila] * filas).to_csv(ruta, index=False)
+
+
+class BaseHiveFalso(unittest.TestCase):
+    def setUp(self):
+        self.hive = HiveFalso()
+        self.hive_original = sistema_batch_etl.hive
+        sistema_batch_etl.hive = self.hive
+        sistema_batch_etl._ESQUEMAS_ASEGURADOS.clear()
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv = os.path.join(self.tmp.name, 'batch.csv')
+        csv_detecciones(self.csv)
+
+    def crear_etl(self):
+        etl = SistemaBatchETL()
+        etl.staging_dir = os.path.join(self.tmp.name, 'staging')
+        return etl
+
+    def tearDown(self):
+        sistema_batch_etl.hive = self.hive_original
+        sistema_batch_etl._ESQUEMAS_ASEGURADOS.clear()
+        self.tmp.cleanup()
+
+
+class TestSesionPersistente(BaseHiveFalso):
+    def test_una_conexion_y_ddl_para_varios_batches(self):
+        etl = self.crear_etl()
+        for _ in range(5):
+            self.assertTrue(etl.asegurar_sesion())
+            self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+
+        self.assertEqual(self.hive.conexiones, 1)
+        self.assertEqual(self.hive.contar('CREATE DATABASE'), 1)
+        self.assertEqual(self.hive.contar('CREATE TABLE'), 1)
+        self.assertEqual(self.hive.contar('USE'), 1)
+
+    def test_ddl_una_vez_por_proceso(self):
+        """Una segunda instancia no repite el DDL y abre directo sobre la base"""
+        self.crear_etl().asegurar_sesion()
+        etl = self.crear_etl()
+        self.assertTrue(etl.asegurar_sesion())
+
+        self.assertEqual(self.hive.conexiones, 2)
+        self.assertEqual(self.hive.contar('CREATE'), 2)
+
+    def test_reconexion_tras_caida(self):
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+
+        # Se cae la sesión y además pasó el tiempo de inactividad
+        self.hive.caida = True
+        etl.ultimo_uso -= etl.VERIFICAR_CONEXION_SEGUNDOS + 1
+        self.assertTrue(etl.asegurar_sesion())
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+
+        self.assertEqual(self.hive.conexiones, 2)
+        self.assertEqual(self.hive.contar('CREATE'), 2)
+
+    def test_reconexion_durante_la_carga(self):
+        """Si la sesión muere a mitad de la carga se reintenta en una nueva"""
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.hive.caida = True
+
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+        self.assertEqual(self.hive.conexiones, 2)
+
+
+class TestCargaMasiva(BaseHiveFalso):
+    def crear_etl(self):
+        etl = super().crear_etl()
+        etl.formato_tabla = 'textfile'
+        etl.particionada = False
+        return etl
+
+    def test_un_load_data_por_batch(self):
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+
+        self.assertEqual(self.hive.contar('LOAD DATA LOCAL INPATH'), 1)
+        self.assertEqual(self.hive.contar('INSERT'), 0)
+        filas = self.hive.archivos_cargados[0].splitlines()
+        self.assertEqual(len(filas), 3)
+        self.assertEqual(len(filas[0].split(',')), 28)
+        self.assertEqual(os.listdir(etl.staging_dir), [])
+
+    def test_fallback_fila_por_fila(self):
+        self.hive.falla_load = True
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+        self.assertEqual(self.hive.contar('INSERT'), 3)
+
+    def test_insercion_cortada_devuelve_lo_cargado(self):
+        """Si un INSERT falla a mitad se informan las filas que sí entraron, no 0"""
+        self.hive.falla_load = True
+        self.hive.inserts_antes_de_fallar = 2
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 2)
+        self.assertEqual(etl.posiciones_cargadas, [0, 1])
+
+    def test_texto_sanitizado_y_nulos(self):
+        df = pd.read_csv(self.csv)
+        df.loc[0, 'source_id'] = 'video, con coma.mp4'
+        df.loc[1, 'dom_r'] = None
+        texto = self.crear_etl()._preparar_para_textfile(df).to_csv(
+            index=False, header=False, na_rep='\\N'
+        )
+        filas = texto.splitlines()
+        self.assertTrue(all(len(fila.split(',')) == 28 for fila in filas))
+        self.assertIn('video  con coma.mp4', filas[0])
+        self.assertIn(',\\N,', filas[1])
+        self.assertIn(',200,', filas[0])
+
+    def test_registros_en_memoria(self):
+        """Lista de dicts, DataFrame y tabla Arrow se cargan sin CSV intermedio"""
+        import pyarrow as pa
+
+        df = pd.read_csv(self.csv)
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        for registros in (df.to_dict('records'), df, pa.Table.from_pandas(df)):
+            self.assertEqual(etl.cargar_registros_a_hive(registros), 3)
+        self.assertEqual(self.hive.contar('LOAD DATA'), 3)
+        self.assertEqual(etl.cargar_registros_a_hive([]), 0)
+
+
+class TestTablaParquetParticionada(BaseHiveFalso):
+    def test_ddl_particionado(self):
+        self.crear_etl().asegurar_sesion()
+        ddl = [sql for sql in self.hive.sentencias if 'CREATE TABLE' in sql][0]
+        self.assertIn('STORED AS PARQUET', ddl)
+        self.assertIn('PARTITIONED BY', ddl)
+        columnas = ddl.split('PARTITIONED BY')[0]
+        self.assertNotIn('source_type', columnas)
+
+    def test_un_load_por_particion(self):
+        df = pd.read_csv(self.csv)
+        df.loc[0, 'source_type'] = 'image'
+        df.loc[2, 'ingestion_date'] = '2024-01-02 10:00:00'
+        df.to_csv(self.csv, index=False)
+
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+
+        loads = [sql for sql in self.hive.sentencias if sql.startswith('LOAD DATA')]
+        self.assertEqual(len(loads), 3)
+        self.assertIn("PARTITION (ingestion_day='2024-01-01', source_type='image')", loads[0])
+        tabla = self.hive.archivos_cargados[0]
+        self.assertEqual(tabla.num_rows, 1)
+        self.assertEqual(str(tabla.schema.field('frame_number').type), 'int32')
+        self.assertNotIn('source_type', tabla.schema.names)
+        self.assertEqual(os.listdir(etl.staging_dir), [])
+
+    def test_fallback_inserta_en_particion(self):
+        self.hive.falla_load = True
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+        inserts = [sql for sql in self.hive.sentencias if sql.startswith('INSERT')]
+        self.assertEqual(len(inserts), 3)
+        self.assertIn("PARTITION (ingestion_day='2024-01-01', source_type='video')", inserts[0])
+
+    def test_fallback_solo_para_particiones_sin_cargar(self):
+        """Si falla el LOAD de la segunda partición, la primera no se inserta de nuevo"""
+        df = pd.read_csv(self.csv)
+        df.loc[2, 'ingestion_date'] = '2024-01-02 10:00:00'
+        df.to_csv(self.csv, index=False)
+        self.hive.loads_antes_de_fallar = 1
+
+        etl = self.crear_etl()
+        etl.asegurar_sesion()
+        self.assertEqual(etl.cargar_csv_a_hive(self.csv), 3)
+
+        self.assertEqual(self.hive.archivos_cargados[0].num_rows, 2)
+        inserts = [sql for sql in self.hive.sentencias if sql.startswith('INSERT')]
+        self.assertEqual(len(inserts), 1)
+        self.assertIn("PARTITION (ingestion_day='2024-01-02', source_type='video')", inserts[0])
+        self.assertEqual(sorted(etl.posiciones_cargadas), [0, 1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import tempfile
+import unittest
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from sumidero_detecciones import BufferFilas, SumideroDetecciones
+from datos_prueba import deteccion
+
+
+class TestSumideroDetecciones(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ruta(self, nombre):
+        return os.path.join(self.tmp.name, nombre)
+
+    def test_csv_por_chunks(self):
+        sumidero = SumideroDetecciones(self.ruta('staging.csv'), filas_por_chunk=3)
+        for i in range(10):
+            sumidero.agregar(deteccion(i))
+            # Nunca quedan más filas pendientes que el tamaño de chunk
+            self.assertLess(len(sumidero.buffer), 3)
+        self.assertEqual(sumidero.filas_escritas, 9)
+
+        self.assertEqual(sumidero.cerrar(), 10)
+        self.assertEqual(sumidero.chunks_escritos, 4)
+        df = pd.read_csv(self.ruta('staging.csv'))
+        self.assertEqual(df['frame_number'].tolist(), list(range(10)))
+        self.assertEqual(df['source_id'].tolist()[:2], ['v0.mp4', 'v1.mp4'])
+
+    def test_techo_de_memoria(self):
+        sumidero = SumideroDetecciones(self.ruta('staging.csv'), filas_por_chunk=1000, memoria_max_mb=0.0005)
+        for i in range(10):
+            sumidero.agregar(deteccion(i))
+        self.assertGreater(sumidero.chunks_escritos, 1)
+        self.assertEqual(sumidero.cerrar(), 10)
+
+    def test_parquet_en_row_groups(self):
+        with SumideroDetecciones(self.ruta('staging.parquet'), filas_por_chunk=4) as sumidero:
+            for i in range(10):
+                sumidero.agregar(deteccion(i))
+
+        archivo = pq.ParquetFile(self.ruta('staging.parquet'))
+        self.assertEqual(archivo.num_row_groups, 3)
+        self.assertEqual(archivo.metadata.num_rows, 10)
+        self.assertEqual(str(archivo.schema_arrow.field('frame_number').type), 'int32')
+        self.assertEqual(str(archivo.schema_arrow.field('class_name').type), 'string')
+
+    def test_filas_genericas_y_ruta_final(self):
+        sumidero = SumideroDetecciones(self.ruta('parcial.csv'), filas_por_chunk=2, buffer=BufferFilas())
+        for i in range(5):
+            sumidero.agregar({'imagen': f"img{i}.jpg", 'clase': 'person', 'confianza': 0.9})
+        self.assertEqual(sumidero.cerrar(self.ruta('final.csv')), 5)
+        self.assertFalse(os.path.exists(self.ruta('parcial.csv')))
+        self.assertEqual(len(pd.read_csv(self.ruta('final.csv'))), 5)
+
+    def test_sin_detecciones_no_crea_archivo(self):
+        self.assertEqual(SumideroDetecciones(self.ruta('vacio.csv')).cerrar(), 0)
+        self.assertFalse(os.path.exists(self.ruta('vacio.csv')))
+
+
+if __name__ == '__main__':
+    unittest.main()
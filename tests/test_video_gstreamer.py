@@ -0,0 +1,95 @@
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pipeline_video import PipelineVideo
+from video_gstreamer import gstreamer_disponible, pipeline_gstreamer_archivo
+
+
+def crear_video(ruta, num_frames=95, fps=30, ancho=64, alto=48):
+    """Video sintético cuyo frame i tiene el valor i en todos los pixeles"""
+    writer = cv2.VideoWriter(ruta, cv2.VideoWriter_fourcc(*'MJPG'), fps, (ancho, alto))
+    for i in range(num_frames):
+        writer.write(np.full((alto, ancho, 3), i % 256, dtype=np.uint8))
+    writer.release()
+
+
+class ResultadoFalso:
+    def __init__(self, frame):
+        from ultralytics.engine.results import Boxes
+        alto, ancho = frame.shape[:2]
+        # Una caja que cubre la mitad derecha del frame recibido
+        self.boxes = Boxes(np.array([[ancho / 2, 0, ancho, alto, 0.9, 0]], dtype=np.float32), (alto, ancho))
+
+
+class TestPipelineGStreamer(unittest.TestCase):
+    def test_descripcion_del_pipeline(self):
+        pipeline = pipeline_gstreamer_archivo('/videos/a.mp4', 640, 360, 30000 / 1001 / 30)
+        self.assertTrue(pipeline.startswith('filesrc location="/videos/a.mp4" ! decodebin ! '))
+        self.assertIn('videorate ! video/x-raw,framerate=1000/1001 ! ', pipeline)
+        self.assertIn('videoscale ! video/x-raw,width=640,height=360 ! ', pipeline)
+        self.assertTrue(pipeline.endswith('video/x-raw,format=BGR ! appsink sync=false'))
+        # videorate antes que videoscale: solo se escalan los frames muestreados
+        self.assertLess(pipeline.index('videorate'), pipeline.index('videoscale'))
+
+        hardware = pipeline_gstreamer_archivo('a.mp4', 640, 360, 2, 'qtdemux ! h264parse ! nvv4l2decoder')
+        self.assertIn('! qtdemux ! h264parse ! nvv4l2decoder ! videorate ! video/x-raw,framerate=2/1 ', hardware)
+
+    def test_disponibilidad_segun_build_de_opencv(self):
+        self.assertIsInstance(gstreamer_disponible(), bool)
+
+
+class TestLectorConGStreamer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.video = os.path.join(self.tmp.name, 'sintetico.avi')
+        crear_video(self.video)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def ejecutar(self):
+        recibidos = []
+        pipeline = PipelineVideo(
+            lambda frames: [ResultadoFalso(f) for f in frames],
+            tamano_batch=2, gstreamer=True, lado_maximo=32
+        )
+        pipeline.ejecutar(self.video, lambda f, n, t, r: recibidos.append(
+            (f.shape[:2], n, round(t, 2), r.boxes.orig_shape, r.boxes.xyxy[0].tolist())
+        ))
+        return recibidos
+
+    def test_sin_gstreamer_usa_ffmpeg(self):
+        with mock.patch('pipeline_video.gstreamer_disponible', return_value=False):
+            recibidos = self.ejecutar()
+        self.assertEqual([n for _, n, _, _, _ in recibidos], [0, 30, 60, 90])
+        # Frames y boxes a resolución completa, sin reescalar
+        self.assertEqual({forma for forma, _, _, _, _ in recibidos}, {(48, 64)})
+        self.assertEqual(recibidos[0][4], [32.0, 0.0, 64.0, 48.0])
+
+    @unittest.skipIf(gstreamer_disponible(), "OpenCV con GStreamer: el pipeline sí abre")
+    def test_pipeline_que_no_abre_cae_a_ffmpeg(self):
+        with mock.patch('pipeline_video.gstreamer_disponible', return_value=True):
+            recibidos = self.ejecutar()
+        self.assertEqual([(n, t) for _, n, t, _, _ in recibidos], [(0, 0.0), (30, 1.0), (60, 2.0), (90, 3.0)])
+        self.assertEqual(recibidos[0][0], (48, 64))
+
+    @unittest.skipUnless(gstreamer_disponible(), "OpenCV sin GStreamer")
+    def test_frames_reducidos_y_boxes_en_coordenadas_originales(self):
+        recibidos = self.ejecutar()
+        self.assertEqual([n for _, n, _, _, _ in recibidos], [0, 30, 60, 90])
+        forma, _, _, orig_shape, xyxy = recibidos[0]
+        self.assertEqual(forma, (24, 32))
+        self.assertEqual(tuple(orig_shape), (48, 64))
+        np.testing.assert_allclose(xyxy, [32.0, 0.0, 64.0, 48.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
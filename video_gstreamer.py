@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Decodificación de videos de archivo con GStreamer
+filesrc → decodebin (elige el decodificador por hardware si su plugin está
+instalado) → videorate → videoscale → appsink: los frames salen ya a la tasa
+de muestreo y reducidos al lado de entrada de YOLO, sin decodificar a
+resolución completa en Python ni redimensionar después
+"""
+import functools
+from fractions import Fraction
+
+import cv2
+
+from pipeline_imagenes import tamano_reducido
+
+
+@functools.lru_cache(maxsize=None)
+def gstreamer_disponible():
+    """True si OpenCV se compiló con GStreamer (el opencv de pip no lo trae)"""
+    for linea in cv2.getBuildInformation().splitlines():
+        if linea.strip().startswith('GStreamer:'):
+            return 'YES' in linea
+    return False
+
+
+def pipeline_gstreamer_archivo(ruta, ancho, alto, fps_salida, decodificador='decodebin'):
+    """Descripción del pipeline para cv2.VideoCapture(..., cv2.CAP_GSTREAMER)
+
+    decodificador es el fragmento entre filesrc y videorate; p. ej. en Jetson
+    'qtdemux ! h264parse ! nvv4l2decoder ! nvvidconv' fuerza el de hardware.
+    videorate va antes de videoscale: solo se escalan los frames que quedan.
+    """
+    tasa = Fraction(fps_salida).limit_denominator(1001)
+    return (
+        f'filesrc location="{ruta}" ! {decodificador} ! '
+        f'videorate ! video/x-raw,framerate={tasa.numerator}/{tasa.denominator} ! '
+        f'videoscale ! video/x-raw,width={ancho},height={alto} ! '
+        'videoconvert ! video/x-raw,format=BGR ! appsink sync=false'
+    )
+
+
+class MuestreadorGStreamer:
+    """Itera (frame, frame_number, timestamp_sec) de un video decodificado por GStreamer
+
+    Usa la misma grilla que MuestreadorFrames (un frame cada paso_frames):
+    frame_number, timestamp y detection_id coinciden con el camino de FFmpeg.
+    Los frames miden forma (alto, ancho); forma_original es la del video.
+    """
+
+    def __init__(self, video_path, muestras_por_segundo=1.0, lado_maximo=640,
+                 decodificador='decodebin', pool=None):
+        # Sonda con el backend por defecto: tamaño y fps originales del archivo
+        sonda = cv2.VideoCapture(video_path)
+        self.fps = sonda.get(cv2.CAP_PROP_FPS) or 30
+        self.forma_original = (int(sonda.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                               int(sonda.get(cv2.CAP_PROP_FRAME_WIDTH)))
+        sonda.release()
+
+        alto, ancho, self.escala = tamano_reducido(*self.forma_original, lado_maximo)
+        self.forma = (alto, ancho)
+        self.paso_frames = max(1, round(self.fps / muestras_por_segundo))
+        self.pool = pool
+        self.pipeline = pipeline_gstreamer_archivo(
+            video_path, ancho, alto, self.fps / self.paso_frames, decodificador
+        )
+        self.cap = cv2.VideoCapture(self.pipeline, cv2.CAP_GSTREAMER) if self.forma_original[0] else None
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    def __iter__(self):
+        muestra = 0
+        while True:
+            ok, frame = self.cap.read() if self.pool is None else self.pool.leer(self.cap)
+            if not ok:
+                break
+            frame_number = muestra * self.paso_frames
+            yield frame, frame_number, frame_number / self.fps
+            muestra += 1